@@ -11,6 +11,7 @@ from ..models.challenge import (
     ChallengeListResponse, DifficultyLevel, ProgrammingLanguage, BugType, Bug
 )
 from ..services.ai_generator import BugGenerator
+from shared.responses import FastJSONResponse
 import random
 from pydantic import BaseModel
 
@@ -49,10 +50,10 @@ async def get_challenges(
             expected_bugs=[]  # Don't expose expected bugs
         ))
     
-    return ChallengeListResponse(
+    return FastJSONResponse(ChallengeListResponse(
         challenges=challenge_responses,
         total=total
-    )
+    ))
 
 @router.get("/{challenge_id}", response_model=ChallengeResponse)
 async def get_challenge(challenge_id: str, db: Session = Depends(get_db)):
@@ -158,6 +159,7 @@ async def take_challenge(
         # Update user's attempted challenges count
         user.challenges_attempted = (user.challenges_attempted or 0) + 1
         user.last_active = datetime.utcnow()
+        UserService.mark_candidate_changed(db, user)
         db.commit()
         
         return ChallengeResponse(
@@ -12,6 +12,8 @@ from ..models.submission import (
 )
 from ..models.challenge import Bug
 from ..services.ai_evaluator import CommentEvaluator
+from ..services.user_service import UserService
+from shared.responses import FastJSONResponse
 
 router = APIRouter(prefix="/api/submissions", tags=["submissions"])
 
@@ -146,6 +148,7 @@ async def evaluate_submission_background(submission_id: str, expected_bugs_data:
                         candidate.highest_score = highest
             
             candidate.last_active = datetime.utcnow()
+            UserService.mark_candidate_changed(db_session, candidate)
         
         db_session.commit()
         print(f"Submission {submission_id} evaluation completed successfully")
@@ -296,7 +299,7 @@ async def get_leaderboard(
             last_submission=candidate.last_active
         ))
     
-    return LeaderboardResponse(
+    return FastJSONResponse(LeaderboardResponse(
         entries=entries,
         total_participants=db.query(CandidateDB).count()
-    )
\ No newline at end of file
+    ))
\ No newline at end of file
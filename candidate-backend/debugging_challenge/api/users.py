@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
 from pydantic import BaseModel
+import gzip
 
 from ..database.connection import get_db
+from ..database.models import CandidateDB
 from ..services.user_service import UserService
+from shared.responses import FastJSONResponse, dumps
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
@@ -46,6 +50,37 @@ async def create_user(
         }
     )
 
+def _serialize_statistics(user: CandidateDB) -> dict:
+    return {
+        "total_score": user.total_score,
+        "challenges_completed": user.challenges_completed,
+        "challenges_attempted": user.challenges_attempted,
+        "average_score": user.average_score,
+        "highest_score": user.highest_score,
+        "total_bugs_found": user.total_bugs_found,
+        "total_bugs_missed": user.total_bugs_missed,
+        "average_time_seconds": user.average_time_seconds,
+        "member_since": user.created_at.isoformat() if user.created_at else None,
+        "last_active": user.last_active.isoformat() if user.last_active else None
+    }
+
+def _serialize_bulk_profile(user: CandidateDB) -> dict:
+    """Profile, statistics and parsed resume fields for one user."""
+    return {
+        "user_id": user.user_id,
+        "display_name": user.display_name,
+        "email": user.email or "",
+        "statistics": _serialize_statistics(user),
+        "title": user.professional_title,
+        "summary": user.resume_summary,
+        "skills": user.skills,
+        "experience": user.experience,
+        "location": user.location,
+        "resume_parsed_at": user.resume_parsed_at.isoformat() if user.resume_parsed_at else None,
+        "version": user.version,
+        "updated_at": user.updated_at.isoformat() if user.updated_at else None
+    }
+
 @router.get("/{user_id}/profile")
 async def get_user_profile(
     user_id: str,
@@ -60,18 +95,7 @@ async def get_user_profile(
         "user_id": user.user_id,
         "display_name": user.display_name,
         "email": user.email,
-        "statistics": {
-            "total_score": user.total_score,
-            "challenges_completed": user.challenges_completed,
-            "challenges_attempted": user.challenges_attempted,
-            "average_score": user.average_score,
-            "highest_score": user.highest_score,
-            "total_bugs_found": user.total_bugs_found,
-            "total_bugs_missed": user.total_bugs_missed,
-            "average_time_seconds": user.average_time_seconds,
-            "member_since": user.created_at.isoformat() if user.created_at else None,
-            "last_active": user.last_active.isoformat() if user.last_active else None
-        }
+        "statistics": _serialize_statistics(user)
     }
 
 @router.get("/{user_id}/history")
@@ -84,7 +108,7 @@ async def get_user_history(
     if not history:
         raise HTTPException(status_code=404, detail="User not found")
     
-    return history
+    return FastJSONResponse(history)
 
 @router.get("/leaderboard")
 async def get_leaderboard(
@@ -92,7 +116,7 @@ async def get_leaderboard(
     db: Session = Depends(get_db)
 ):
     """Get top users by average score"""
-    return UserService.get_leaderboard(db, limit)
+    return FastJSONResponse(UserService.get_leaderboard(db, limit))
 
 @router.get("/all")
 async def get_all_users(db: Session = Depends(get_db)):
@@ -114,6 +138,93 @@ async def get_all_users(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching users: {str(e)}")
 
+@router.get("/bulk")
+async def export_users_bulk(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="user_id to continue after (from X-Next-Cursor)"),
+    limit: int = Query(1000, ge=1, le=5000),
+    format: str = Query("ndjson", pattern="^(ndjson|json)$"),
+    db: Session = Depends(get_db)
+):
+    """
+    Export profiles, statistics, skills, title and resume summary for many users at once.
+
+    Pages are keyed by user_id; the cursor for the next page is returned in the
+    X-Next-Cursor header (absent on the last page). `ndjson` streams one user per
+    line, `json` returns a single document, gzip-compressed when the client accepts it.
+    
+    X-Change-Cursor carries the change version current when the page was read;
+    take it from the first page and pass it to /changes to follow up incrementally.
+    """
+    change_cursor = UserService.current_change_version(db)
+    # Only the page's user_ids are read up front, to set X-Next-Cursor before the body starts
+    ids_query = db.query(CandidateDB.user_id).order_by(CandidateDB.user_id)
+    if cursor:
+        ids_query = ids_query.filter(CandidateDB.user_id > cursor)
+    page_ids = [row[0] for row in ids_query.limit(limit + 1)]
+    
+    headers = {"X-Change-Cursor": str(change_cursor)}
+    if len(page_ids) > limit:
+        headers["X-Next-Cursor"] = page_ids[limit - 1]
+    
+    def page_query(session: Session):
+        query = session.query(CandidateDB).order_by(CandidateDB.user_id)
+        if cursor:
+            query = query.filter(CandidateDB.user_id > cursor)
+        if "X-Next-Cursor" in headers:
+            query = query.filter(CandidateDB.user_id <= headers["X-Next-Cursor"])
+        return query
+    
+    if format == "json":
+        records = [_serialize_bulk_profile(user) for user in page_query(db)]
+        body = dumps({"users": records, "next_cursor": headers.get("X-Next-Cursor")})
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        return Response(content=body, media_type="application/json", headers=headers)
+    
+    def stream_ndjson():
+        # Own session: the request's may be closed before the body is streamed
+        from ..database.connection import SessionLocal
+        session = SessionLocal()
+        try:
+            for user in page_query(session).yield_per(200):
+                yield dumps(_serialize_bulk_profile(user)) + b"\n"
+        finally:
+            session.close()
+    
+    return StreamingResponse(stream_ndjson(), media_type="application/x-ndjson", headers=headers)
+
+@router.get("/changes")
+async def get_user_changes(
+    since: int = Query(0, ge=0, description="Change cursor returned by a previous call (0 = from the beginning)"),
+    limit: int = Query(1000, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """
+    Profiles changed after the given cursor, oldest change first.
+
+    Resume uploads, submission evaluations and statistics updates each bump a
+    candidate's version. Pass the returned `cursor` back as `since` to continue;
+    `has_more` is true while further changes remain beyond this page.
+    """
+    users = (
+        db.query(CandidateDB)
+        .filter(CandidateDB.version > since)
+        .order_by(CandidateDB.version)
+        .limit(limit + 1)
+        .all()
+    )
+    
+    has_more = len(users) > limit
+    users = users[:limit]
+    
+    return {
+        "changes": [_serialize_bulk_profile(user) for user in users],
+        "cursor": users[-1].version if users else since,
+        "has_more": has_more
+    }
+
 @router.post("/{user_id}/update-stats")
 async def update_user_statistics(
     user_id: str,
@@ -1,5 +1,5 @@
 from .connection import engine, SessionLocal, get_db, init_db
-from .models import Base, ChallengeDB, SubmissionDB, CandidateDB
+from .models import Base, ChallengeDB, SubmissionDB, CandidateDB, ChangeSequenceDB
 
 __all__ = [
     'engine',
@@ -9,5 +9,6 @@ __all__ = [
     'Base',
     'ChallengeDB',
     'SubmissionDB',
-    'CandidateDB'
+    'CandidateDB',
+    'ChangeSequenceDB'
 ]
\ No newline at end of file
@@ -1,7 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import bindparam, create_engine, func, inspect, select, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.declarative import declarative_base
-from typing import Generator
+from typing import Generator, Optional
 import os
 from dotenv import load_dotenv
 
@@ -26,4 +27,57 @@ def get_db() -> Generator[Session, None, None]:
 def init_db():
     from .models import Base
     Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully!")
\ No newline at end of file
+    migrate_candidates()
+    print("Database tables created successfully!")
+
+# Candidate columns added after the table was first created, so older databases lack them
+_ADDED_CANDIDATE_COLUMNS = (
+    "phone", "location", "professional_title", "resume_summary", "education", "experience",
+    "skills", "resume_parsed_at", "resume_file_name", "version", "updated_at",
+)
+
+def migrate_candidates(bind: Optional[Engine] = None):
+    """
+    Bring an older candidates table up to the current model: add the missing
+    columns and the version index, give existing rows distinct change versions
+    and move the change sequence past them. Idempotent, so it runs on every start.
+    """
+    from .models import CANDIDATE_SEQUENCE, CandidateDB, ChangeSequenceDB
+    
+    bind = bind or engine
+    table = CandidateDB.__table__
+    sequences = ChangeSequenceDB.__table__
+    columns = {c["name"] for c in inspect(bind).get_columns(table.name)}
+    with bind.begin() as conn:
+        for name in _ADDED_CANDIDATE_COLUMNS:
+            if name not in columns:
+                column_type = table.c[name].type.compile(dialect=bind.dialect)
+                constraint = " NOT NULL DEFAULT 0" if name == "version" else ""
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type}{constraint}"))
+                print(f"Added candidates column: {name}")
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+        
+        unversioned = conn.execute(
+            select(table.c.id).where(table.c.version == 0).order_by(table.c.created_at)
+        ).scalars().all()
+        if unversioned:
+            start = conn.execute(select(func.max(table.c.version))).scalar() or 0
+            conn.execute(
+                table.update()
+                .where(table.c.id == bindparam("row_id"))
+                .values(
+                    version=bindparam("new_version"),
+                    updated_at=func.coalesce(table.c.updated_at, table.c.last_active, table.c.created_at)
+                ),
+                [{"row_id": row_id, "new_version": start + i + 1} for i, row_id in enumerate(unversioned)]
+            )
+            print(f"Assigned change versions to {len(unversioned)} existing candidates")
+        
+        # A missing sequence row is created on the first change, after the highest version
+        latest = conn.execute(select(func.max(table.c.version))).scalar() or 0
+        conn.execute(
+            sequences.update()
+            .where(sequences.c.name == CANDIDATE_SEQUENCE, sequences.c.value < latest)
+            .values(value=latest)
+        )
\ No newline at end of file
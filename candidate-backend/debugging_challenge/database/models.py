@@ -88,6 +88,10 @@ class CandidateDB(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     last_active = Column(DateTime, default=datetime.utcnow)
     
+    # Change tracking for incremental sync (see UserService.mark_candidate_changed)
+    version = Column(Integer, default=0, nullable=False, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
     # Relationships
     submissions = relationship("SubmissionDB", back_populates="candidate", order_by="desc(SubmissionDB.submitted_at)")
     user_challenges = relationship("UserChallengeDB", back_populates="candidate", order_by="desc(UserChallengeDB.created_at)")
@@ -121,4 +125,14 @@ class UserChallengeDB(Base):
     # Relationships
     candidate = relationship("CandidateDB", back_populates="user_challenges")
     challenge = relationship("ChallengeDB")
-    submissions = relationship("SubmissionDB", back_populates="user_challenge", order_by="desc(SubmissionDB.submitted_at)")
\ No newline at end of file
+    submissions = relationship("SubmissionDB", back_populates="user_challenge", order_by="desc(SubmissionDB.submitted_at)")
+
+# ChangeSequenceDB row that numbers candidate changes
+CANDIDATE_SEQUENCE = "candidates"
+
+class ChangeSequenceDB(Base):
+    """Named monotonic counters; the row lock serializes version assignment."""
+    __tablename__ = "change_sequences"
+    
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
@@ -12,6 +12,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from sqlalchemy import inspect
 from debugging_challenge.database import engine, init_db, SessionLocal
+from debugging_challenge.database.connection import migrate_candidates
 from debugging_challenge.database.models import Base, ChallengeDB, SubmissionDB, CandidateDB
 from debugging_challenge.models.challenge import DifficultyLevel, BugType
 import json
@@ -32,6 +33,7 @@ def create_database():
     """Create all database tables"""
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    migrate_candidates()
     print("✓ Database tables created successfully!")
     
     # Verify tables were created
@@ -265,6 +267,7 @@ def main():
     
     if exists:
         print("✅ Database already exists with all required tables")
+        migrate_candidates()
         get_table_info()
         
         response = input("\nDo you want to recreate the database? (yes/no): ").lower()
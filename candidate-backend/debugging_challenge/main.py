@@ -3,6 +3,7 @@ from contextlib import asynccontextmanager
 
 from .api import challenges, submissions, users
 from .database.connection import init_db
+from shared.responses import FastJSONResponse
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -13,7 +14,8 @@ app = FastAPI(
     title="Debugging Challenge Arena",
     description="AI-powered debugging challenge platform",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 app.include_router(challenges.router)
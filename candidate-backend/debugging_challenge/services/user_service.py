@@ -8,7 +8,8 @@ from typing import Optional, Dict, List
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from ..database.models import CandidateDB, UserChallengeDB, SubmissionDB
+from ..database.models import CANDIDATE_SEQUENCE, CandidateDB, UserChallengeDB, SubmissionDB, ChangeSequenceDB
+
 
 class UserService:
     @staticmethod
@@ -52,11 +53,44 @@ class UserService:
         )
         
         db.add(user)
+        UserService.mark_candidate_changed(db, user)
         db.commit()
         db.refresh(user)
         
         return user
     
+    @staticmethod
+    def mark_candidate_changed(db: Session, candidate: CandidateDB) -> int:
+        """
+        Stamp a candidate with the next change version so incremental consumers
+        of /api/users/changes pick it up. The caller commits; the sequence row
+        stays locked until then, so versions become visible in order.
+        """
+        updated = db.query(ChangeSequenceDB).filter(
+            ChangeSequenceDB.name == CANDIDATE_SEQUENCE
+        ).update({ChangeSequenceDB.value: ChangeSequenceDB.value + 1}, synchronize_session=False)
+        
+        if not updated:
+            # First change ever: start after any versions already assigned
+            start = db.query(func.max(CandidateDB.version)).scalar() or 0
+            db.add(ChangeSequenceDB(name=CANDIDATE_SEQUENCE, value=start + 1))
+            db.flush()
+        
+        version = db.query(ChangeSequenceDB.value).filter(
+            ChangeSequenceDB.name == CANDIDATE_SEQUENCE
+        ).scalar()
+        candidate.version = version
+        candidate.updated_at = datetime.utcnow()
+        return version
+    
+    @staticmethod
+    def current_change_version(db: Session) -> int:
+        """Latest change version handed out (0 if nothing has changed yet)."""
+        value = db.query(ChangeSequenceDB.value).filter(
+            ChangeSequenceDB.name == CANDIDATE_SEQUENCE
+        ).scalar()
+        return value or 0
+    
     @staticmethod
     def get_user_by_id(db: Session, user_id: str) -> Optional[CandidateDB]:
         """Get user by their unique user_id"""
@@ -78,6 +112,7 @@ class UserService:
             user.total_bugs_found = 0
             user.total_bugs_missed = 0
             user.average_time_seconds = 0
+            UserService.mark_candidate_changed(db, user)
             db.commit()
         
         return user
@@ -127,6 +162,7 @@ class UserService:
             user.total_bugs_missed = total_bugs_missed
             user.average_time_seconds = average_time
             user.last_active = datetime.utcnow()
+            UserService.mark_candidate_changed(db, user)
             
             db.commit()
     
@@ -9,12 +9,14 @@ import sys
 sys.path.insert(0, '/app/candidate-backend')
 try:
     from debugging_challenge.main import app as debug_app
+    from debugging_challenge.database.connection import init_db as init_debug_db
     print("Successfully imported debugging_challenge module")
 except ImportError as e:
     # Fallback if debugging_challenge isn't available
     print(f"Failed to import debugging_challenge: {e}")
     from fastapi import FastAPI
     debug_app = FastAPI(title="Debug Challenge (Not Available)")
+    init_debug_db = None
 
 # Import resume parser routes
 try:
@@ -29,20 +31,32 @@ except ImportError as e:
 
 load_dotenv()
 
+from shared.responses import FastJSONResponse, add_compression
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Initialize any shared services here
+    # Mounted apps' lifespans never run, so create and migrate the challenge database here
+    if init_debug_db is not None:
+        init_debug_db()
     yield
 
 app = FastAPI(
     title="TalentAI Candidate Backend",
     description="Backend API for the TalentAI platform - all candidate features",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 origins = os.getenv("CORS_ORIGINS", "http://localhost:5173,http://localhost:5174").split(",")
 
+# Covers the mounted apps as well; 'gzip', 'brotli' (pip install brotli) or 'none'
+add_compression(
+    app,
+    os.getenv("RESPONSE_COMPRESSION", "gzip"),
+    int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024")),
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -9,6 +9,7 @@ instead of running it from the command line.
 import os
 from pathlib import Path
 from resume_pipeline import CompleteResumePipeline
+from resume_corpus import iter_corpus
 
 def main():
     """Example of using the pipeline programmatically."""
@@ -40,14 +41,12 @@ def main():
         
         print(f"\nGenerated files:")
         print(f"Resumes: {len(resume_files)} files")
-        print(f"Parsed data: {len(parsed_files)} JSON files")
+        print(f"Parsed data: {len(parsed_files)} files (JSONL corpus first)")
         print(f"Summaries: {len(summary_files)} text files")
         
-        # Example: Read one of the parsed JSON files
+        # Example: Read the first record of the parsed corpus
         if parsed_files:
-            import json
-            with open(parsed_files[0], 'r') as f:
-                parsed_data = json.load(f)
+            parsed_data = next(iter_corpus(parsed_files[0]))
             
             print(f"\nSample parsed data from {parsed_files[0].name}:")
             print(f"Name: {parsed_data['data']['name']}")
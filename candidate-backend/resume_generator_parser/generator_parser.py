@@ -25,6 +25,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from resume_corpus import CORPUS_FILENAME, CorpusWriter
+
 # -------------------------------
 # Optional dependency (PDF)
 # -------------------------------
@@ -439,37 +441,48 @@ def generate_resumes(out_dir: Path, count: int, make_pdf: bool):
 
     return structs
 
-def parse_generated(out_dir: Path, use_md: bool = True):
+def parse_generated(out_dir: Path, use_md: bool = True, json_files: bool = False) -> int:
+    """
+    Parse and summarize generated resumes, streaming each record into
+    parsed/corpus.jsonl (+ offset index). With json_files=True, also writes
+    one JSON file per resume and combined.json (the older layout).
+    Returns the number of records written.
+    """
     src_dir = out_dir / ("md" if use_md else "txt")
     parsed_dir = out_dir / "parsed"
     parsed_dir.mkdir(parents=True, exist_ok=True)
 
     results = []
-    for p in sorted(src_dir.glob("*.md" if use_md else "*.txt")):
-        md = p.read_text(encoding="utf-8")
-        struct = parse_markdown(md)
-        summary = summarize(struct)
-        rec = {
-            "filename": p.name,
-            "generated_at": datetime.utcnow().isoformat() + "Z",
-            "data": asdict(struct),
-            "summary": summary
+    with CorpusWriter(parsed_dir / CORPUS_FILENAME) as corpus:
+        for p in sorted(src_dir.glob("*.md" if use_md else "*.txt")):
+            md = p.read_text(encoding="utf-8")
+            struct = parse_markdown(md)
+            summary = summarize(struct)
+            rec = {
+                "filename": p.name,
+                "generated_at": datetime.utcnow().isoformat() + "Z",
+                "data": asdict(struct),
+                "summary": summary
+            }
+            corpus.write(rec)
+            if json_files:
+                results.append(rec)
+                (parsed_dir / f"{p.stem}.json").write_text(json.dumps(rec, indent=2), encoding="utf-8")
+
+    if json_files:
+        combined = {
+            "count": len(results),
+            "results": results
         }
-        results.append(rec)
-        (parsed_dir / f"{p.stem}.json").write_text(json.dumps(rec, indent=2), encoding="utf-8")
-
-    combined = {
-        "count": len(results),
-        "results": results
-    }
-    (parsed_dir / "combined.json").write_text(json.dumps(combined, indent=2), encoding="utf-8")
-    return results
+        (parsed_dir / "combined.json").write_text(json.dumps(combined, indent=2), encoding="utf-8")
+    return corpus.count
 
 def main():
     ap = argparse.ArgumentParser(description="Synthetic resume generator + parser + summarizer")
     ap.add_argument("--out", required=True, help="Output directory")
     ap.add_argument("--count", type=int, default=12, help="How many resumes to generate (10–15 recommended)")
     ap.add_argument("--make-pdf", action="store_true", help="Also generate PDFs (requires reportlab)")
+    ap.add_argument("--json-files", action="store_true", help="Also write one JSON per resume plus combined.json")
     args = ap.parse_args()
 
     out_dir = Path(args.out)
@@ -479,14 +492,16 @@ def main():
     generate_resumes(out_dir, args.count, args.make_pdf)
 
     print("🔎 Parsing generated resumes (Markdown)...")
-    results = parse_generated(out_dir, use_md=True)
+    count = parse_generated(out_dir, use_md=True, json_files=args.json_files)
 
     print(f"✅ Done. Folders created:")
     print(f"   - {out_dir / 'md'} (Markdown)")
     print(f"   - {out_dir / 'txt'} (Plain text)")
     if args.make_pdf and HAVE_REPORTLAB:
         print(f"   - {out_dir / 'pdf'} (PDF)")
-    print(f"   - {out_dir / 'parsed'} (Parsed JSON + combined.json)")
+    print(f"   - {out_dir / 'parsed' / CORPUS_FILENAME} ({count} parsed resumes, JSONL + offset index)")
+    if args.json_files:
+        print(f"   - {out_dir / 'parsed'} (Parsed JSON + combined.json)")
 
 if __name__ == "__main__":
     random.seed(42)  # reproducible-ish
@@ -0,0 +1,91 @@
+"""
+Append-only JSONL corpus of parsed resumes with an offset index.
+
+Writing one pretty-printed JSON file per resume plus a `combined.json`
+built in memory does not scale to 100k-resume corpora: the pipeline
+holds every record until the end, and the matcher has to list and parse
+thousands of small files. Pipelines now stream records into one corpus:
+
+    corpus.jsonl      one compact JSON record per line, in write order
+    corpus.jsonl.idx  little-endian uint64 byte offset of each line
+
+Records are only ever appended. The data file is flushed before its
+offsets are written, so the index never points past complete lines; a
+reader that finds lines beyond the index (e.g. after a crash) recovers
+them by scanning for newlines. The recruiter backend memory-maps both
+files (`candidate_recommendation/services/resume_corpus.py`).
+"""
+
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Union
+
+CORPUS_FILENAME = "corpus.jsonl"
+INDEX_SUFFIX = ".idx"
+
+_OFFSET = struct.Struct("<Q")
+
+
+def index_path(corpus_path: Path) -> Path:
+    return corpus_path.with_name(corpus_path.name + INDEX_SUFFIX)
+
+
+class CorpusWriter:
+    """
+    Streams records into a JSONL corpus and its offset index.
+
+    Use as a context manager; `append=False` starts a new corpus,
+    `append=True` adds to an existing one.
+    """
+
+    def __init__(self, path: Union[str, Path], append: bool = False, flush_every: int = 1000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        mode = "ab" if append else "wb"
+        self._data = open(self.path, mode)
+        self._index = open(index_path(self.path), mode)
+        self._offset = self._data.seek(0, 2)
+        self._pending: List[int] = []  # offsets of lines not yet flushed
+        self.flush_every = max(1, int(flush_every))
+        self.count = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        self._data.write(line + b"\n")
+        self._pending.append(self._offset)
+        self._offset += len(line) + 1
+        self.count += 1
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Flush data lines, then their index entries."""
+        self._data.flush()
+        if self._pending:
+            self._index.write(b"".join(_OFFSET.pack(offset) for offset in self._pending))
+            self._pending = []
+        self._index.flush()
+
+    def close(self) -> None:
+        if self._data.closed:
+            return
+        self.flush()
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self) -> "CorpusWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_corpus(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Records of a corpus in write order, read line by line."""
+    with open(path, "rb") as fh:
+        for line in fh:
+            if not line.endswith(b"\n"):
+                break  # partial line from an interrupted write
+            if line.strip():
+                yield json.loads(line)
@@ -27,6 +27,7 @@ from resume_generator import ResumeGenerator, ResumeRenderer
 from resume_parser import get_parser
 from llm_summarizer import get_summarizer
 from models import ResumeStruct, ParsedResume
+from resume_corpus import CORPUS_FILENAME, CorpusWriter
 
 # Configure logging
 logging.basicConfig(
@@ -40,15 +41,17 @@ class CompleteResumePipeline:
     Complete pipeline for generating, parsing, summarizing, and saving resumes.
     """
     
-    def __init__(self, output_dir: Path, groq_api_key: str = None):
+    def __init__(self, output_dir: Path, groq_api_key: str = None, json_files: bool = False):
         """
         Initialize the pipeline.
         
         Args:
             output_dir: Directory to save generated files
             groq_api_key: Groq API key for summarization
+            json_files: Also save one pretty-printed JSON file per parsed resume
         """
         self.output_dir = output_dir
+        self.json_files = json_files
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
         # Set up components
@@ -178,7 +181,9 @@ class CompleteResumePipeline:
     def save_parsed_data(self, resumes: List[ResumeStruct], summaries: List[str], 
                          original_files: List[Path]) -> List[Path]:
         """
-        Save parsed resume data and summaries to JSON files.
+        Save parsed resume data and summaries to the JSONL corpus
+        (parsed/corpus.jsonl plus its offset index), one line per resume,
+        and optionally to one JSON file per resume.
         
         Args:
             resumes: List of parsed resume structures
@@ -186,32 +191,37 @@ class CompleteResumePipeline:
             original_files: List of original resume file paths
             
         Returns:
-            List of JSON file paths where data was saved
+            List of files written: the corpus, then any per-resume JSON files
         """
-        json_files = []
+        corpus_path = self.parsed_dir / CORPUS_FILENAME
+        json_files = [corpus_path]
         
-        for i, (resume, summary, original_file) in enumerate(zip(resumes, summaries, original_files)):
-            # Create ParsedResume object
-            parsed_resume = ParsedResume(
-                filename=original_file.name,
-                parsed_at=datetime.utcnow(),
-                data=resume,
-                summary=summary,
-                llm_provider=self.summarizer.get_current_provider_name(),
-                llm_model="llama3-8b-8192"  # Default Groq model
-            )
-            
-            # Save to JSON
-            safe_name = resume.name.replace(' ', '_').lower()
-            json_filename = f"{safe_name}_{i+1:03d}_parsed.json"
-            json_path = self.parsed_dir / json_filename
-            
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(parsed_resume.to_dict(), f, indent=2, ensure_ascii=False)
-            
-            json_files.append(json_path)
-            logger.info(f"Saved parsed data: {json_path}")
+        with CorpusWriter(corpus_path) as corpus:
+            for i, (resume, summary, original_file) in enumerate(zip(resumes, summaries, original_files)):
+                # Create ParsedResume object
+                parsed_resume = ParsedResume(
+                    filename=original_file.name,
+                    parsed_at=datetime.utcnow(),
+                    data=resume,
+                    summary=summary,
+                    llm_provider=self.summarizer.get_current_provider_name(),
+                    llm_model="llama3-8b-8192"  # Default Groq model
+                )
+                record = parsed_resume.to_dict()
+                corpus.write(record)
+                
+                if self.json_files:
+                    safe_name = resume.name.replace(' ', '_').lower()
+                    json_filename = f"{safe_name}_{i+1:03d}_parsed.json"
+                    json_path = self.parsed_dir / json_filename
+                    
+                    with open(json_path, 'w', encoding='utf-8') as f:
+                        json.dump(record, f, indent=2, ensure_ascii=False)
+                    
+                    json_files.append(json_path)
+                    logger.info(f"Saved parsed data: {json_path}")
         
+        logger.info(f"Saved {corpus.count} parsed resumes to {corpus_path}")
         return json_files
     
     def save_summary_only(self, summaries: List[str], resume_names: List[str]) -> List[Path]:
@@ -361,6 +371,11 @@ def main():
         type=str,
         help="Groq API key for LLM summarization"
     )
+    parser.add_argument(
+        "--json-files",
+        action="store_true",
+        help="Also save one JSON file per parsed resume (the corpus is always written)"
+    )
     parser.add_argument(
         "--verbose", 
         action="store_true",
@@ -387,7 +402,7 @@ def main():
     
     try:
         # Initialize and run pipeline
-        pipeline = CompleteResumePipeline(output_dir, args.groq_api_key)
+        pipeline = CompleteResumePipeline(output_dir, args.groq_api_key, json_files=args.json_files)
         results = pipeline.run_pipeline(args.count)
         
         if results["success"]:
@@ -0,0 +1,74 @@
+"""Unit tests for the JSONL resume corpus writer (run with pytest)."""
+
+import struct
+
+from resume_corpus import CorpusWriter, index_path, iter_corpus
+
+
+def _offsets(path):
+    raw = index_path(path).read_bytes()
+    return [offset for (offset,) in struct.iter_unpack("<Q", raw)]
+
+
+def test_writes_lines_and_offsets(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    with CorpusWriter(path) as writer:
+        for i in range(3):
+            writer.write({"filename": f"r{i}.md", "data": {"name": f"Candidate {i}"}})
+    data = path.read_bytes()
+    assert data.count(b"\n") == 3
+    offsets = _offsets(path)
+    assert offsets[0] == 0
+    assert all(data[offset - 1:offset] == b"\n" for offset in offsets[1:])
+    assert [r["filename"] for r in iter_corpus(path)] == ["r0.md", "r1.md", "r2.md"]
+
+
+def test_append_continues_offsets(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    with CorpusWriter(path) as writer:
+        writer.write({"n": 1})
+    with CorpusWriter(path, append=True) as writer:
+        writer.write({"n": 2})
+    offsets = _offsets(path)
+    assert len(offsets) == 2
+    assert path.read_bytes()[offsets[1]:].startswith(b'{"n":2}')
+
+
+def test_rewrite_truncates_previous_corpus(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    with CorpusWriter(path) as writer:
+        writer.write({"n": 1})
+        writer.write({"n": 2})
+    with CorpusWriter(path) as writer:
+        writer.write({"n": 3})
+    assert [r["n"] for r in iter_corpus(path)] == [3]
+    assert _offsets(path) == [0]
+
+
+def test_index_never_points_past_flushed_data(tmp_path):
+    # Offsets are only written by flush(), after the data they point at
+    path = tmp_path / "corpus.jsonl"
+    writer = CorpusWriter(path, flush_every=2)
+    for i in range(3):
+        writer.write({"n": i})
+    size = path.stat().st_size
+    assert all(offset < size for offset in _offsets(path))
+    assert len(_offsets(path)) == 2
+    writer.close()
+    assert len(_offsets(path)) == 3
+
+
+def test_iter_corpus_skips_partial_last_line(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    with CorpusWriter(path) as writer:
+        writer.write({"n": 1})
+    with open(path, "ab") as fh:
+        fh.write(b'{"n": 2')  # interrupted write
+    assert [r["n"] for r in iter_corpus(path)] == [1]
+
+
+def test_empty_corpus(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    CorpusWriter(path).close()
+    assert list(iter_corpus(path)) == []
+    assert _offsets(path) == []
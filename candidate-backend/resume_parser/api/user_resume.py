@@ -16,6 +16,7 @@ from resume_parser.services.parser import get_parser
 from resume_parser.services.summarizer import get_summarizer
 from debugging_challenge.database.connection import get_db
 from debugging_challenge.database.models import CandidateDB
+from debugging_challenge.services.user_service import UserService
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -114,6 +115,7 @@ async def upload_and_parse_resume(
         # Update metadata
         candidate.resume_parsed_at = datetime.utcnow()
         candidate.resume_file_name = file.filename
+        UserService.mark_candidate_changed(db, candidate)
         
         # Commit changes to database
         db.commit()
@@ -216,6 +218,7 @@ async def delete_user_resume_data(
         candidate.skills = None
         candidate.resume_parsed_at = None
         candidate.resume_file_name = None
+        UserService.mark_candidate_changed(db, candidate)
         
         # Commit changes
         db.commit()
@@ -6,6 +6,7 @@ from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
 from resume_parser.api import resumes, analysis, user_resume
+from shared.responses import FastJSONResponse
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -19,7 +20,8 @@ app = FastAPI(
     title="Resume Parser Service",
     description="AI-powered resume parsing and analysis platform",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Include routers
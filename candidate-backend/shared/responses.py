@@ -0,0 +1,169 @@
+"""
+Fast JSON responses and response compression for the candidate backend apps.
+
+Challenge lists, leaderboards and user histories are lists of pydantic
+models or dicts. FastAPI's default path runs them through
+`jsonable_encoder` and then the stdlib `json.dumps`. The root app and
+the mounted debugging-challenge and resume-parser apps now use
+`FastJSONResponse` as their default response class. It renders with
+orjson, falling back to stdlib json when orjson is not installed. The
+list endpoints return it directly, and a pydantic model given to it is
+serialized in one pass by pydantic-core (`model_dump_json`).
+
+`CompressionMiddleware` gzip- or brotli-compresses complete responses
+above a size threshold when the client accepts it. It is installed on
+the root app, so it covers the mounted apps too. Responses sent in
+several chunks (streams) pass through untouched.
+"""
+
+import gzip
+import json
+import logging
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used instead
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+
+def _default(obj: Any) -> Any:
+    """Types neither orjson nor stdlib json encode natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, UUID):
+        return str(obj)
+    if hasattr(obj, "tolist"):  # numpy arrays and scalars
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON for `content` (a pydantic model, or plain data)."""
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by `dumps` (orjson, or pydantic-core for models)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _require_brotli():
+    try:
+        import brotli
+    except ImportError:
+        raise ImportError("Please install brotli: pip install brotli")
+    return brotli
+
+
+class CompressionMiddleware:
+    """
+    Compresses complete responses of at least `minimum_size` bytes with
+    brotli (`algorithm="brotli"`, if the client accepts `br`) or gzip.
+    Responses sent in several chunks (streams) and responses that already
+    have a Content-Encoding are passed through unchanged.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        algorithm: str = "gzip",
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        if algorithm not in ("gzip", "brotli"):
+            raise ValueError(f"Unknown compression algorithm: {algorithm} (expected 'gzip' or 'brotli')")
+        self.app = app
+        self.brotli = _require_brotli() if algorithm == "brotli" else None
+        self.minimum_size = int(minimum_size)
+        self.gzip_level = int(gzip_level)
+        self.brotli_quality = int(brotli_quality)
+
+    def _encoding(self, scope: Scope) -> Optional[str]:
+        accepted = Headers(scope=scope).get("accept-encoding", "")
+        if self.brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return self.brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = self._encoding(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message  # held until we know whether the body is complete
+                return
+            if start is None:
+                await send(message)
+                return
+            response_start, start = start, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=response_start["headers"])
+            if (
+                message["type"] != "http.response.body"
+                or message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+            ):
+                await send(response_start)
+                await send(message)
+                return
+            body = self._compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(response_start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+def add_compression(app: Any, algorithm: str, minimum_size: int = 1024) -> None:
+    """Install CompressionMiddleware unless `algorithm` is 'none' (or empty)."""
+    algorithm = (algorithm or "none").lower()
+    if algorithm == "none":
+        return
+    app.add_middleware(CompressionMiddleware, algorithm=algorithm, minimum_size=minimum_size)
+    logger.info(f"Compressing JSON responses of at least {minimum_size} bytes with {algorithm}")
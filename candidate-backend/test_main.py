@@ -0,0 +1,77 @@
+"""Start-up tests for the combined candidate backend (run with pytest from candidate-backend/)."""
+
+import json
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+pytest.importorskip("debugging_challenge.main", reason="debugging challenge dependencies not installed")
+from fastapi.testclient import TestClient
+
+import main
+from debugging_challenge.database import connection
+from debugging_challenge.database.models import Base, CandidateDB
+
+
+@pytest.fixture
+def old_schema_engine(tmp_path, monkeypatch):
+    """A database created before the change feed: no candidates.version/updated_at, no sequence table."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'talentai.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_candidates_version"))
+        conn.execute(text("ALTER TABLE candidates DROP COLUMN version"))
+        conn.execute(text("ALTER TABLE candidates DROP COLUMN updated_at"))
+        conn.execute(text("DROP TABLE change_sequences"))
+        conn.execute(text(
+            "INSERT INTO candidates (id, user_id, anonymous_id, first_name, last_name, display_name, email, created_at) "
+            "VALUES ('c1', 'JS-ABC123', 'JS-ABC123', 'Jane', 'Smith', 'Jane Smith', 'jane@example.com', '2024-01-01 00:00:00')"
+        ))
+    monkeypatch.setattr(connection, "engine", engine)
+    monkeypatch.setattr(connection, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    return engine
+
+
+@pytest.fixture
+def candidates_engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'talentai.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = session_factory()
+    for i in range(5):
+        db.add(CandidateDB(
+            id=f"c{i}", user_id=f"JS-{i:06d}", anonymous_id=f"JS-{i:06d}", first_name="Jane",
+            last_name="Smith", display_name=f"Jane Smith {i}", email=f"jane{i}@example.com",
+        ))
+    db.commit()
+    db.close()
+    monkeypatch.setattr(connection, "engine", engine)
+    monkeypatch.setattr(connection, "SessionLocal", session_factory)
+    return engine
+
+
+def test_startup_migrates_an_old_database(old_schema_engine):
+    with TestClient(main.app) as client:
+        columns = {c["name"] for c in inspect(old_schema_engine).get_columns("candidates")}
+        assert {"version", "updated_at"} <= columns
+
+        response = client.get("/debug/api/users/changes", params={"since": 0})
+        assert response.status_code == 200
+        assert [user["user_id"] for user in response.json()["changes"]] == ["JS-ABC123"]
+
+
+def test_bulk_export_streams_every_page(candidates_engine):
+    with TestClient(main.app) as client:
+        user_ids, cursor, pages = [], None, 0
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = client.get("/debug/api/users/bulk", params=params)
+            assert response.status_code == 200
+            user_ids += [json.loads(line)["user_id"] for line in response.text.splitlines()]
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+    assert user_ids == [f"JS-{i:06d}" for i in range(5)]
+    assert pages == 3
@@ -2,7 +2,6 @@
 Candidate Recommendation System for semantic matching between job descriptions and resumes.
 """
 
-from .models import JobDescription, CandidateMatch
-from .semantic_matcher import SemanticMatcher
+from .semantic_matcher import CandidateMatch, JobDescription, SemanticMatcher
 
 __all__ = ["JobDescription", "CandidateMatch", "SemanticMatcher"]
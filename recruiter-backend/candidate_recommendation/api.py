@@ -5,11 +5,13 @@ This module provides a clean HTTP API for job-candidate matching,
 following the same structure as the resume_generator_parser API.
 """
 
+import asyncio
 import json
 import logging
 import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
@@ -19,17 +21,51 @@ from pydantic import BaseModel
 from models import JobDescription, CandidateMatch
 from semantic_matcher import SemanticMatcher
 from config import config
+from services.model_registry import get_model_registry
+from services.responses import FastJSONResponse, add_compression
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+async def _preload_models():
+    """Load the extra models of CANDIDATE_PRELOAD_MODELS off the event loop; failures are logged."""
+    try:
+        await asyncio.to_thread(
+            get_model_registry().preload,
+            config.preload_models,
+            backend=config.encoder_backend,
+            device=config.device,
+            onnx_dir=config.onnx_model_dir,
+            quantize=config.onnx_quantize,
+            num_threads=config.onnx_threads
+        )
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Model preload failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Preload in the background so startup (and importing this module) never waits on model loads
+    preload_task = asyncio.create_task(_preload_models()) if config.preload_models else None
+    yield
+    if preload_task is not None:
+        preload_task.cancel()
+        try:
+            await preload_task
+        except asyncio.CancelledError:
+            pass
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Candidate Recommendation API",
     description="AI-powered semantic matching between jobs and candidates",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
+add_compression(app, config.response_compression, config.response_compression_min_bytes)
 
 # Initialize the semantic matcher
 try:
@@ -38,6 +74,14 @@ try:
         device=config.device,
         blend_alpha=config.blend_alpha,
         title_weight=config.title_weight,
+        max_batch_size=config.embed_max_batch_size,
+        max_wait_ms=config.embed_max_wait_ms,
+        encoder_backend=config.encoder_backend,
+        onnx_dir=config.onnx_model_dir,
+        onnx_quantize=config.onnx_quantize,
+        lexical_shortlist=config.lexical_shortlist if config.lexical_prefilter else 0,
+        corpus_cache_mb=config.corpus_cache_mb,
+        corpus_recheck_seconds=config.corpus_recheck_seconds,
     )
     logger.info("✅ Semantic matcher initialized successfully")
 except Exception as e:
@@ -66,6 +110,9 @@ class HealthResponse(BaseModel):
 class ModelsResponse(BaseModel):
     models: List[str]
     current_model: str
+    loaded: List[Dict[str, Any]] = []
+    total_weights_mb: float = 0.0
+    process_rss_mb: Optional[float] = None
 
 @app.get("/")
 async def root():
@@ -77,7 +124,7 @@ async def root():
         "endpoints": {
             "/": "API information",
             "/health": "Health check",
-            "/models": "Available models",
+            "/models": "Available models and memory used by loaded ones",
             "/match": "Match candidates to a job"
         },
         "usage": "Send POST requests to /match with job data to find candidate matches"
@@ -98,7 +145,7 @@ async def health_check():
 
 @app.get("/models", response_model=ModelsResponse)
 async def get_models():
-    """List available sentence transformer models."""
+    """List available sentence transformer models and the memory used by the loaded ones."""
     available_models = [
         "sentence-transformers/all-mpnet-base-v2",
         "sentence-transformers/all-MiniLM-L6-v2",
@@ -107,9 +154,13 @@ async def get_models():
     
     current_model = matcher.model_name if hasattr(matcher, 'model_name') else "unknown"
     
+    report = get_model_registry().memory_report()
     return ModelsResponse(
         models=available_models,
-        current_model=current_model
+        current_model=current_model,
+        loaded=report["models"],
+        total_weights_mb=report["total_weights_mb"],
+        process_rss_mb=report["process_rss_mb"]
     )
 
 @app.post("/match", response_model=JobMatchResponse)
@@ -141,8 +192,8 @@ async def match_candidates(request: JobMatchRequest):
             preferred_skills=job_data.get('preferred_skills', [])
         )
         
-        # Perform matching
-        matches = matcher.match_candidates(job, resumes_dir, top_n=top_n)
+        # Perform matching in a worker thread so the event loop stays responsive
+        matches = await asyncio.to_thread(matcher.match_candidates, job, resumes_dir, top_n=top_n)
         
         # Convert matches to dictionaries for JSON response
         match_data = []
@@ -158,13 +209,13 @@ async def match_candidates(request: JobMatchRequest):
         
         processing_time = time.time() - start_time
         
-        return JobMatchResponse(
+        return FastJSONResponse(JobMatchResponse(
             success=True,
             data=match_data,
             error=None,
             processing_time=processing_time,
             total_candidates=len(match_data)
-        )
+        ))
         
     except HTTPException:
         raise
@@ -218,8 +269,8 @@ async def match_candidates_file(
             preferred_skills=job_data.get('preferred_skills', [])
         )
         
-        # Perform matching
-        matches = matcher.match_candidates(job, resumes_dir, top_n=top_n)
+        # Perform matching in a worker thread so the event loop stays responsive
+        matches = await asyncio.to_thread(matcher.match_candidates, job, resumes_dir, top_n=top_n)
         
         # Convert matches to dictionaries for JSON response
         match_data = []
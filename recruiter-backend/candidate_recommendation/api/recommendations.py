@@ -1,15 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, defer
+from typing import Any, Dict, List, Optional
 import logging
 
 from ..database.connection import get_db
-from ..database.models import JobDB, RecommendationHistoryDB
+from ..database.models import CandidateDB, JobDB, RecommendationHistoryDB
+from ..database.history_codec import unpack_results
 from ..models.recommendation import (
     JobDescription, RecommendationRequest, RecommendationResponse,
-    AdvancedRecommendationRequest, CandidateMatch
+    AdvancedRecommendationRequest, CandidateMatch,
+    BatchRecommendationRequest, BatchRecommendationResponse, ResultPageResponse
 )
 from ..services.api_matcher_service import APICandidateMatcherService
+from ..services.candidate_client import get_candidate_client
+from ..services.history_writer import get_history_writer
+from ..services.model_registry import get_model_registry
+from ..services.responses import FastJSONResponse, dumps
 
 router = APIRouter(prefix="/api/recommendations", tags=["recommendations"])
 logger = logging.getLogger(__name__)
@@ -28,11 +35,56 @@ async def search_candidates(
     """
     try:
         response = await matcher_service.find_candidates(request, db)
-        return response
+        # Serialized in one pass by pydantic-core (the model already matches response_model)
+        return FastJSONResponse(response)
     except Exception as e:
         logger.error(f"Error in candidate search: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
+def _format_event(event: str, data: Dict[str, Any], fmt: str) -> str:
+    if fmt == "sse":
+        return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+    return dumps({"event": event, "data": data}).decode() + "\n"
+
+@router.post("/search/stream")
+async def stream_search_candidates(
+    request: RecommendationRequest,
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$"),
+    db: Session = Depends(get_db)
+):
+    """
+    Search for candidates, streaming the result as NDJSON lines or server-sent events.
+    Emits `metadata` first, then one `candidate` per match in rank order,
+    `summary` events (if requested) and a final `done`.
+    """
+    async def events():
+        try:
+            async for event, data in matcher_service.stream_candidates(request, db):
+                yield _format_event(event, data, format)
+        except Exception as e:
+            # Headers are already sent, so failures are reported in-band
+            logger.error(f"Error in streaming candidate search: {str(e)}")
+            yield _format_event("error", {"detail": f"Search failed: {str(e)}"}, format)
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(events(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+@router.post("/search/batch", response_model=BatchRecommendationResponse)
+async def batch_search_candidates(
+    request: BatchRecommendationRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Match many jobs against the candidate pool in one pass.
+    JDs are encoded in one batch and scored with a single jobs x candidates matrix multiply.
+    """
+    try:
+        response = await matcher_service.find_candidates_batch(request, db)
+        return FastJSONResponse(response)
+    except Exception as e:
+        logger.error(f"Error in batch candidate search: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch search failed: {str(e)}")
+
 @router.post("/search/advanced", response_model=RecommendationResponse) 
 async def advanced_search_candidates(
     request: AdvancedRecommendationRequest,
@@ -44,11 +96,30 @@ async def advanced_search_candidates(
     """
     try:
         response = await matcher_service.find_candidates_advanced(request, db)
-        return response
+        return FastJSONResponse(response)
     except Exception as e:
         logger.error(f"Error in advanced candidate search: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Advanced search failed: {str(e)}")
 
+@router.get("/results/{result_set_id}", response_model=ResultPageResponse)
+async def get_result_page(
+    result_set_id: str,
+    cursor: Optional[str] = Query(None, description="next_cursor from the search or previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=50, description="Page size (defaults to the search's top_n)")
+):
+    """
+    Next page of a search's ranked candidates, served from the stored
+    ranking without re-scoring. Result sets are per worker process, so
+    this must reach the worker that ran the search (sticky routing).
+    """
+    try:
+        page = matcher_service.get_result_page(result_set_id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page is None:
+        raise HTTPException(status_code=404, detail="Result set not found or expired; rerun the search")
+    return FastJSONResponse(page)
+
 @router.get("/jobs/{job_id}", response_model=JobDescription)
 async def get_job(job_id: str, db: Session = Depends(get_db)):
     """Get job details by ID."""
@@ -70,16 +141,43 @@ async def get_job(job_id: str, db: Session = Depends(get_db)):
         status=job.status
     )
 
+def _rehydrate_results(blob: Optional[bytes], db: Session) -> List[Dict[str, Any]]:
+    """Ranked (id, score) pairs from a history blob, with current details from the candidate replica."""
+    ranked = unpack_results(blob)
+    ids = [candidate_id for candidate_id, _ in ranked]
+    profiles = {
+        c.anonymous_id: c
+        for c in db.query(CandidateDB).filter(CandidateDB.anonymous_id.in_(ids))
+    } if ids else {}
+    results = []
+    for rank, (candidate_id, score) in enumerate(ranked, 1):
+        profile = profiles.get(candidate_id)
+        results.append({
+            "rank": rank,
+            "candidate_id": candidate_id,
+            "match_score": score,
+            "name": profile.display_name if profile else None,
+            "title": profile.title if profile else None
+        })
+    return results
+
 @router.get("/jobs/{job_id}/history")
 async def get_search_history(
     job_id: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    include_results: bool = Query(False, description="Decode ranked candidates and add current replica details"),
     db: Session = Depends(get_db)
 ):
-    """Get search history for a job."""
+    """
+    Get search history for a job.
+    Result payloads are only loaded when `include_results` is set.
+    """
+    query = db.query(RecommendationHistoryDB).options(defer(RecommendationHistoryDB.results))
+    if not include_results:
+        query = query.options(defer(RecommendationHistoryDB.results_blob))
     history = (
-        db.query(RecommendationHistoryDB)
+        query
         .filter(RecommendationHistoryDB.job_id == job_id)
         .order_by(RecommendationHistoryDB.created_at.desc())
         .offset(skip)
@@ -87,19 +185,20 @@ async def get_search_history(
         .all()
     )
     
-    return {
-        "job_id": job_id,
-        "searches": [
-            {
-                "id": h.id,
-                "search_query": h.search_query,
-                "total_candidates": h.total_candidates,
-                "created_at": h.created_at,
-                "results_count": len(h.results) if h.results else 0
-            }
-            for h in history
-        ]
-    }
+    searches = []
+    for h in history:
+        entry = {
+            "id": h.id,
+            "search_query": h.search_query,
+            "total_candidates": h.total_candidates,
+            "created_at": h.created_at,
+            "results_count": h.results_count or 0
+        }
+        if include_results:
+            entry["results"] = _rehydrate_results(h.results_blob, db)
+        searches.append(entry)
+    
+    return {"job_id": job_id, "searches": searches}
 
 @router.get("/jobs", response_model=List[JobDescription])
 async def list_jobs(
@@ -161,12 +260,36 @@ async def create_job(job: JobDescription, db: Session = Depends(get_db)):
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
+    sync_status = matcher_service.candidate_sync.status()
     return {
         "status": "healthy",
         "service": "candidate_recommendation",
         "matcher_model": matcher_service.model_name,
-        "data_source": "candidate_backend_api",
-        "api_client": "active"
+        "data_source": "local_replica" if sync_status["enabled"] and sync_status["ready"] else "candidate_backend_api",
+        "api_client": "active",
+        "candidate_sync": sync_status
+    }
+
+@router.get("/metrics")
+async def get_metrics():
+    """Latency histograms for candidate backend requests and cache counters."""
+    return {
+        "candidate_client": get_candidate_client().metrics(),
+        "embedding_store": matcher_service.embedding_store.stats(),
+        "jd_cache": matcher_service.jd_cache.stats(),
+        "embedding_executor": matcher_service.encoder.stats(),
+        "result_cache": matcher_service.result_cache.stats(),
+        "result_sets": matcher_service.result_sets.stats(),
+        "history_writer": get_history_writer().stats(),
+        "vector_index": matcher_service.index.memory_stats()
+    }
+
+@router.get("/models")
+async def get_models():
+    """Encoders loaded in this process (shared model registry) and the memory each one uses."""
+    return {
+        "current_model": matcher_service.model_name,
+        **get_model_registry().memory_report()
     }
 
 @router.post("/test/sample-job")
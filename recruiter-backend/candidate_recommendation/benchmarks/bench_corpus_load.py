@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Load time and peak memory: per-resume JSON files vs. a JSONL corpus.
+
+Writes N synthetic parsed resumes in both layouts produced by the resume
+pipelines (one pretty-printed JSON file each, and corpus.jsonl with its
+offset index), then loads each into a `SemanticMatcher` corpus registry
+the way `match_candidates` does (parse, build texts, skills and title
+tokens). Reports wall time and the Python-heap peak (tracemalloc) of each
+load, plus the cost of re-checking an unchanged corpus.
+
+Usage (from candidate_recommendation/):
+    python benchmarks/bench_corpus_load.py [--n 100000] [--dir /tmp/corpus_bench]
+"""
+
+import argparse
+import json
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from semantic_matcher import _corpus_record  # noqa: E402
+from services.corpus_registry import CorpusRegistry  # noqa: E402
+
+TITLES = ["Backend Engineer", "Data Scientist", "DevOps Engineer", "Frontend Developer", "Product Manager"]
+SKILLS = ["python", "go", "docker", "kubernetes", "sql", "react", "aws", "java", "terraform", "spark"]
+
+
+def _resume(i: int, rng: np.random.Generator) -> dict:
+    title = TITLES[i % len(TITLES)]
+    skills = list(rng.choice(SKILLS, size=4, replace=False))
+    return {
+        "filename": f"resume_{i:06d}.md",
+        "data": {
+            "name": f"Candidate {i}",
+            "title": title,
+            "summary": f"{title} with {', '.join(skills)} experience.",
+            "experience": [{"title": title, "company": f"Company {i % 97}", "highlights": ["Shipped things"] * 3}],
+            "skills": {"core": skills},
+        },
+    }
+
+
+def _write_layouts(root: Path, n: int) -> None:
+    rng = np.random.default_rng(0)
+    files_dir, corpus_dir = root / "files", root / "corpus"
+    files_dir.mkdir(parents=True)
+    corpus_dir.mkdir(parents=True)
+    offset = 0
+    with open(corpus_dir / "corpus.jsonl", "wb") as data, open(corpus_dir / "corpus.jsonl.idx", "wb") as index:
+        for i in range(n):
+            rec = _resume(i, rng)
+            (files_dir / f"resume_{i:06d}.json").write_text(json.dumps(rec, indent=2), encoding="utf-8")
+            line = json.dumps(rec, separators=(",", ":")).encode("utf-8") + b"\n"
+            data.write(line)
+            index.write(struct.pack("<Q", offset))
+            offset += len(line)
+
+
+def _measure(label: str, path: Path) -> None:
+    registry = CorpusRegistry(_corpus_record, max_bytes=2**40, recheck_seconds=0)
+    tracemalloc.start()
+    started = time.perf_counter()
+    corpus = registry.get(str(path))
+    view = corpus.view()
+    load_s = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    started = time.perf_counter()
+    registry.get(str(path))
+    recheck_ms = (time.perf_counter() - started) * 1000
+    print(f"{label:<12} {len(view):>8} {load_s:>9.2f} {peak / 2**20:>10.1f} {recheck_ms:>12.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=100000, help="Synthetic resumes to write")
+    parser.add_argument("--dir", help="Scratch directory (default: a temporary directory, removed afterwards)")
+    args = parser.parse_args()
+
+    root = Path(args.dir) if args.dir else Path(tempfile.mkdtemp(prefix="corpus_bench_"))
+    try:
+        print(f"Writing {args.n} resumes in both layouts under {root} ...")
+        _write_layouts(root, args.n)
+        print(f"{'layout':<12} {'records':>8} {'load (s)':>9} {'peak (MB)':>10} {'recheck (ms)':>12}")
+        _measure("json files", root / "files")
+        _measure("jsonl+mmap", root / "corpus")
+    finally:
+        if not args.dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: encoding on the event loop vs. through the micro-batching EmbeddingExecutor.
+
+Simulates N concurrent handlers that each encode one job description
+(the shape of concurrent /search traffic) and reports, for both modes:
+- throughput (encodes/sec)
+- event-loop lag: the worst delay seen by a 1 ms heartbeat task, i.e. how
+  long other requests would have been stalled
+
+Usage (from candidate_recommendation/):
+    python benchmarks/bench_embedding_executor.py [--model sentence-transformers/all-mpnet-base-v2]
+        [--concurrency 32] [--rounds 4] [--max-batch-size 64] [--max-wait-ms 5]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from sentence_transformers import SentenceTransformer  # noqa: E402
+from services.embedding_executor import EmbeddingExecutor  # noqa: E402
+
+JD_TEMPLATE = (
+    "Senior Backend Engineer {i} at Company {i}\n"
+    "We are looking for an engineer to build APIs and data pipelines.\n"
+    "Requirements: Python FastAPI PostgreSQL Docker Kubernetes\n"
+    "Preferred: AWS Redis Kafka"
+)
+
+
+async def _heartbeat(stop: asyncio.Event, lags: list) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - start - 0.001)
+
+
+async def _run(encode, concurrency: int, rounds: int):
+    stop = asyncio.Event()
+    lags: list = []
+    beat = asyncio.create_task(_heartbeat(stop, lags))
+    await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    for r in range(rounds):
+        await asyncio.gather(*[encode([JD_TEMPLATE.format(i=r * concurrency + i)]) for i in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await beat
+    return concurrency * rounds / elapsed, max(lags) if lags else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default="sentence-transformers/all-mpnet-base-v2")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=4)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    model = SentenceTransformer(args.model)
+    model.encode(["warm up"], show_progress_bar=False)
+
+    async def direct(texts):
+        # What the handlers used to do: encode synchronously on the event loop
+        return model.encode(texts, batch_size=32, show_progress_bar=False)
+
+    executor = EmbeddingExecutor(
+        lambda texts: model.encode(texts, batch_size=32, show_progress_bar=False),
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+    )
+
+    print(f"{args.concurrency} concurrent single-JD encodes x {args.rounds} rounds ({args.model})")
+    for label, encode in (("on event loop", direct), ("executor", executor.encode)):
+        throughput, lag = asyncio.run(_run(encode, args.concurrency, args.rounds))
+        print(f"{label:>14}: {throughput:8.1f} encodes/sec | max event-loop lag {lag * 1000:8.1f} ms")
+
+    stats = executor.stats()
+    print(f"executor: {stats['batches']} batches, {stats['mean_requests_per_batch']} requests/batch")
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
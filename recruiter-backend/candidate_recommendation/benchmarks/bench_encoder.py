@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Benchmark: encodes per second for the PyTorch and ONNX Runtime (int8) encoder backends.
+
+Usage (from candidate_recommendation/):
+    python benchmarks/bench_encoder.py [--model sentence-transformers/all-mpnet-base-v2]
+        [--texts 256] [--batch-sizes 1 32] [--backends torch onnx]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from services.encoders import ENCODER_BACKENDS, load_encoder  # noqa: E402
+
+TEXT = (
+    "Experienced backend engineer with {i} years building Python services, REST APIs and data "
+    "pipelines on AWS; comfortable with Docker, Kubernetes, PostgreSQL and mentoring junior developers."
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default="sentence-transformers/all-mpnet-base-v2")
+    parser.add_argument("--texts", type=int, default=256)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32])
+    parser.add_argument("--backends", nargs="+", default=list(ENCODER_BACKENDS), choices=ENCODER_BACKENDS)
+    parser.add_argument("--onnx-dir", default="./onnx_models")
+    parser.add_argument("--threads", type=int, default=0, help="onnxruntime intra-op threads")
+    args = parser.parse_args()
+
+    texts = [TEXT.format(i=i) for i in range(args.texts)]
+    print(f"Encoding {args.texts} texts with {args.model}")
+    for backend in args.backends:
+        model = load_encoder(args.model, backend=backend, device="cpu", onnx_dir=args.onnx_dir, num_threads=args.threads)
+        model.encode(texts[:8], batch_size=8)  # warm up
+        for batch_size in args.batch_sizes:
+            start = time.perf_counter()
+            model.encode(texts, batch_size=batch_size, show_progress_bar=False)
+            elapsed = time.perf_counter() - start
+            print(f"{backend:>6} | batch {batch_size:>4} | {args.texts / elapsed:8.1f} encodes/sec")
+
+
+if __name__ == "__main__":
+    main()
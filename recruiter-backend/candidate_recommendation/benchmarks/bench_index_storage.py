@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-worker memory and search latency for the index storage modes.
+
+Builds a flat index of random unit vectors, snapshots it once per storage
+dtype, then starts N worker processes (like uvicorn workers) that each load
+the snapshot and serve queries. For every mode it reports:
+- private memory per worker (anonymous RSS, i.e. not shared with other workers)
+- shared memory per worker (file-backed pages served from the page cache)
+- mean search latency
+- top-k recall against the float32 in-memory index
+
+Usage (from candidate_recommendation/):
+    python benchmarks/bench_index_storage.py [--pool 200000] [--dim 768] [--workers 4]
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from services.vector_index import STORAGE_DTYPES, create_index, load_index  # noqa: E402
+
+
+def _memory_kb() -> dict:
+    """Anonymous (private) and file-backed (shareable) resident memory of this process."""
+    fields = {}
+    with open("/proc/self/status") as fh:
+        for line in fh:
+            key, _, value = line.partition(":")
+            if key in ("RssAnon", "RssFile"):
+                fields[key] = int(value.split()[0])
+    return fields
+
+
+def _worker(path: str, mmap: bool, queries: np.ndarray, k: int, results) -> None:
+    before = _memory_kb()
+    index = load_index(path, mmap=mmap)
+    start = time.perf_counter()
+    found = [index.search(q, k)[0] for q in queries]
+    elapsed = time.perf_counter() - start
+    after = _memory_kb()
+    results.put({
+        "private_mb": (after["RssAnon"] - before["RssAnon"]) / 1024,
+        "shared_mb": (after["RssFile"] - before["RssFile"]) / 1024,
+        "ms_per_search": elapsed / len(queries) * 1000,
+        "found": found,
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pool", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--k", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.pool, args.dim), dtype=np.float32)
+    ids = [f"cand-{i}" for i in range(args.pool)]
+    queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    workdir = tempfile.mkdtemp(prefix="index-storage-")
+
+    paths = {}
+    for storage in STORAGE_DTYPES:
+        index = create_index("flat", storage=storage)
+        index.add(ids, vectors)
+        paths[storage] = os.path.join(workdir, f"index_{storage}.npz")
+        index.save(paths[storage])
+        del index
+    del vectors
+
+    print(f"{args.pool} x {args.dim} vectors, {args.workers} workers, top-{args.k}")
+    ctx = mp.get_context("spawn")
+    reference = None
+    modes = [("float32", False)] + [(storage, True) for storage in STORAGE_DTYPES]
+    for storage, mmap in modes:
+        results = ctx.Queue()
+        procs = [
+            ctx.Process(target=_worker, args=(paths[storage], mmap, queries, args.k, results))
+            for _ in range(args.workers)
+        ]
+        for p in procs:
+            p.start()
+        stats = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+        found = stats[0]["found"]
+        if reference is None:
+            reference = found
+        recall = np.mean([len(set(a) & set(b)) / args.k for a, b in zip(reference, found)])
+        label = f"{storage} ({'mmap' if mmap else 'in-memory'})"
+        print(
+            f"{label:>20} | private {np.mean([s['private_mb'] for s in stats]):8.1f} MB/worker"
+            f" | shared {np.mean([s['shared_mb'] for s in stats]):8.1f} MB/worker"
+            f" | {np.mean([s['ms_per_search'] for s in stats]):7.2f} ms/search | recall@{args.k} {recall:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-candidate Python scoring loop vs. the fused scoring kernel.
+
+The "loop" path reproduces how the matchers used to score: a Jaccard and a
+title-alignment call per candidate building Python sets, score lists
+combined in a second loop, then a full argsort. The "kernel" path builds
+the feature arrays once and ranks with `services.scoring.rank_candidates`
+(single numpy blend + argpartition top-k).
+
+Usage (from candidate_recommendation/):
+    python benchmarks/bench_scoring.py [--sizes 10000 100000] [--top-n 10] [--repeat 5]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from services.scoring import rank_candidates  # noqa: E402
+
+BLEND_ALPHA = 0.25
+TITLE_WEIGHT = 0.10
+SKILLS = [f"skill{i}" for i in range(600)] + ["python", "sql", "docker", "kubernetes", "react", "aws"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Data Scientist", "Backend Developer",
+          "Frontend Developer", "DevOps Engineer", "Machine Learning Engineer", "Product Manager"]
+
+
+def _jaccard(a: List[str], b: List[str]) -> float:
+    A = set(s.lower().strip() for s in a)
+    B = set(s.lower().strip() for s in b)
+    if not A and not B:
+        return 0.0
+    return len(A & B) / max(1, len(A | B))
+
+
+def _title_align(job_title: str, cand_title: str) -> float:
+    if not job_title or not cand_title:
+        return 0.0
+    a = set(job_title.lower().split())
+    b = set(cand_title.lower().split())
+    if not a:
+        return 0.0
+    return len(a & b) / max(3, len(a))
+
+
+def loop_scoring(semantic, cand_skills, cand_titles, jd_skills, jd_title, top_n):
+    skills_scores = []
+    title_scores = []
+    for skills, title in zip(cand_skills, cand_titles):
+        skills_scores.append(_jaccard(jd_skills, skills))
+        title_scores.append(_title_align(jd_title, title))
+    final = []
+    for i in range(len(cand_skills)):
+        final.append((1.0 - BLEND_ALPHA) * semantic[i] + BLEND_ALPHA * skills_scores[i] + TITLE_WEIGHT * title_scores[i])
+    order = np.argsort(final)[::-1][:top_n]
+    return order, np.asarray(final)[order]
+
+
+def kernel_scoring(semantic, cand_skill_sets, cand_title_sets, jd_skills, jd_title, top_n):
+    n = len(cand_skill_sets)
+    jd_skill_set = set(jd_skills)
+    jd_title_set = set(jd_title.lower().split())
+    skill_overlap = np.fromiter((len(jd_skill_set & s) for s in cand_skill_sets), dtype=np.float32, count=n)
+    skill_counts = np.fromiter((len(s) for s in cand_skill_sets), dtype=np.float32, count=n)
+    title_overlap = np.fromiter((len(jd_title_set & t) for t in cand_title_sets), dtype=np.float32, count=n)
+    return rank_candidates(semantic, skill_overlap, skill_counts, len(jd_skill_set),
+                           title_overlap, len(jd_title_set), BLEND_ALPHA, TITLE_WEIGHT, top_n)
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(n: int, top_n: int, repeat: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    semantic = np.random.default_rng(seed).uniform(-0.2, 0.9, n).astype(np.float32)
+    cand_skills = [rng.sample(SKILLS, rng.randint(0, 25)) for _ in range(n)]
+    cand_titles = [rng.choice(TITLES) for _ in range(n)]
+    jd_skills = ["python", "sql", "docker", "senior", "engineer"] + rng.sample(SKILLS, 10)
+    jd_title = "Senior Software Engineer"
+
+    # Per-candidate features are precomputed once per pool, not per request
+    cand_skill_sets = [frozenset(s.lower().strip() for s in skills) for skills in cand_skills]
+    cand_title_sets = [frozenset(t.lower().split()) for t in cand_titles]
+
+    t_loop, (loop_idx, loop_scores) = _best_of(
+        lambda: loop_scoring(semantic, cand_skills, cand_titles, jd_skills, jd_title, top_n), repeat)
+    t_kernel, (k_idx, k_scores) = _best_of(
+        lambda: kernel_scoring(semantic, cand_skill_sets, cand_title_sets, jd_skills, jd_title, top_n), repeat)
+
+    # Blend only (feature arrays already built), to isolate the numpy pass
+    jd_set = set(jd_skills)
+    overlap = np.fromiter((len(jd_set & s) for s in cand_skill_sets), dtype=np.float32, count=n)
+    counts = np.fromiter((len(s) for s in cand_skill_sets), dtype=np.float32, count=n)
+    title_overlap = np.fromiter((len({"senior", "software", "engineer"} & t) for t in cand_title_sets), dtype=np.float32, count=n)
+    t_blend, _ = _best_of(lambda: rank_candidates(semantic, overlap, counts, len(jd_set), title_overlap, 3,
+                                                  BLEND_ALPHA, TITLE_WEIGHT, top_n), repeat)
+
+    assert np.allclose(loop_scores, k_scores, atol=1e-5), "kernel and loop disagree on top scores"
+
+    print(f"{n:>8,} candidates | loop {t_loop * 1000:9.2f} ms | kernel {t_kernel * 1000:8.2f} ms "
+          f"({t_loop / t_kernel:5.1f}x) | blend+top-k only {t_blend * 1000:7.3f} ms ({t_loop / t_blend:6.1f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Scoring benchmark (top_n={args.top_n}, best of {args.repeat})")
+    for n in args.sizes:
+        run(n, args.top_n, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: rendering a large RecommendationResponse.
+
+Builds a response with N candidates (default 1,000, with summaries) and
+times each way the apps can turn it into a response body:
+
+  jsonable+json    FastAPI without response_model: jsonable_encoder, then
+                   starlette's JSONResponse (stdlib json.dumps)
+  dump+json        FastAPI with response_model: model_dump(mode="json"),
+                   then JSONResponse
+  dump+fast        the same dicts rendered by FastJSONResponse (orjson),
+                   i.e. default_response_class alone
+  model+fast       the model handed to FastJSONResponse directly
+                   (pydantic-core model_dump_json, no intermediate dicts),
+                   as the search routes now do
+
+Then reports body size and compression time for gzip (and brotli, if
+installed) at the middleware's default levels.
+
+Usage (from candidate_recommendation/):
+    python benchmarks/bench_serialization.py [--n 1000] [--repeat 20]
+"""
+
+import argparse
+import gzip
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from models.recommendation import CandidateMatch, RecommendationResponse  # noqa: E402
+from services.responses import FastJSONResponse, orjson  # noqa: E402
+
+SKILLS = ["python", "go", "docker", "kubernetes", "sql", "react", "aws", "terraform", "spark", "kafka"]
+
+
+def _response(n: int) -> RecommendationResponse:
+    candidates = [
+        CandidateMatch(
+            candidate_id=f"cand-{i:06d}",
+            name=f"Candidate {i}",
+            title="Senior Backend Engineer",
+            match_score=round(1.0 - i / (n + 1), 4),
+            skills_match=SKILLS[: 3 + i % 7],
+            skills_gap=SKILLS[7:],
+            summary=f"Backend engineer with {3 + i % 12} years building Python and Go services on Kubernetes. " * 3,
+            experience_years=3 + i % 12,
+            location="Berlin, Germany",
+        )
+        for i in range(n)
+    ]
+    return RecommendationResponse(
+        job_id="job-1",
+        candidates=candidates,
+        total_candidates_searched=100000,
+        search_metadata={"model": "all-mpnet-base-v2", "result_cache": "miss", "pool_version": 42},
+    )
+
+
+def _time(fn, repeat: int) -> float:
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=1000, help="Candidates in the response")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    response = _response(args.n)
+    paths = {
+        "jsonable+json": lambda: JSONResponse(jsonable_encoder(response)).body,
+        "dump+json": lambda: JSONResponse(response.model_dump(mode="json")).body,
+        "dump+fast": lambda: FastJSONResponse(response.model_dump(mode="json")).body,
+        "model+fast": lambda: FastJSONResponse(response).body,
+    }
+    print(f"{args.n} candidates, median of {args.repeat} (orjson {'installed' if orjson else 'NOT installed'})")
+    print(f"{'path':<15} {'ms':>8} {'speedup':>8}")
+    baseline = None
+    for name, fn in paths.items():
+        ms = _time(fn, args.repeat)
+        baseline = baseline or ms
+        print(f"{name:<15} {ms:>8.2f} {baseline / ms:>7.1f}x")
+
+    body = FastJSONResponse(response).body
+    print(f"\n{'encoding':<15} {'KB':>8} {'ms':>8}")
+    print(f"{'identity':<15} {len(body) / 1024:>8.1f} {0.0:>8.2f}")
+    codecs = {"gzip (6)": lambda: gzip.compress(body, compresslevel=6)}
+    try:
+        import brotli
+        codecs["brotli (4)"] = lambda: brotli.compress(body, quality=4)
+    except ImportError:
+        print("(brotli not installed; pip install brotli to compare)")
+    for name, fn in codecs.items():
+        ms = _time(fn, args.repeat)
+        print(f"{name:<15} {len(fn()) / 1024:>8.1f} {ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Recall report: two-stage retrieval (BM25 shortlist -> dense blend) vs. exhaustive scoring.
+
+Candidates and jobs are embedded once; then, for each job, the blended
+ranking over the whole pool (exhaustive) is compared with the ranking over
+the BM25 shortlist only. Reports recall@k (share of the exhaustive top-k
+that the two-stage search also returns) per shortlist size, the fraction
+of the pool that is densely scored, and the scoring time per job.
+
+Candidates come from a parsed-resumes directory, or are synthesized from
+title/skill templates with --synthetic N. Synthetic candidates share a
+small vocabulary, which is a harder case for a lexical prefilter than
+real resumes.
+
+Usage (from candidate_recommendation/):
+    python benchmarks/lexical_recall.py --synthetic 20000 [--shortlists 500 1000 2000] [--k 10 50]
+    python benchmarks/lexical_recall.py --resumes-dir ../resume_generator_parser/example_output/parsed
+        [--min-recall 0.95]   # exit 1 if recall@k at the largest shortlist is lower
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from semantic_matcher import (  # noqa: E402
+    _STOP,
+    JobDescription,
+    _candidate_summary_text,
+    _load_resume_jsons,
+    _skills_from_jd,
+    _skills_from_resume_data,
+    _tokenize,
+)
+from services.encoders import load_encoder  # noqa: E402
+from services.lexical_index import BM25Index  # noqa: E402
+from services.scoring import rank_candidates  # noqa: E402
+from services.skill_vocab import SkillMatrix  # noqa: E402
+
+ROLES = {
+    "Backend Engineer": ["python", "django", "fastapi", "postgresql", "redis", "docker", "aws", "kafka", "go"],
+    "Frontend Developer": ["react", "typescript", "javascript", "css", "next.js", "redux", "webpack", "figma"],
+    "Data Scientist": ["python", "pandas", "scikit-learn", "sql", "statistics", "pytorch", "spark", "tableau"],
+    "DevOps Engineer": ["kubernetes", "terraform", "docker", "linux", "prometheus", "aws", "ansible", "ci/cd"],
+    "Mobile Developer": ["swift", "kotlin", "flutter", "ios", "android", "firebase", "graphql"],
+    "Machine Learning Engineer": ["pytorch", "tensorflow", "mlops", "python", "nlp", "computer vision", "cuda"],
+    "Product Designer": ["figma", "user research", "prototyping", "design systems", "accessibility"],
+    "Security Engineer": ["penetration testing", "siem", "iam", "cloud security", "python", "threat modeling"],
+}
+SENIORITY = ["Junior", "", "Senior", "Staff", "Lead"]
+
+
+def _synthetic_pool(n: int, rng: np.random.Generator):
+    roles = list(ROLES)
+    texts, skills, titles = [], [], []
+    for i in range(n):
+        role = roles[rng.integers(len(roles))]
+        # Most skills from the role, a few from anywhere
+        pool = ROLES[role] + ROLES[roles[rng.integers(len(roles))]]
+        cand_skills = sorted(set(rng.choice(pool, size=min(len(pool), int(rng.integers(3, 9))), replace=False)))
+        title = f"{SENIORITY[rng.integers(len(SENIORITY))]} {role}".strip()
+        years = int(rng.integers(1, 15))
+        texts.append(f"{title}. {years} years of experience. Skills: {', '.join(cand_skills)}")
+        skills.append(cand_skills)
+        titles.append(title)
+    return texts, skills, titles
+
+
+def _synthetic_jobs(n: int, rng: np.random.Generator):
+    roles = list(ROLES)
+    jobs = []
+    for i in range(n):
+        role = roles[i % len(roles)]
+        reqs = list(rng.choice(ROLES[role], size=min(4, len(ROLES[role])), replace=False))
+        jobs.append(JobDescription(
+            title=f"{SENIORITY[rng.integers(len(SENIORITY))]} {role}".strip(),
+            company=f"Company {i}",
+            description=f"We are hiring a {role.lower()} to join a growing team.",
+            requirements=reqs,
+        ))
+    return jobs
+
+
+def _job_text(job: JobDescription) -> str:
+    return "\n".join([
+        job.title or "",
+        job.company or "",
+        job.description or "",
+        "Requirements:\n" + "\n".join(job.requirements or []),
+        "Preferred:\n" + "\n".join(job.preferred_skills or []),
+    ]).strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--resumes-dir", help="Directory of parsed resume JSONs (or a combined.json)")
+    source.add_argument("--synthetic", type=int, help="Number of synthetic candidates to generate")
+    parser.add_argument("--jobs", type=int, default=16, help="Synthetic job descriptions to evaluate")
+    parser.add_argument("--shortlists", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--k", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--model", default="sentence-transformers/all-mpnet-base-v2")
+    parser.add_argument("--backend", default="torch", choices=["torch", "onnx"])
+    parser.add_argument("--blend-alpha", type=float, default=0.25)
+    parser.add_argument("--title-weight", type=float, default=0.10)
+    parser.add_argument("--min-recall", type=float, default=None)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.synthetic:
+        texts, skills, titles = _synthetic_pool(args.synthetic, rng)
+    else:
+        texts, skills, titles = [], [], []
+        for res in _load_resume_jsons(Path(args.resumes_dir)):
+            text, data = _candidate_summary_text(res)
+            if text:
+                texts.append(text)
+                skills.append(_skills_from_resume_data(data))
+                titles.append(data.get("title") or "")
+    jobs = _synthetic_jobs(args.jobs, rng)
+    if not texts:
+        sys.exit("No candidates found")
+
+    print(f"Encoding {len(texts)} candidates and {len(jobs)} jobs with {args.model} ({args.backend})")
+    model = load_encoder(args.model, backend=args.backend)
+    cand_embs = np.asarray(model.encode(texts, batch_size=64, show_progress_bar=False), dtype=np.float32)
+    cand_embs /= np.linalg.norm(cand_embs, axis=1, keepdims=True) + 1e-9
+    job_texts = [_job_text(job) for job in jobs]
+    job_embs = np.asarray(model.encode(job_texts, batch_size=64, show_progress_bar=False), dtype=np.float32)
+    job_embs /= np.linalg.norm(job_embs, axis=1, keepdims=True) + 1e-9
+
+    skill_matrix = SkillMatrix.from_lists(skills)
+    skill_counts = skill_matrix.counts()
+    title_sets = [set(_tokenize(t)) for t in titles]
+    lexical = BM25Index(_tokenize, _STOP)
+    lexical.sync(dict(enumerate(texts)))
+
+    def blend(job, job_emb, rows, k):
+        jd_skills = set(_skills_from_jd(job))
+        jd_title = set(_tokenize(job.title))
+        title_overlap = np.fromiter((len(jd_title & title_sets[r]) for r in rows), dtype=np.float32, count=len(rows))
+        order, _ = rank_candidates(
+            cand_embs[rows] @ job_emb, skill_matrix.overlap(jd_skills)[rows], skill_counts[rows], len(jd_skills),
+            title_overlap, len(jd_title), args.blend_alpha, args.title_weight, k,
+        )
+        return rows[order].tolist()
+
+    max_k = max(args.k)
+    all_rows = np.arange(len(texts))
+    start = time.perf_counter()
+    exhaustive = [blend(job, emb, all_rows, max_k) for job, emb in zip(jobs, job_embs)]
+    exhaustive_ms = (time.perf_counter() - start) / len(jobs) * 1000
+    print(f"\n{'exhaustive':>10} | scored 100.0% of pool | {exhaustive_ms:7.2f} ms/job")
+
+    final_recall = {}
+    for shortlist in sorted(args.shortlists):
+        recalls = {k: [] for k in args.k}
+        scored = []
+        start = time.perf_counter()
+        for job, emb, text, reference in zip(jobs, job_embs, job_texts, exhaustive):
+            keys, _ = lexical.search(text, shortlist)
+            rows = np.asarray(sorted(keys), dtype=np.int64)
+            found = blend(job, emb, rows, max_k) if len(rows) else []
+            scored.append(len(rows) / len(texts))
+            for k in args.k:
+                recalls[k].append(len(set(found[:k]) & set(reference[:k])) / max(1, min(k, len(reference))))
+        elapsed_ms = (time.perf_counter() - start) / len(jobs) * 1000
+        final_recall = {k: float(np.mean(v)) for k, v in recalls.items()}
+        cells = " | ".join(f"recall@{k} {final_recall[k]:.3f}" for k in args.k)
+        print(f"bm25 {shortlist:>5} | scored {np.mean(scored) * 100:5.1f}% of pool | {elapsed_ms:7.2f} ms/job | {cells}")
+
+    if args.min_recall is not None and min(final_recall.values()) < args.min_recall:
+        print(f"FAIL: recall below {args.min_recall} at shortlist {max(args.shortlists)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
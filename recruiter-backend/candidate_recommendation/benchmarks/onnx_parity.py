@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Parity check: ONNX Runtime (int8) embeddings vs. the PyTorch sentence-transformers model.
+
+Encodes the same texts with both backends and reports per-text cosine
+similarity between the two embeddings, plus how much the top-k ranking of
+candidates for each job text changes. Exits non-zero when the worst
+cosine drift (1 - cosine) exceeds --max-drift, so it can gate enabling
+CANDIDATE_ENCODER_BACKEND=onnx.
+
+Usage (from candidate_recommendation/):
+    python benchmarks/onnx_parity.py [--model sentence-transformers/all-mpnet-base-v2]
+        [--resumes-dir ../resume_generator_parser/example_output/parsed] [--max-drift 0.02]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from semantic_matcher import _candidate_summary_text, _load_resume_jsons  # noqa: E402
+from services.encoders import load_encoder  # noqa: E402
+
+JOB_TEXTS = [
+    "Senior Software Engineer\nBuild scalable backend services.\nRequirements: Python Django PostgreSQL AWS",
+    "Data Scientist\nModel customer churn and run experiments.\nRequirements: Python pandas scikit-learn SQL statistics",
+    "Frontend Developer\nShip accessible web interfaces.\nRequirements: React TypeScript CSS testing",
+    "DevOps Engineer\nOwn CI/CD and cloud infrastructure.\nRequirements: Kubernetes Terraform Docker Linux monitoring",
+]
+
+SAMPLE_CANDIDATES = [
+    "Backend engineer with 6 years of Python and Django, designing REST APIs on AWS.",
+    "Machine learning engineer focused on NLP, PyTorch and model deployment.",
+    "Frontend developer building React and TypeScript single-page applications.",
+    "Site reliability engineer running Kubernetes clusters and Terraform pipelines.",
+    "Data analyst skilled in SQL, Tableau dashboards and A/B test analysis.",
+    "Full-stack developer: Node.js, Vue, PostgreSQL, Docker.",
+    "Mobile developer shipping Swift and Kotlin apps with CI on GitHub Actions.",
+    "Junior Python developer with internship experience in Flask and pytest.",
+    "Cloud architect with AWS certifications, networking and security background.",
+    "Product manager with a background in data science and experimentation.",
+]
+
+
+def _candidate_texts(resumes_dir: str) -> list:
+    texts = []
+    for res in _load_resume_jsons(Path(resumes_dir)):
+        text, _ = _candidate_summary_text(res)
+        if text:
+            texts.append(text)
+    return texts
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    return x / (np.linalg.norm(x, axis=1, keepdims=True) + 1e-9)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default="sentence-transformers/all-mpnet-base-v2")
+    parser.add_argument("--resumes-dir", default=None, help="Parsed resumes to use as candidate texts")
+    parser.add_argument("--onnx-dir", default="./onnx_models")
+    parser.add_argument("--no-quantize", action="store_true", help="Compare the fp32 ONNX export instead")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--max-drift", type=float, default=0.02, help="Max allowed 1 - cosine per text")
+    args = parser.parse_args()
+
+    candidates = _candidate_texts(args.resumes_dir) if args.resumes_dir else SAMPLE_CANDIDATES
+    texts = JOB_TEXTS + candidates
+
+    torch_model = load_encoder(args.model, backend="torch", device="cpu")
+    onnx_model = load_encoder(args.model, backend="onnx", onnx_dir=args.onnx_dir, quantize=not args.no_quantize)
+
+    ref = _normalize(np.asarray(torch_model.encode(texts, batch_size=32, show_progress_bar=False), dtype=np.float32))
+    got = _normalize(np.asarray(onnx_model.encode(texts, batch_size=32), dtype=np.float32))
+
+    cosine = np.sum(ref * got, axis=1)
+    drift = 1.0 - cosine
+    print(f"Texts compared: {len(texts)} ({len(JOB_TEXTS)} jobs, {len(candidates)} candidates)")
+    print(f"Cosine(torch, onnx): mean {cosine.mean():.5f} | min {cosine.min():.5f}")
+    print(f"Drift (1 - cosine):  mean {drift.mean():.5f} | max {drift.max():.5f} (limit {args.max_drift})")
+
+    # Ranking agreement: candidates retrieved for each job by both backends
+    k = min(args.top_k, len(candidates))
+    n_jobs = len(JOB_TEXTS)
+    overlaps = []
+    for j in range(n_jobs):
+        top_ref = set(np.argsort(-(ref[n_jobs:] @ ref[j]))[:k])
+        top_got = set(np.argsort(-(got[n_jobs:] @ got[j]))[:k])
+        overlaps.append(len(top_ref & top_got) / k)
+    print(f"Top-{k} candidate overlap per job: mean {np.mean(overlaps):.3f} | min {np.min(overlaps):.3f}")
+
+    if drift.max() > args.max_drift:
+        print("FAIL: ONNX embeddings drift beyond the allowed bound")
+        sys.exit(1)
+    print("OK: ONNX embeddings within the allowed drift")
+
+
+if __name__ == "__main__":
+    main()
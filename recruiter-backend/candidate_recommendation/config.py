@@ -32,11 +32,58 @@ class CandidateRecommendationConfig:
         # Sentence Transformer Model Configuration
         self.sbert_model = os.getenv("CANDIDATE_SBERT_MODEL", "sentence-transformers/all-mpnet-base-v2")
         self.device = os.getenv("CANDIDATE_DEVICE", "cpu")  # Device: 'gpu' or 'cpu'
+        self.encoder_backend = os.getenv("CANDIDATE_ENCODER_BACKEND", "torch")  # 'torch' or 'onnx' (int8 ONNX Runtime, CPU)
+        self.onnx_model_dir = os.getenv("CANDIDATE_ONNX_MODEL_DIR", "./onnx_models")  # Cached ONNX exports
+        self.onnx_quantize = os.getenv("CANDIDATE_ONNX_QUANTIZE", "true").lower() == "true"  # Dynamic int8 quantization
+        self.onnx_threads = int(os.getenv("CANDIDATE_ONNX_THREADS", "0"))  # onnxruntime intra-op threads (0 = default)
+        self.model_warmup = os.getenv("CANDIDATE_MODEL_WARMUP", "true").lower() == "true"  # Load the encoder in the background at startup (else on first use)
+        self.preload_models = [m.strip() for m in os.getenv("CANDIDATE_PRELOAD_MODELS", "").split(",") if m.strip()]  # Extra models loaded during warm-up
         
         # Matching Algorithm Parameters
         self.blend_alpha = float(os.getenv("CANDIDATE_BLEND_ALPHA", "0.25"))  # Weight for skills Jaccard vs embedding similarity
         self.title_weight = float(os.getenv("CANDIDATE_TITLE_WEIGHT", "0.10"))  # Extra weight for title alignment
         
+        # Embedding Cache
+        self.embedding_store_path = os.getenv("CANDIDATE_EMBEDDING_STORE_PATH", "./candidate_embeddings.db")  # Persistent candidate embeddings
+        self.embedding_memory_size = int(os.getenv("CANDIDATE_EMBEDDING_MEMORY_SIZE", "10000"))  # Store vectors kept in memory (LRU, 0 disables)
+        self.jd_cache_size = int(os.getenv("CANDIDATE_JD_CACHE_SIZE", "256"))  # Job-description encodings kept in the LRU cache (0 disables)
+        self.result_cache_size = int(os.getenv("CANDIDATE_RESULT_CACHE_SIZE", "512"))  # Search results cached per corpus version (0 disables)
+        self.result_set_depth = int(os.getenv("CANDIDATE_RESULT_SET_DEPTH", "200"))  # Candidates ranked per search for cursor pagination (0 disables)
+        self.result_set_ttl_seconds = float(os.getenv("CANDIDATE_RESULT_SET_TTL_SECONDS", "900"))  # Idle time before a result set expires
+        self.result_set_cache_size = int(os.getenv("CANDIDATE_RESULT_SET_CACHE_SIZE", "1024"))  # Result sets kept (LRU, 0 disables)
+        
+        # Vector Index
+        self.index_backend = os.getenv("CANDIDATE_INDEX_BACKEND", "flat")  # 'flat' (exact) or 'ivf' (approximate)
+        self.index_snapshot_path = os.getenv("CANDIDATE_INDEX_SNAPSHOT_PATH", "./candidate_index.npz")
+        self.index_storage = os.getenv("CANDIDATE_INDEX_STORAGE", "float32")  # 'float32', 'float16' or 'int8' (per-row scaled)
+        self.index_mmap = os.getenv("CANDIDATE_INDEX_MMAP", "true").lower() == "true"  # Memory-map the snapshot matrix (shared across workers)
+        self.index_shortlist = int(os.getenv("CANDIDATE_INDEX_SHORTLIST", "500"))  # Candidates re-scored after ANN retrieval
+        self.ivf_nlist = int(os.getenv("CANDIDATE_IVF_NLIST", "0"))  # 0 = sqrt(pool size)
+        self.ivf_nprobe = int(os.getenv("CANDIDATE_IVF_NPROBE", "8"))
+        self.batch_job_chunk = int(os.getenv("CANDIDATE_BATCH_JOB_CHUNK", "64"))  # Jobs per similarity GEMM in batch search
+        self.lexical_prefilter = os.getenv("CANDIDATE_LEXICAL_PREFILTER", "false").lower() == "true"  # BM25 first stage before dense scoring
+        self.lexical_shortlist = int(os.getenv("CANDIDATE_LEXICAL_SHORTLIST", "2000"))  # Candidates kept by BM25 for dense re-scoring
+        self.corpus_cache_mb = float(os.getenv("CANDIDATE_CORPUS_CACHE_MB", "512"))  # Memory for cached resume directories (LRU-evicted)
+        self.corpus_recheck_seconds = float(os.getenv("CANDIDATE_CORPUS_RECHECK_SECONDS", "2"))  # Min time between change scans of a cached directory
+        
+        # Candidate Replica Sync
+        self.sync_enabled = os.getenv("CANDIDATE_SYNC_ENABLED", "true").lower() == "true"  # Serve searches from the local replica
+        self.sync_interval_seconds = float(os.getenv("CANDIDATE_SYNC_INTERVAL_SECONDS", "30"))
+        self.sync_max_deactivate_fraction = float(os.getenv("CANDIDATE_SYNC_MAX_DEACTIVATE_FRACTION", "0.5"))  # Refuse full syncs that would deactivate more of the pool (1 disables)
+        
+        # Embedding Executor
+        self.embed_max_batch_size = int(os.getenv("CANDIDATE_EMBED_MAX_BATCH_SIZE", "64"))  # Texts merged into one encode call
+        self.embed_max_wait_ms = float(os.getenv("CANDIDATE_EMBED_MAX_WAIT_MS", "5"))  # How long a batch waits to fill
+        
+        # Search History Writer
+        self.history_queue_size = int(os.getenv("CANDIDATE_HISTORY_QUEUE_SIZE", "10000"))  # Records buffered before searches wait for the writer
+        self.history_batch_size = int(os.getenv("CANDIDATE_HISTORY_BATCH_SIZE", "200"))  # Records per batched insert
+        self.history_flush_ms = float(os.getenv("CANDIDATE_HISTORY_FLUSH_MS", "200"))  # How long a batch waits to fill before it is written
+        
+        # HTTP Responses
+        self.response_compression = os.getenv("CANDIDATE_RESPONSE_COMPRESSION", "gzip").lower()  # 'gzip', 'brotli' (pip install brotli) or 'none'
+        self.response_compression_min_bytes = int(os.getenv("CANDIDATE_RESPONSE_COMPRESSION_MIN_BYTES", "1024"))  # Smaller bodies are sent uncompressed
+        
         # Default Paths
         self.default_resumes_dir = os.getenv("CANDIDATE_DEFAULT_RESUMES_DIR", "../resume_generator_parser/example_output/parsed")
         self.default_top_n = int(os.getenv("CANDIDATE_DEFAULT_TOP_N", "10"))
@@ -1,8 +1,11 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, null, select, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./recruiter_talentai.db")
 
 engine = create_engine(
@@ -21,5 +24,51 @@ def get_db():
         db.close()
 
 def init_db():
-    from .models import JobDB, CandidateDB, RecommendationHistoryDB
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    from .models import JobDB, CandidateDB, RecommendationHistoryDB, SyncStateDB
+    
+    # The candidates table predates the replica columns and was never populated,
+    # so an old empty copy can simply be recreated with the current schema.
+    inspector = inspect(engine)
+    if inspector.has_table(CandidateDB.__tablename__):
+        columns = {c["name"] for c in inspector.get_columns(CandidateDB.__tablename__)}
+        if "source_version" not in columns:
+            with engine.begin() as conn:
+                if conn.execute(CandidateDB.__table__.select().limit(1)).first() is None:
+                    CandidateDB.__table__.drop(conn)
+    
+    Base.metadata.create_all(bind=engine)
+    _migrate_history_results()
+
+def _migrate_history_results(chunk_size: int = 500):
+    """
+    Move recommendation history from JSON match lists to packed id/score blobs:
+    add the `results_blob` / `results_count` columns to an older table, then
+    re-encode legacy rows in chunks and clear their JSON `results`.
+    """
+    from .models import RecommendationHistoryDB
+    from .history_codec import pack_match_dicts
+    
+    table = RecommendationHistoryDB.__table__
+    columns = {c["name"] for c in inspect(engine).get_columns(table.name)}
+    with engine.begin() as conn:
+        for name in ("results_blob", "results_count"):
+            if name not in columns:
+                column_type = table.c[name].type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type}"))
+    
+    pending = select(table.c.id, table.c.results).where(table.c.results_blob.is_(None)).limit(chunk_size)
+    migrated = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(pending).fetchall()
+            for row_id, results in rows:
+                conn.execute(
+                    table.update()
+                    .where(table.c.id == row_id)
+                    .values(results_blob=pack_match_dicts(results), results_count=len(results or []), results=null())
+                )
+        migrated += len(rows)
+        if len(rows) < chunk_size:
+            break
+    if migrated:
+        logger.info(f"Migrated {migrated} recommendation history rows to packed results")
\ No newline at end of file
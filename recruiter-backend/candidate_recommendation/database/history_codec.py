@@ -0,0 +1,55 @@
+"""
+Compact binary encoding of recommendation history results.
+
+History rows used to store every CandidateMatch as a JSON dict, including
+its summary. They now store only the ranked candidate ids and scores in
+one blob; details are rehydrated from the candidate replica when a
+caller asks for them.
+
+Layout (little-endian):
+
+    b"RH"  version (uint8)  reserved (uint8)  count (uint32)
+    count x float16 scores
+    count NUL-separated UTF-8 candidate ids
+"""
+
+import struct
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+_MAGIC = b"RH"
+_VERSION = 1
+_HEADER = struct.Struct("<2sBBI")
+
+
+def pack_results(results: Iterable[Tuple[str, float]]) -> bytes:
+    """Encode (candidate id, score) pairs in rank order."""
+    results = list(results)
+    scores = np.asarray([score for _, score in results], dtype="<f2")
+    ids = "\0".join(candidate_id for candidate_id, _ in results).encode("utf-8")
+    return _HEADER.pack(_MAGIC, _VERSION, 0, len(results)) + scores.tobytes() + ids
+
+
+def unpack_results(blob: Optional[bytes]) -> List[Tuple[str, float]]:
+    """Decode a blob from `pack_results` back into (candidate id, score) pairs."""
+    if not blob:
+        return []
+    magic, version, _, count = _HEADER.unpack_from(blob)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"Unsupported history results encoding: {magic!r} v{version}")
+    offset = _HEADER.size
+    scores = np.frombuffer(blob, dtype="<f2", count=count, offset=offset)
+    ids_raw = bytes(blob[offset + 2 * count:])
+    ids = ids_raw.decode("utf-8").split("\0") if count else []
+    return [(candidate_id, round(float(score), 4)) for candidate_id, score in zip(ids, scores)]
+
+
+def match_key(match: Dict[str, Any]) -> str:
+    """Identifier stored for a match dict: the candidate id, or the source file for file-based matches."""
+    return match.get("candidate_id") or match.get("filename") or match.get("name") or ""
+
+
+def pack_match_dicts(matches: Optional[List[Dict[str, Any]]]) -> bytes:
+    """Encode legacy JSON results (lists of CandidateMatch dicts)."""
+    return pack_results((match_key(m), float(m.get("match_score") or 0.0)) for m in matches or [])
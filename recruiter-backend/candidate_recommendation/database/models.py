@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, JSON, Float, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, JSON, Float, DateTime, Boolean, LargeBinary
 from sqlalchemy.sql import func
 from .connection import Base
 import uuid
@@ -24,25 +24,40 @@ class CandidateDB(Base):
     __tablename__ = "candidates"
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    anonymous_id = Column(String, unique=True, index=True)
+    anonymous_id = Column(String, unique=True, index=True)  # Candidate backend user_id
     name_hash = Column(String)  # For anonymization
+    display_name = Column(String)
+    email = Column(String)
     title = Column(String)
     skills = Column(JSON)
+    experience = Column(JSON)
     experience_years = Column(Integer)
     location = Column(String)
     summary = Column(Text)
+    statistics = Column(JSON)
+    resume_data = Column(JSON)
     source_file = Column(String)
+    source_version = Column(Integer, index=True)  # Change version on the candidate backend
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     is_active = Column(Boolean, default=True)
 
+class SyncStateDB(Base):
+    __tablename__ = "sync_state"
+    
+    name = Column(String, primary_key=True)
+    cursor = Column(Integer)  # Last change version applied; NULL forces a full export
+    last_synced_at = Column(DateTime(timezone=True))
+
 class RecommendationHistoryDB(Base):
     __tablename__ = "recommendation_history"
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     job_id = Column(String, nullable=False, index=True)
     search_query = Column(JSON)
-    results = Column(JSON)
+    results = Column(JSON)  # Legacy full match dicts; NULL for rows using results_blob
+    results_blob = Column(LargeBinary)  # Ranked candidate ids + float16 scores (see history_codec)
+    results_count = Column(Integer)
     total_candidates = Column(Integer)
     search_metadata = Column(JSON)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
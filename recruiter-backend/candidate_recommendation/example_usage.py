@@ -10,6 +10,7 @@ import json
 from pathlib import Path
 from models import JobDescription
 from semantic_matcher import SemanticMatcher
+from services.resume_corpus import JsonlCorpus
 
 def example_1_basic_usage():
     """Example 1: Basic job-candidate matching."""
@@ -194,12 +195,22 @@ def example_4_integration_with_resume_parser():
             print("Make sure to run the resume parser first to generate parsed resumes")
             return []
         
-        # Look for combined.json or individual resume files
+        # Look for the JSONL corpus, combined.json or individual resume files
         resumes = []
         
-        # Try combined.json first
+        # The parser writes a JSONL corpus (corpus.jsonl + offset index) by default
+        corpus_file = parser_dir / "corpus.jsonl"
+        if corpus_file.exists():
+            try:
+                with JsonlCorpus(corpus_file) as corpus:
+                    resumes = list(corpus.records())
+                print(f"Loaded {len(resumes)} resumes from corpus.jsonl")
+            except Exception as e:
+                print(f"Error loading corpus.jsonl: {e}")
+        
+        # Then combined.json
         combined_file = parser_dir / "combined.json"
-        if combined_file.exists():
+        if not resumes and combined_file.exists():
             try:
                 with open(combined_file, 'r') as f:
                     data = json.load(f)
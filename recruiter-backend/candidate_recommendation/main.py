@@ -32,6 +32,12 @@ class CandidateRecommendationProcessor:
                 device=config.device,
                 blend_alpha=config.blend_alpha,
                 title_weight=config.title_weight,
+                encoder_backend=config.encoder_backend,
+                onnx_dir=config.onnx_model_dir,
+                onnx_quantize=config.onnx_quantize,
+                lexical_shortlist=config.lexical_shortlist if config.lexical_prefilter else 0,
+                corpus_cache_mb=config.corpus_cache_mb,
+                corpus_recheck_seconds=config.corpus_recheck_seconds,
             )
             logger.info("✅ Semantic matcher initialized successfully")
         except Exception as e:
@@ -50,6 +50,16 @@ class RecommendationResponse(BaseModel):
     candidates: List[CandidateMatch]
     total_candidates_searched: int
     search_metadata: Dict[str, Any] = Field(default_factory=dict)
+    result_set_id: Optional[str] = Field(None, description="Server-side ranking to page through with /results/{id}")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if more candidates were ranked")
+
+class ResultPageResponse(BaseModel):
+    result_set_id: str
+    job_id: str
+    candidates: List[CandidateMatch]
+    offset: int = Field(..., description="Rank offset of the first candidate in this page")
+    total_results: int = Field(..., description="Candidates ranked in the result set")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, or null after the last page")
 
 class SearchFilters(BaseModel):
     min_experience: Optional[int] = Field(None, ge=0)
@@ -64,4 +74,15 @@ class AdvancedRecommendationRequest(BaseModel):
     top_n: int = Field(default=10, ge=1, le=50)
     include_summary: bool = Field(default=True)
     boost_skills: List[str] = Field(default_factory=list, description="Skills to boost in scoring")
-    penalty_skills: List[str] = Field(default_factory=list, description="Skills that reduce score")
\ No newline at end of file
+    penalty_skills: List[str] = Field(default_factory=list, description="Skills that reduce score")
+
+class BatchRecommendationRequest(BaseModel):
+    jobs: List[JobDescription] = Field(..., min_length=1, max_length=500, description="Jobs to match in one pass")
+    top_n: int = Field(default=10, ge=1, le=50, description="Number of top candidates to return per job")
+    include_summary: bool = Field(default=True, description="Include detailed summaries")
+
+class BatchRecommendationResponse(BaseModel):
+    results: List[RecommendationResponse]
+    total_jobs: int
+    total_candidates_searched: int
+    search_metadata: Dict[str, Any] = Field(default_factory=dict)
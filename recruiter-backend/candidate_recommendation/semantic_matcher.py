@@ -4,7 +4,18 @@ from pathlib import Path
 from typing import List, Dict, Any, Tuple, Optional
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
+try:
+    from .services.corpus_registry import CorpusRecord, CorpusRegistry
+    from .services.embedding_executor import EmbeddingExecutor
+    from .services.model_registry import get_model_registry
+    from .services.resume_corpus import JsonlCorpus, is_corpus_file
+    from .services.scoring import rank_candidates
+except ImportError:  # imported as a standalone module
+    from services.corpus_registry import CorpusRecord, CorpusRegistry
+    from services.embedding_executor import EmbeddingExecutor
+    from services.model_registry import get_model_registry
+    from services.resume_corpus import JsonlCorpus, is_corpus_file
+    from services.scoring import rank_candidates
 
 from dataclasses import dataclass
 from typing import List
@@ -80,31 +91,28 @@ def _skills_from_jd(job: JobDescription) -> List[str]:
     toks = [t for t in _tokenize(text) if t not in _STOP and not t.isdigit()]
     return sorted(set(toks))
 
-def _jaccard(a: List[str], b: List[str]) -> float:
-    A, B = set(a), set(b)
-    if not A and not B:
-        return 0.0
-    return len(A & B) / max(1, len(A | B))
-
-def _title_align(jd_title: str, cand_title: str) -> float:
-    if not jd_title or not cand_title:
-        return 0.0
-    a = set(_tokenize(jd_title))
-    b = set(_tokenize(cand_title))
-    if not a or not b:
-        return 0.0
-    return len(a & b) / max(3, len(a))
-
 # -------------------------
 # File loading
 # -------------------------
 def _load_resume_jsons(parsed_path: Path) -> List[Dict[str, Any]]:
     """
-    Accepts a directory of per-resume JSONs (e.g., llm_parsed_resumes/*.json)
-    or a single combined.json. Skips *.error.json.
+    Accepts a directory of per-resume JSONs (e.g., llm_parsed_resumes/*.json),
+    a single combined.json, or a JSONL corpus (a corpus.jsonl file, or a
+    directory containing one). Skips *.error.json.
     """
     out: List[Dict[str, Any]] = []
 
+    if parsed_path.is_dir():
+        corpora = sorted(parsed_path.glob("*.jsonl"))
+        if corpora:
+            for corpus_path in corpora:
+                out.extend(_load_resume_jsons(corpus_path))
+            return out
+
+    if is_corpus_file(parsed_path):
+        with JsonlCorpus(parsed_path) as corpus:
+            return list(corpus.records())
+
     if parsed_path.is_file():
         data = json.loads(parsed_path.read_text(encoding="utf-8"))
         if isinstance(data, dict) and "results" in data:
@@ -153,6 +161,20 @@ def _candidate_summary_text(res: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
 
     return summary, data
 
+def _corpus_record(res: Dict[str, Any]) -> Optional[CorpusRecord]:
+    """Text, skills and title tokens of one parsed resume, as cached by the corpus registry."""
+    text, data = _candidate_summary_text(res)
+    if not text:
+        return None
+    src = res.get("source_pdf") or res.get("filename") or ""
+    return CorpusRecord(
+        text=text,
+        data=data,
+        filename=Path(src).name if src else "",
+        skills=_skills_from_resume_data(data),
+        title_tokens=_tokenize(data.get("title") or ""),
+    )
+
 # -------------------------
 # SemanticMatcher
 # -------------------------
@@ -166,11 +188,39 @@ class SemanticMatcher:
         device: Optional[str] = None,
         blend_alpha: float = 0.25,     # weight for skills Jaccard vs embedding similarity
         title_weight: float = 0.10,    # small extra weight for title alignment
+        max_batch_size: int = 64,      # texts merged from concurrent calls into one encode
+        max_wait_ms: float = 5.0,      # how long a micro-batch waits to fill
+        encoder_backend: str = "torch",  # 'torch' or 'onnx' (int8-quantized ONNX Runtime)
+        onnx_dir: str = "./onnx_models",
+        onnx_quantize: bool = True,
+        lexical_shortlist: int = 0,    # >0: only the top BM25 candidates are embedded and scored
+        corpus_cache_mb: float = 512,  # memory budget for cached resume directories (LRU-evicted)
+        corpus_recheck_seconds: float = 2.0,  # how often a cached directory is re-scanned for changes
     ):
         self.model_name = sbert_model
-        self.model = SentenceTransformer(self.model_name, device=device or None)
+        # Shared with every other matcher in the process using the same model and device
+        self.model = get_model_registry().get(
+            self.model_name,
+            backend=encoder_backend,
+            device=device,
+            onnx_dir=onnx_dir,
+            quantize=onnx_quantize,
+        )
         self.blend_alpha = float(blend_alpha)
         self.title_weight = float(title_weight)
+        self.lexical_shortlist = int(lexical_shortlist)
+        # Encodes run on the executor's worker thread; concurrent callers share batches
+        self.encoder = EmbeddingExecutor(
+            lambda texts: self.model.encode(texts, batch_size=64, show_progress_bar=False),
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+        )
+        # Parsed resumes, features and embeddings per directory; only changed files are re-read
+        self.corpora = CorpusRegistry(
+            _corpus_record,
+            max_bytes=int(corpus_cache_mb * 2**20),
+            recheck_seconds=corpus_recheck_seconds,
+        )
 
     def match_candidates(
         self,
@@ -182,9 +232,9 @@ class SemanticMatcher:
         Rank candidates from a directory (or combined.json) against the job.
         Returns a list[CandidateMatch] sorted by score desc.
         """
-        root = Path(parsed_resumes_dir)
-        items = _load_resume_jsons(root)
-        if not items:
+        corpus = self.corpora.get(parsed_resumes_dir)
+        view = corpus.view()
+        if not len(view):
             return []
 
         # Build JD text + skills
@@ -197,53 +247,53 @@ class SemanticMatcher:
         ]).strip()
         jd_skills = _skills_from_jd(job)
 
-        # Candidate texts and metadata
-        cand_texts: List[str] = []
-        metas: List[Dict[str, Any]] = []
-        filenames: List[str] = []
-        for res in items:
-            text, data = _candidate_summary_text(res)
-            if not text:
-                continue
-            cand_texts.append(text)
-            metas.append(data)
-            src = res.get("source_pdf") or res.get("filename") or ""
-            filenames.append(Path(src).name if src else "")
-
-        if not cand_texts:
-            return []
+        # Optional BM25 first stage: only the lexical shortlist is embedded and blended
+        rows = np.arange(len(view))
+        if 0 < self.lexical_shortlist < len(view):
+            keep = corpus.shortlist(view, jd_text, self.lexical_shortlist, _tokenize, _STOP)
+            if len(keep) >= top_n:
+                rows = np.asarray(sorted(keep), dtype=np.int64)
 
-        # Embeddings
-        jd_emb = self.model.encode([jd_text], show_progress_bar=False)
-        cand_embs = self.model.encode(cand_texts, batch_size=64, show_progress_bar=False)
+        # Embeddings: the JD plus candidates not embedded by an earlier call, in one executor request
+        missing = view.missing(rows)
+        embs = self.encoder.encode_sync([jd_text] + [view.texts[i] for i in missing])
+        jd_emb = embs[:1]
+        if missing:
+            view.store(missing, embs[1:])
+        cand_embs = view.take_embeddings(rows)
 
         # Cosine similarity
         sims = _cosine(cand_embs, jd_emb)[:, 0]  # shape (N,)
 
-        # Skills Jaccard + Title alignment
-        skill_sims = np.zeros(len(metas), dtype=float)
-        title_sims = np.zeros(len(metas), dtype=float)
-        for i, meta in enumerate(metas):
-            rskills = _skills_from_resume_data(meta)
-            skill_sims[i] = _jaccard(jd_skills, rskills)
-            title_sims[i] = _title_align(job.title, meta.get("title", ""))
+        # Skills Jaccard + Title alignment features (precomputed per candidate by the corpus)
+        jd_skill_set = set(jd_skills)
+        jd_title_set = set(_tokenize(job.title)) if job.title else set()
+        skill_matrix = view.skill_matrix
+        skill_overlap = skill_matrix.overlap(jd_skill_set)[rows]
+        skill_counts = skill_matrix.counts()[rows]
+        title_overlap = view.title_matrix.overlap(jd_title_set)[rows]
 
-        # Final blended score
-        final = (1.0 - self.blend_alpha) * sims + self.blend_alpha * skill_sims + self.title_weight * title_sims
+        # Final blended score + top N
+        top_idx, top_scores = rank_candidates(
+            sims, skill_overlap, skill_counts, len(jd_skill_set),
+            title_overlap, len(jd_title_set), self.blend_alpha, self.title_weight, top_n,
+        )
 
         # Package results
-        ordered_idx = np.argsort(-final)
+        records = view.records
         results: List[CandidateMatch] = []
-        for idx in ordered_idx[:top_n]:
-            meta = metas[idx]
+        for idx, score in zip(top_idx, top_scores):
+            row = int(rows[idx])
+            record = records[row]
+            meta = record.data
             results.append(
                 CandidateMatch(
                     name=meta.get("name", ""),
-                    filename=filenames[idx],
+                    filename=record.filename,
                     title=meta.get("title", ""),
-                    match_score=float(final[idx]),
-                    skills_match=sorted(set(_skills_from_resume_data(meta)))[:25],
-                    summary=meta.get("summary", cand_texts[idx]),
+                    match_score=float(score),
+                    skills_match=sorted(skill_matrix.skills(row))[:25],
+                    summary=meta.get("summary", record.text),
                 )
             )
         return results
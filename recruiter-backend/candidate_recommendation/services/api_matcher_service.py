@@ -1,16 +1,34 @@
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Sequence, Tuple, Union
 from sqlalchemy.orm import Session
 import logging
 import asyncio
+import os
+import threading
+import time
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
 from ..models.recommendation import (
     JobDescription, CandidateMatch, RecommendationRequest, 
-    RecommendationResponse, AdvancedRecommendationRequest, SearchFilters
+    RecommendationResponse, AdvancedRecommendationRequest, SearchFilters,
+    BatchRecommendationRequest, BatchRecommendationResponse, ResultPageResponse
 )
-from ..database.models import JobDB, CandidateDB, RecommendationHistoryDB
+from ..config import config
+from ..semantic_matcher import _STOP, _tokenize
 from .candidate_client import get_candidate_client, CandidateProfile
+from .candidate_filters import CandidateAttributes
+from .candidate_sync import get_candidate_sync
+from .embedding_executor import EmbeddingExecutor
+from .embedding_store import EmbeddingStore
+from .history_writer import HistoryRecord, get_history_writer
+from .encoders import encoder_id
+from .jd_cache import JobEmbeddingCache, JobEncoding
+from .lexical_index import BM25Index
+from .model_registry import get_model_registry
+from .result_cache import HIT, MISS, SearchResultCache, content_hash
+from .result_sets import ResultSet, ResultSetStore, decode_cursor
+from .scoring import blend_scores, rank_candidates, top_k
+from .skill_vocab import SkillMatrix, SkillVocabulary, flatten_skills, normalize_skill
+from .vector_index import VectorIndex, create_index, load_index
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -22,55 +40,456 @@ class APICandidateMatcherService:
     """
     
     def __init__(self, sbert_model: str = "sentence-transformers/all-mpnet-base-v2"):
-        self.model = SentenceTransformer(sbert_model)
+        # The encoder is loaded by `warm_up` (started from the app lifespan) or on first use,
+        # so constructing the service is cheap and cannot fail on model download/load errors
+        self.model = None
+        self._model_lock = threading.Lock()
+        self.model_load_seconds: Optional[float] = None
+        self.model_error: Optional[str] = None
+        self._warmup_task: Optional[asyncio.Task] = None
         self.model_name = sbert_model
+        # Embedding space identifier used to key caches and the index
+        self.encoder_id = encoder_id(sbert_model, config.encoder_backend, config.onnx_quantize)
+        self.encoder = EmbeddingExecutor(
+            lambda texts: self._get_model().encode(texts, batch_size=32, show_progress_bar=False),
+            max_batch_size=config.embed_max_batch_size,
+            max_wait_ms=config.embed_max_wait_ms
+        )
         self.candidate_client = get_candidate_client()
+        self.embedding_store = EmbeddingStore(config.embedding_store_path, config.embedding_memory_size)
+        self.index = self._load_index()
+        self._index_lock = threading.Lock()
+        self.indexed_pool_version: Optional[int] = None  # replica pool version last embedded into the index
+        self.skill_matrix = SkillMatrix()
+        self.title_matrix = SkillMatrix(SkillVocabulary())
+        self.candidate_attributes = CandidateAttributes()
+        # BM25 first stage over the same text that is embedded (CANDIDATE_LEXICAL_PREFILTER)
+        self.lexical_index = BM25Index(_tokenize, _STOP)
+        self.jd_cache = JobEmbeddingCache(config.jd_cache_size)
+        self.result_cache = SearchResultCache(config.result_cache_size)
+        # Ranked id lists behind result-set ids, for cursor pagination
+        self.result_sets = ResultSetStore(config.result_set_ttl_seconds, config.result_set_cache_size)
+        self.history_writer = get_history_writer()
+        self.candidate_sync = get_candidate_sync()
+        self.candidate_sync.add_listener(self.refresh_index)
         self.blend_alpha = 0.25  # Weight for skills vs semantic similarity
         self.title_weight = 0.10  # Weight for title alignment
 
+    def _get_model(self):
+        """The sentence encoder from the shared model registry, fetched (and loaded if needed) on first use."""
+        if self.model is None:
+            with self._model_lock:
+                if self.model is None:
+                    try:
+                        model = get_model_registry().get(
+                            self.model_name,
+                            backend=config.encoder_backend,
+                            device=config.device,
+                            onnx_dir=config.onnx_model_dir,
+                            quantize=config.onnx_quantize,
+                            num_threads=config.onnx_threads
+                        )
+                    except Exception as e:
+                        self.model_error = str(e)
+                        raise
+                    self.model_load_seconds = model.load_seconds
+                    self.model_error = None
+                    self.model = model
+        return self.model
+
+    def start_warmup(self) -> None:
+        """Start loading the encoder in the background (called from the app lifespan)."""
+        if self._warmup_task is None or self._warmup_task.done():
+            self._warmup_task = asyncio.create_task(self.warm_up())
+
+    async def stop_warmup(self) -> None:
+        if self._warmup_task is not None:
+            self._warmup_task.cancel()
+            try:
+                await self._warmup_task
+            except asyncio.CancelledError:
+                pass
+            self._warmup_task = None
+
+    async def warm_up(self) -> None:
+        """Load the encoder off the event loop and run one encode, so the first search pays for neither."""
+        try:
+            await asyncio.to_thread(self._get_model)
+            await self.encoder.encode(["warm-up"])
+            if config.preload_models:
+                await asyncio.to_thread(
+                    get_model_registry().preload,
+                    config.preload_models,
+                    backend=config.encoder_backend,
+                    device=config.device,
+                    onnx_dir=config.onnx_model_dir,
+                    quantize=config.onnx_quantize,
+                    num_threads=config.onnx_threads
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Encoder warm-up failed: {e}")
+
+    def readiness(self) -> Dict[str, Any]:
+        """
+        Whether this worker should receive search traffic: the encoder is
+        loaded and, when the local replica is enabled, the replica has data
+        and its current pool version has been embedded into the index.
+        """
+        sync_ready = not config.sync_enabled or self.candidate_sync.ready
+        index_ready = not config.sync_enabled or (
+            sync_ready and self.indexed_pool_version == self.candidate_sync.pool_version
+        )
+        model_ready = self.model is not None
+        return {
+            "ready": model_ready and sync_ready and index_ready,
+            "model": {
+                "ready": model_ready,
+                "name": self.model_name,
+                "backend": config.encoder_backend,
+                "warming_up": self._warmup_task is not None and not self._warmup_task.done(),
+                "load_seconds": self.model_load_seconds,
+                "error": self.model_error
+            },
+            "index": {
+                "ready": index_ready,
+                "backend": self.index.backend,
+                "storage": self.index.storage,
+                "size": len(self.index),
+                "indexed_pool_version": self.indexed_pool_version
+            },
+            "candidate_sync": {
+                "ready": sync_ready,
+                "enabled": config.sync_enabled,
+                "candidates": len(self.candidate_sync.candidates()) if config.sync_enabled else None,
+                "pool_version": self.candidate_sync.pool_version
+            }
+        }
+
     async def find_candidates(
         self, 
-        request: RecommendationRequest, 
+        request: Union[RecommendationRequest, AdvancedRecommendationRequest], 
         db: Session
     ) -> RecommendationResponse:
-        """Find candidates by fetching from candidate backend API and performing semantic matching."""
+        """
+        Find candidates by fetching from candidate backend API and performing semantic matching.
+        
+        Identical searches against the same candidate pool are answered from the
+        result cache, and concurrent identical searches share one computation.
+        The response carries a result-set id and cursor for the next page
+        (see `get_result_page`).
+        """
+        
+        # Steps 1-2: Load candidates and match (cached per job content, params and corpus version)
+        corpus_version = self._corpus_version()
+        cache_key = self._search_cache_key(request, corpus_version)
+        self._drop_expired_result(cache_key)
+        response, outcome = await self.result_cache.get_or_compute(
+            cache_key,
+            lambda: self._search(request, corpus_version),
+            cacheable=corpus_version is not None
+        )
+        response = response.copy(update={
+            "job_id": request.job.id,
+            "search_metadata": {**response.search_metadata, "result_cache": outcome}
+        })
+        
+        if "error" in response.search_metadata:
+            return response
+        
+        # Step 3: Queue the job and search history for the background writer
+        await self._record_search(request, response.candidates)
+        
+        return response
+
+    async def _search(
+        self,
+        request: Union[RecommendationRequest, AdvancedRecommendationRequest],
+        corpus_version: Optional[str]
+    ) -> RecommendationResponse:
+        """
+        Load the candidate pool and run semantic matching (with filters, for
+        advanced requests) for one request. Candidates are ranked beyond
+        `top_n` and the ranking is kept as a result set for later pages.
+        """
         
-        # Step 1: Fetch all candidates from candidate backend
-        logger.info("Fetching candidates from candidate backend API...")
-        candidates = await self.candidate_client.get_all_candidates()
-        logger.info(f"Retrieved {len(candidates)} candidates from API")
+        # Load the candidate pool (local replica, or live from the candidate backend)
+        candidates, data_source = await self._load_candidates()
+        logger.info(f"Retrieved {len(candidates)} candidates from {data_source}")
         
         if not candidates:
-            logger.warning("No candidates found from API")
+            logger.warning(f"No candidates found from {data_source}")
             return RecommendationResponse(
                 job_id=request.job.id,
                 candidates=[],
                 total_candidates_searched=0,
-                search_metadata={"error": "No candidates available from API"}
+                search_metadata={"error": "No candidates available", "data_source": data_source}
             )
         
-        # Step 2: Perform semantic matching
-        matches = await self._perform_semantic_matching(
-            job=request.job,
-            candidates=candidates,
-            top_n=request.top_n,
-            include_summary=request.include_summary
+        # Perform semantic matching
+        advanced = isinstance(request, AdvancedRecommendationRequest)
+        candidate_by_id, ranked_ids, scores, cache_stats = await self._rank(
+            request.job,
+            candidates,
+            self._ranking_depth(request.top_n),
+            filters=request.filters if advanced else None,
+            boost_skills=request.boost_skills if advanced else (),
+            penalty_skills=request.penalty_skills if advanced else ()
         )
+        matches = [
+            self._build_match(candidate_by_id[cid], score, request.include_summary)
+            for cid, score in zip(ranked_ids[:request.top_n], scores[:request.top_n])
+        ]
         
-        # Step 3: Save job to database if not exists
-        await self._save_job_to_db(request.job, db)
-        
-        # Step 4: Log search history
-        await self._log_search_history(request, matches, db)
+        response = self._build_response(request, matches, len(candidates), data_source, cache_stats)
+        result_set = self._store_result_set(request, corpus_version, candidate_by_id, ranked_ids, scores)
+        if result_set is not None:
+            response.result_set_id = result_set.id
+            response.next_cursor = result_set.next_cursor(len(matches))
+        return response
+
+    def _build_response(
+        self,
+        request: Union[RecommendationRequest, AdvancedRecommendationRequest],
+        matches: List[CandidateMatch],
+        pool_size: int,
+        data_source: str,
+        cache_stats: Dict[str, int]
+    ) -> RecommendationResponse:
+        """Response for a completed search, as stored in the result cache."""
+        search_metadata = {
+            "model_used": self.model_name,
+            "data_source": data_source,
+            "api_candidates_count": pool_size,
+            "embedding_cache": cache_stats
+        }
+        if isinstance(request, AdvancedRecommendationRequest):
+            search_metadata.update({
+                "filters_applied": request.filters.dict(),
+                "boost_skills": request.boost_skills,
+                "penalty_skills": request.penalty_skills,
+                "filtered_count": len(matches)
+            })
         
         return RecommendationResponse(
             job_id=request.job.id,
             candidates=matches,
+            total_candidates_searched=pool_size,
+            search_metadata=search_metadata
+        )
+
+    async def stream_candidates(
+        self,
+        request: RecommendationRequest,
+        db: Session
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Streaming variant of `find_candidates`, as (event, payload) pairs:
+        
+        - "metadata": as soon as the candidate pool is known, before scoring
+        - "candidate": one per match in rank order (without the summary),
+          as soon as the top N is selected
+        - "summary": one per match, when summaries were requested
+        - "done": result count, result cache outcome, elapsed time and the
+          result-set id and cursor for the next page
+        
+        The assembled response goes into the result cache, so streamed and
+        regular searches for the same job share cached results.
+        """
+        started = time.perf_counter()
+        corpus_version = self._corpus_version()
+        cache_key = self._search_cache_key(request, corpus_version)
+        self._drop_expired_result(cache_key)
+        cached = self.result_cache.get(cache_key) if corpus_version is not None else None
+        header = {"job_id": request.job.id, "model_used": self.model_name, "top_n": request.top_n}
+        
+        if cached is not None:
+            outcome = HIT
+            matches = cached.candidates
+            result_set_id, next_cursor = cached.result_set_id, cached.next_cursor
+            yield "metadata", {
+                **header,
+                "data_source": cached.search_metadata.get("data_source"),
+                "total_candidates_searched": cached.total_candidates_searched,
+                "result_cache": outcome
+            }
+            for rank, match in enumerate(matches, 1):
+                yield "candidate", {"rank": rank, **match.dict(exclude={"summary"})}
+        else:
+            outcome = MISS
+            candidates, data_source = await self._load_candidates()
+            yield "metadata", {
+                **header,
+                "data_source": data_source,
+                "total_candidates_searched": len(candidates),
+                "result_cache": outcome
+            }
+            if not candidates:
+                yield "done", {"count": 0, "error": "No candidates available", "result_cache": outcome}
+                return
+            
+            candidate_by_id, ranked_ids, scores, cache_stats = await self._rank(
+                request.job, candidates, self._ranking_depth(request.top_n)
+            )
+            matches = []
+            for rank, (cid, score) in enumerate(zip(ranked_ids[:request.top_n], scores[:request.top_n]), 1):
+                match = self._build_match(candidate_by_id[cid], score, request.include_summary)
+                matches.append(match)
+                yield "candidate", {"rank": rank, **match.dict(exclude={"summary"})}
+            
+            result_set = self._store_result_set(request, corpus_version, candidate_by_id, ranked_ids, scores)
+            result_set_id = result_set.id if result_set is not None else None
+            next_cursor = result_set.next_cursor(len(matches)) if result_set is not None else None
+            if corpus_version is not None:
+                response = self._build_response(request, matches, len(candidates), data_source, cache_stats)
+                response.result_set_id, response.next_cursor = result_set_id, next_cursor
+                self.result_cache.put(cache_key, response)
+        
+        if request.include_summary:
+            for match in matches:
+                yield "summary", {"candidate_id": match.candidate_id, "summary": match.summary}
+        
+        yield "done", {
+            "count": len(matches),
+            "result_cache": outcome,
+            "result_set_id": result_set_id,
+            "next_cursor": next_cursor,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+        
+        # Persist after the client has the full result
+        await self._record_search(request, matches)
+
+    def get_result_page(
+        self,
+        result_set_id: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Optional[ResultPageResponse]:
+        """
+        One page of a stored result set, starting at `cursor` (the first page
+        when omitted), without re-scoring. Returns None when the result set
+        is unknown, expired, or was ranked against an older candidate pool;
+        raises ValueError for a malformed cursor.
+        """
+        result_set = self.result_sets.get(result_set_id)
+        if result_set is None:
+            return None
+        corpus_version = self._corpus_version()
+        if result_set.corpus_version is not None and result_set.corpus_version != corpus_version:
+            # The pool changed since ranking; pages would no longer be consistent
+            self.result_sets.discard(result_set_id)
+            return None
+        
+        offset = decode_cursor(cursor) if cursor else 0
+        end = offset + (limit or result_set.page_size)
+        matches = [
+            self._build_match(result_set.candidates[cid], score, result_set.include_summary)
+            for cid, score in zip(result_set.ranked_ids[offset:end], result_set.scores[offset:end])
+        ]
+        return ResultPageResponse(
+            result_set_id=result_set.id,
+            job_id=result_set.job_id,
+            candidates=matches,
+            offset=offset,
+            total_results=len(result_set),
+            next_cursor=result_set.next_cursor(end)
+        )
+
+    def _ranking_depth(self, top_n: int) -> int:
+        """How many candidates a search ranks: the requested page plus what later pages can serve."""
+        if config.result_set_depth <= 0 or not self.result_sets.maxsize:
+            return top_n
+        return max(top_n, config.result_set_depth)
+
+    def _store_result_set(
+        self,
+        request: Union[RecommendationRequest, AdvancedRecommendationRequest],
+        corpus_version: Optional[str],
+        candidate_by_id: Dict[str, CandidateProfile],
+        ranked_ids: List[str],
+        scores: np.ndarray
+    ) -> Optional[ResultSet]:
+        """Keep a search's full ranking for cursor pagination (None when result sets are disabled)."""
+        if config.result_set_depth <= 0 or not self.result_sets.maxsize:
+            return None
+        return self.result_sets.put(ResultSet(
+            id=self.result_sets.new_id(),
+            job_id=request.job.id,
+            corpus_version=corpus_version,
+            ranked_ids=list(ranked_ids),
+            scores=np.asarray(scores, dtype=np.float32),
+            candidates={cid: candidate_by_id[cid] for cid in ranked_ids},
+            page_size=request.top_n,
+            include_summary=request.include_summary
+        ))
+
+    def _drop_expired_result(self, cache_key: tuple) -> None:
+        """Evict a cached response whose result set has expired, so the search reruns and pages stay servable."""
+        cached = self.result_cache.get(cache_key)
+        if cached is not None and cached.result_set_id and self.result_sets.get(cached.result_set_id) is None:
+            self.result_cache.discard(cache_key)
+
+    def _corpus_version(self) -> Optional[str]:
+        """Version of the candidate pool searches will read, or None when it is fetched live."""
+        if config.sync_enabled and self.candidate_sync.ready:
+            return f"replica:{self.candidate_sync.pool_version}"
+        return None
+
+    def _search_cache_key(
+        self,
+        request: Union[RecommendationRequest, AdvancedRecommendationRequest],
+        corpus_version: Optional[str]
+    ) -> tuple:
+        """Result cache key: (job content hash, scoring parameters and filters, corpus version)."""
+        job_hash = content_hash(JobEmbeddingCache.normalize(self._build_job_text(request.job)))
+        params = (
+            self.encoder_id, self.blend_alpha, self.title_weight,
+            config.index_backend, config.index_shortlist,
+            config.lexical_prefilter, config.lexical_shortlist,
+            request.top_n, request.include_summary
+        )
+        if isinstance(request, AdvancedRecommendationRequest):
+            params += (content_hash(request.filters.dict(), request.boost_skills, request.penalty_skills),)
+        return (job_hash, params, corpus_version)
+
+    async def find_candidates_batch(
+        self,
+        request: BatchRecommendationRequest,
+        db: Session
+    ) -> BatchRecommendationResponse:
+        """Match many jobs against the candidate pool in one pass (see `match_many`)."""
+        
+        candidates, data_source = await self._load_candidates()
+        logger.info(f"Batch matching {len(request.jobs)} jobs against {len(candidates)} candidates from {data_source}")
+        
+        per_job, cache_stats = await self.match_many(
+            request.jobs, candidates, request.top_n, request.include_summary
+        )
+        
+        results = []
+        for job, matches in zip(request.jobs, per_job):
+            await self._record_search(
+                RecommendationRequest(job=job, top_n=request.top_n, include_summary=request.include_summary),
+                matches
+            )
+            results.append(RecommendationResponse(
+                job_id=job.id,
+                candidates=matches,
+                total_candidates_searched=len(candidates),
+                search_metadata={"model_used": self.model_name, "data_source": data_source}
+            ))
+        
+        return BatchRecommendationResponse(
+            results=results,
+            total_jobs=len(results),
             total_candidates_searched=len(candidates),
             search_metadata={
                 "model_used": self.model_name,
-                "data_source": "candidate_backend_api",
-                "api_candidates_count": len(candidates)
+                "data_source": data_source,
+                "api_candidates_count": len(candidates),
+                "embedding_cache": cache_stats
             }
         )
 
@@ -79,118 +498,381 @@ class APICandidateMatcherService:
         request: AdvancedRecommendationRequest, 
         db: Session
     ) -> RecommendationResponse:
-        """Advanced candidate search with filters and skill adjustments."""
-        
-        # Get more candidates initially to allow for filtering
-        basic_request = RecommendationRequest(
-            job=request.job,
-            top_n=min(request.top_n * 3, 100),  # Get more to filter
-            include_summary=request.include_summary
-        )
-        
-        basic_response = await self.find_candidates(basic_request, db)
-        
-        # Apply advanced filters
-        filtered_candidates = self._apply_advanced_filters(
-            basic_response.candidates,
-            request.filters,
-            request.boost_skills,
-            request.penalty_skills
-        )
-        
-        # Limit to requested number
-        filtered_candidates = filtered_candidates[:request.top_n]
+        """
+        Advanced candidate search with filters and skill adjustments.
+        Filters are pushed down into ranking (see `_rank`),
+        so the top N is exact however selective they are.
+        """
+        return await self.find_candidates(request, db)
+
+    async def _load_candidates(self) -> Tuple[List[CandidateProfile], str]:
+        """Candidate pool for a search: the synced local replica when ready, otherwise the live API."""
+        if config.sync_enabled and self.candidate_sync.ready:
+            return self.candidate_sync.candidates(), "local_replica"
         
-        return RecommendationResponse(
-            job_id=request.job.id,
-            candidates=filtered_candidates,
-            total_candidates_searched=basic_response.total_candidates_searched,
-            search_metadata={
-                **basic_response.search_metadata,
-                "filters_applied": request.filters.dict(),
-                "boost_skills": request.boost_skills,
-                "penalty_skills": request.penalty_skills,
-                "filtered_count": len(filtered_candidates)
-            }
+        logger.info("Fetching candidates from candidate backend API...")
+        return await self.candidate_client.get_all_candidates(), "candidate_backend_api"
+
+    def refresh_index(self, candidates: List[CandidateProfile]) -> None:
+        """Pre-embed and index a candidate pool (called by the sync task after changes)."""
+        pool_version = self.candidate_sync.pool_version
+        candidate_texts = {c.user_id: self._build_candidate_text(c) for c in candidates}
+        with self._index_lock:
+            stats = self._sync_index(candidate_texts)
+            if config.lexical_prefilter:
+                self.lexical_index.sync(candidate_texts)
+        self.indexed_pool_version = pool_version
+        logger.info(f"Refreshed candidate index: {len(candidates)} candidates, {stats['misses']} newly embedded")
+
+    async def _rank(
+        self,
+        job: JobDescription,
+        candidates: List[CandidateProfile],
+        top_n: int,
+        filters: Optional[SearchFilters] = None,
+        boost_skills: Sequence[str] = (),
+        penalty_skills: Sequence[str] = ()
+    ) -> Tuple[Dict[str, CandidateProfile], List[str], np.ndarray, Dict[str, int]]:
+        """
+        Select the top N candidates for a job without building match objects.
+        Filters restrict the candidates that are scored and boost/penalty
+        skills adjust the blended scores, both before top-N selection.
+        Returns (candidates by id, ranked ids, their scores, embedding cache hit/miss counts).
+        """
+        
+        # Encode the job description (cached by model and JD text)
+        jd_encoding = await self._encode_job(job)
+        
+        # Sync the shared indexes with the pool and rank off the event loop
+        return await asyncio.to_thread(
+            self._rank_pool, job, jd_encoding, candidates, top_n, filters, boost_skills, penalty_skills
         )
 
-    async def _perform_semantic_matching(
+    def _rank_pool(
         self,
         job: JobDescription,
+        jd_encoding: JobEncoding,
         candidates: List[CandidateProfile],
         top_n: int,
-        include_summary: bool
-    ) -> List[CandidateMatch]:
-        """Perform semantic matching between job and candidates."""
-        
-        # Build job description text
-        jd_text = self._build_job_text(job)
-        jd_skills = self._extract_job_skills(job)
-        
-        # Build candidate texts and extract metadata
-        candidate_texts = []
-        candidate_metadata = []
-        
-        for candidate in candidates:
-            text = self._build_candidate_text(candidate)
-            candidate_texts.append(text)
-            candidate_metadata.append(candidate)
-        
-        if not candidate_texts:
-            return []
-        
-        # Generate embeddings
-        logger.info(f"Generating embeddings for job and {len(candidate_texts)} candidates...")
-        jd_embedding = self.model.encode([jd_text], show_progress_bar=False)
-        candidate_embeddings = self.model.encode(candidate_texts, batch_size=32, show_progress_bar=False)
-        
-        # Calculate semantic similarity
-        semantic_scores = self._calculate_cosine_similarity(candidate_embeddings, jd_embedding)
-        
-        # Calculate skills similarity
-        skills_scores = []
-        title_scores = []
-        
-        for candidate in candidate_metadata:
-            candidate_skills = self._extract_candidate_skills(candidate)
-            skills_score = self._calculate_jaccard_similarity(jd_skills, candidate_skills)
-            skills_scores.append(skills_score)
+        filters: Optional[SearchFilters],
+        boost_skills: Sequence[str],
+        penalty_skills: Sequence[str]
+    ) -> Tuple[Dict[str, CandidateProfile], List[str], np.ndarray, Dict[str, int]]:
+        """
+        `_rank` once the JD is encoded. The vector index, BM25 index and
+        skill/title matrices are shared by every search, so they are synced
+        with this pool and read under one hold of `_index_lock`: a concurrent
+        search or index refresh with a different pool cannot change them in between.
+        """
+        with self._index_lock:
+            # Bring embeddings and skill/title rows in line with the pool
+            candidate_by_id, cache_stats = self._prepare_pool(candidates)
+            no_results = (candidate_by_id, [], np.zeros(0, dtype=np.float32), cache_stats)
+            if not candidate_by_id:
+                return no_results
+            
+            eligible_ids = self._eligible_ids(candidate_by_id, filters) if filters is not None else None
+            if eligible_ids is not None and not eligible_ids:
+                return no_results
+            shortlist_ids, semantic_scores = self._retrieve(job, jd_encoding.embedding, candidate_by_id, top_n, eligible_ids)
             
-            title_score = self._calculate_title_alignment(job.title, candidate.title or "")
-            title_scores.append(title_score)
-        
-        # Combine scores
-        final_scores = []
-        for i in range(len(candidates)):
-            combined_score = (
-                (1.0 - self.blend_alpha) * semantic_scores[i] + 
-                self.blend_alpha * skills_scores[i] +
-                self.title_weight * title_scores[i]
+            # Per-candidate features for the scoring kernel
+            jd_skill_set = set(jd_encoding.skills)
+            jd_title_words = set(self._title_tokens(job.title))
+            skill_rows = self.skill_matrix.rows(shortlist_ids)
+            title_rows = self.title_matrix.rows(shortlist_ids)
+            skill_overlap = self.skill_matrix.overlap(jd_skill_set)[skill_rows]
+            skill_counts = self.skill_matrix.counts()[skill_rows]
+            title_overlap = self.title_matrix.overlap(jd_title_words)[title_rows]
+            
+            # Blend semantic, skills and title scores, apply skill boosts/penalties and select the top N
+            final_scores = blend_scores(
+                semantic_scores, skill_overlap, skill_counts, len(jd_skill_set),
+                title_overlap, len(jd_title_words), self.blend_alpha, self.title_weight
+            )
+            if boost_skills or penalty_skills:
+                final_scores = self._adjust_scores_with_skills(final_scores, skill_rows, boost_skills, penalty_skills)
+        top_indices = top_k(final_scores, top_n)
+        return candidate_by_id, [shortlist_ids[idx] for idx in top_indices], final_scores[top_indices], cache_stats
+
+    def _retrieve(
+        self,
+        job: JobDescription,
+        embedding: np.ndarray,
+        candidate_by_id: Dict[str, CandidateProfile],
+        top_n: int,
+        eligible_ids: Optional[List[str]] = None
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Candidates worth blending for a job and their semantic similarity.
+        
+        - BM25 prefilter (when enabled and the pool is larger than its shortlist),
+          restricted to eligible candidates, then dense scores for that shortlist
+        - with filters: exact scores for the eligible candidates, unless an ANN
+          index would search a smaller shortlist than they are
+        - otherwise every candidate (exact index) or the ANN shortlist; ANN hits
+          are filtered and fall back to the eligible set if fewer than top N remain
+        
+        Only candidates of this pool are returned, even when the shared
+        indexes also hold candidates another search's pool added.
+        Called with `_index_lock` held.
+        """
+        pool_ids = eligible_ids if eligible_ids is not None else list(candidate_by_id)
+        if config.lexical_prefilter and len(pool_ids) > config.lexical_shortlist:
+            within = pool_ids
+            if eligible_ids is None and len(self.lexical_index) == len(candidate_by_id):
+                within = None  # synced to exactly this pool: no mask needed
+            lexical_ids, _ = self.lexical_index.search(
+                self._build_job_text(job), config.lexical_shortlist, within=within
             )
-            final_scores.append(combined_score)
+            if len(lexical_ids) >= top_n:
+                return self.index.score_ids(embedding, lexical_ids)
+        
+        ann_shortlist = max(top_n, config.index_shortlist)
+        if eligible_ids is not None and (self.index.exact or len(eligible_ids) <= ann_shortlist):
+            return self.index.score_ids(embedding, eligible_ids)
+        
+        if self.index.exact:
+            # Exact index: unsorted scores for the whole pool; top-N selection happens after blending
+            ids, scores = self._score_pool(embedding, candidate_by_id)
+            return ids, scores[0]
+        
+        ids, scores = self.index.search(embedding, ann_shortlist)
+        allowed = candidate_by_id if eligible_ids is None else set(eligible_ids)
+        keep = [i for i, cid in enumerate(ids) if cid in allowed]
+        if len(keep) >= top_n:
+            return [ids[i] for i in keep], scores[keep]
+        return self.index.score_ids(embedding, pool_ids)
+
+    def _score_pool(self, queries: np.ndarray, candidate_by_id: Dict[str, CandidateProfile]) -> Tuple[List[str], np.ndarray]:
+        """
+        Exact similarities of `queries` with every candidate of the pool, as
+        (ids, (num_queries, pool size) matrix). Columns of index entries
+        outside the pool are dropped. Called with `_index_lock` held.
+        """
+        ids, scores = self.index.score_all(queries)
+        if len(ids) == len(candidate_by_id):
+            return ids, scores  # the pool is all indexed, so equal sizes mean equal sets
+        keep = [i for i, cid in enumerate(ids) if cid in candidate_by_id]
+        return [ids[i] for i in keep], scores[:, keep]
+
+    def _eligible_ids(self, candidate_by_id: Dict[str, CandidateProfile], filters: SearchFilters) -> Optional[List[str]]:
+        """
+        Ids of the candidates passing `filters`, from masks over precomputed
+        attribute arrays and the skill matrix; None when no filter is set.
+        """
+        if (filters.min_experience is None and filters.max_experience is None
+                and not filters.required_skills and not filters.location):
+            return None
+        
+        self.candidate_attributes.sync(
+            candidate_by_id,
+            extract=lambda c: (self._infer_experience_years(c), self._infer_location(c))
+        )
+        keys = self.candidate_attributes.keys
+        keep = self.candidate_attributes.mask(filters.min_experience, filters.max_experience, filters.location)
+        if filters.required_skills:
+            keep &= SkillMatrix.take(self.skill_matrix.contains_all(filters.required_skills), self.skill_matrix.rows(keys), False)
+        return [keys[i] for i in np.flatnonzero(keep)]
+
+    async def match_many(
+        self,
+        jobs: List[JobDescription],
+        candidates: List[CandidateProfile],
+        top_n: int,
+        include_summary: bool
+    ) -> Tuple[List[List[CandidateMatch]], Dict[str, int]]:
+        """
+        Rank the candidate pool for many jobs in one pass.
+        
+        All JDs are encoded in one batch, semantic similarity is a single
+        jobs x candidates matrix multiply (per chunk of jobs), and the skill and
+        title terms are computed for every job/candidate pair with the same
+        scoring kernel as a single search. Scoring is exact over the whole pool.
+        Returns one ranked match list per job and embedding cache hit/miss counts.
+        """
+        if not jobs:
+            return [], {"hits": 0, "misses": 0}
+        
+        encodings = await self._encode_jobs(jobs)
+        return await asyncio.to_thread(self._match_pool, jobs, encodings, candidates, top_n, include_summary)
+
+    def _match_pool(
+        self,
+        jobs: List[JobDescription],
+        encodings: List[JobEncoding],
+        candidates: List[CandidateProfile],
+        top_n: int,
+        include_summary: bool
+    ) -> Tuple[List[List[CandidateMatch]], Dict[str, int]]:
+        """`match_many` once the JDs are encoded; syncs and reads the shared indexes under `_index_lock` (see `_rank_pool`)."""
+        with self._index_lock:
+            candidate_by_id, cache_stats = self._prepare_pool(candidates)
+            if not candidate_by_id:
+                return [[] for _ in jobs], cache_stats
+            
+            results: List[List[CandidateMatch]] = []
+            for start in range(0, len(jobs), config.batch_job_chunk):
+                chunk_jobs = jobs[start:start + config.batch_job_chunk]
+                chunk_encodings = encodings[start:start + config.batch_job_chunk]
+                
+                # (jobs, candidates) semantic similarity from one GEMM
+                ids, semantic = self._score_pool(np.vstack([e.embedding for e in chunk_encodings]), candidate_by_id)
+                
+                # (jobs, candidates) skill and title overlaps; per-job set sizes as (jobs, 1)
+                jd_skill_sets = [set(e.skills) for e in chunk_encodings]
+                jd_title_sets = [set(self._title_tokens(job.title)) for job in chunk_jobs]
+                skill_rows = self.skill_matrix.rows(ids)
+                title_rows = self.title_matrix.rows(ids)
+                skill_overlap = self.skill_matrix.overlap_many(jd_skill_sets)[:, skill_rows]
+                skill_counts = self.skill_matrix.counts()[skill_rows]
+                title_overlap = self.title_matrix.overlap_many(jd_title_sets)[:, title_rows]
+                jd_skill_counts = np.array([[len(x)] for x in jd_skill_sets], dtype=np.float32)
+                jd_title_counts = np.array([[len(x)] for x in jd_title_sets], dtype=np.float32)
+                
+                top_indices, top_scores = rank_candidates(
+                    semantic, skill_overlap, skill_counts, jd_skill_counts,
+                    title_overlap, jd_title_counts, self.blend_alpha, self.title_weight, top_n
+                )
+                for job_indices, job_scores in zip(top_indices, top_scores):
+                    results.append([
+                        self._build_match(candidate_by_id[ids[idx]], score, include_summary)
+                        for idx, score in zip(job_indices, job_scores)
+                    ])
         
-        # Sort and create matches
-        sorted_indices = np.argsort(final_scores)[::-1]  # Descending order
+        return results, cache_stats
+
+    def _prepare_pool(self, candidates: List[CandidateProfile]) -> Tuple[Dict[str, CandidateProfile], Dict[str, int]]:
+        """
+        Sync the vector index, BM25 index, skill matrix and title matrix with the candidate pool.
+        Returns candidates keyed by id and embedding cache hit/miss counts.
+        Called with `_index_lock` held, from a worker thread (it may block on the embedding executor).
+        """
+        candidate_by_id = {candidate.user_id: candidate for candidate in candidates}
+        candidate_texts = {
+            candidate.user_id: self._build_candidate_text(candidate)
+            for candidate in candidates
+        }
         
-        matches = []
-        for idx in sorted_indices[:top_n]:
-            candidate = candidate_metadata[idx]
-            candidate_skills = self._extract_candidate_skills(candidate)
-            
-            match = CandidateMatch(
-                candidate_id=candidate.user_id,
-                name=candidate.display_name,
-                filename=f"api_user_{candidate.user_id}",
-                title=candidate.title,
-                match_score=float(final_scores[idx]),
-                skills_match=candidate_skills[:15],  # Top 15 skills
-                summary=candidate.summary if include_summary else None,
-                experience_years=self._infer_experience_years(candidate),
-                location=self._infer_location(candidate)
+        if not candidate_texts:
+            return {}, {"hits": 0, "misses": 0}
+        
+        # Only candidates whose text changed are re-embedded. While the local replica
+        # serves searches, `refresh_index` removes departed candidates: a search still
+        # holding an older pool must not drop candidates a newer one added.
+        logger.info(f"Generating embeddings for {len(candidate_texts)} candidates...")
+        cache_stats = self._sync_index(candidate_texts, prune=not (config.sync_enabled and self.candidate_sync.ready))
+        if config.lexical_prefilter:
+            self.lexical_index.sync(candidate_texts)
+        self.skill_matrix.sync({candidate.user_id: candidate.skills for candidate in candidates})
+        self.title_matrix.sync({candidate.user_id: candidate.title for candidate in candidates}, extract=self._title_tokens)
+        return candidate_by_id, cache_stats
+
+    def _build_match(self, candidate: CandidateProfile, score: float, include_summary: bool) -> CandidateMatch:
+        """Build the API match object for a ranked candidate."""
+        return CandidateMatch(
+            candidate_id=candidate.user_id,
+            name=candidate.display_name,
+            filename=f"api_user_{candidate.user_id}",
+            title=candidate.title,
+            match_score=min(max(float(score), 0.0), 1.0),  # cosine can dip below 0 deep in a ranking
+            skills_match=self._candidate_skills(candidate)[:15],  # Top 15 skills
+            summary=candidate.summary if include_summary else None,
+            experience_years=self._infer_experience_years(candidate),
+            location=self._infer_location(candidate)
+        )
+
+    async def _encode_job(self, job: JobDescription) -> JobEncoding:
+        """JD embedding and extracted skills, from the LRU cache when this JD text was seen before."""
+        return (await self._encode_jobs([job]))[0]
+
+    async def _encode_jobs(self, jobs: List[JobDescription]) -> List[JobEncoding]:
+        """
+        JD embeddings and extracted skills for several jobs. Cached JD texts are
+        served from the LRU cache; the rest are encoded together in one request
+        to the embedding executor (which may merge it with concurrent requests).
+        """
+        texts = [JobEmbeddingCache.normalize(self._build_job_text(job)) for job in jobs]
+        encodings: List[Optional[JobEncoding]] = [self.jd_cache.get(self.encoder_id, text) for text in texts]
+        
+        missing: Dict[str, List[int]] = {}
+        for i, encoding in enumerate(encodings):
+            if encoding is None:
+                missing.setdefault(texts[i], []).append(i)
+        
+        if missing:
+            embeddings = await self.encoder.encode(list(missing))
+            for embedding, (text, positions) in zip(embeddings, missing.items()):
+                encoding = JobEncoding(embedding=embedding, skills=self._extract_job_skills(jobs[positions[0]]))
+                self.jd_cache.put(self.encoder_id, text, encoding)
+                for i in positions:
+                    encodings[i] = encoding
+        
+        return encodings
+
+    def _load_index(self) -> VectorIndex:
+        """Load the vector index snapshot, or start empty if it is missing or stale."""
+        path = config.index_snapshot_path
+        if path and os.path.exists(path):
+            try:
+                index = load_index(path, mmap=config.index_mmap)
+                first_version = index.version_of(index.ids[0]) if len(index) else f"{self.encoder_id}:"
+                if (index.backend == config.index_backend and index.storage == config.index_storage
+                        and first_version.startswith(f"{self.encoder_id}:")):
+                    logger.info(f"Loaded {index.backend}/{index.storage} index snapshot with {len(index)} candidates")
+                    return index
+                logger.info("Ignoring index snapshot built with a different backend, storage or model")
+            except Exception as e:
+                logger.warning(f"Could not load index snapshot {path}: {e}")
+        
+        if config.index_backend == "ivf":
+            return create_index("ivf", storage=config.index_storage, nlist=config.ivf_nlist, nprobe=config.ivf_nprobe)
+        return create_index(config.index_backend, storage=config.index_storage)
+
+    def _sync_index(self, candidate_texts: Dict[str, str], prune: bool = True) -> Dict[str, int]:
+        """
+        Bring the vector index in line with the current candidate pool.
+        Candidates whose text changed since they were indexed are looked up in
+        the embedding store (and encoded on a miss); with `prune`, departed
+        candidates are removed. Returns embedding cache hit/miss counts over the whole pool.
+        Called with `_index_lock` held, from a worker thread: it blocks on the embedding executor.
+        """
+        versions = {
+            cid: f"{self.encoder_id}:{EmbeddingStore.text_hash(text)}"
+            for cid, text in candidate_texts.items()
+        }
+        
+        stale = [cid for cid, version in versions.items() if self.index.version_of(cid) != version]
+        removed = [cid for cid in self.index.ids if cid not in versions] if prune else []
+        
+        misses = 0
+        if stale:
+            embeddings, stats = self.embedding_store.get_or_encode(
+                self.encoder_id,
+                [candidate_texts[cid] for cid in stale],
+                self.encoder.encode_sync
             )
-            matches.append(match)
-        
-        return matches
+            misses = stats["misses"]
+            self.index.add(stale, embeddings, versions=[versions[cid] for cid in stale])
+        
+        if removed:
+            self.index.remove(removed)
+        
+        if (stale or removed) and config.index_snapshot_path:
+            try:
+                # Only the first worker to reach these entries writes them; the rest map its snapshot
+                if not self.index.save(config.index_snapshot_path):
+                    logger.debug("Index snapshot already published by another worker")
+                if config.index_mmap:
+                    # Swap the private copy the update produced for the shared mapping,
+                    # unless a newer snapshot replaced it in the meantime
+                    published = load_index(config.index_snapshot_path, mmap=True)
+                    if published.same_entries(self.index):
+                        self.index = published
+            except Exception as e:
+                logger.warning(f"Could not write index snapshot: {e}")
+        
+        return {"hits": len(versions) - misses, "misses": misses}
 
     def _build_job_text(self, job: JobDescription) -> str:
         """Build searchable text from job description."""
@@ -237,16 +919,13 @@ class APICandidateMatcherService:
         
         return [s for s in skills if len(s) > 2]  # Filter short words
 
-    def _extract_candidate_skills(self, candidate: CandidateProfile) -> List[str]:
-        """Extract normalized skills from candidate profile."""
-        skills = set()
-        
-        if candidate.skills:
-            for category, skill_list in candidate.skills.items():
-                for skill in skill_list:
-                    skills.add(self._normalize_text(skill))
-        
-        return list(skills)
+    def _title_tokens(self, title: Optional[str]) -> List[str]:
+        """Normalized title words used for title alignment."""
+        return self._normalize_text(title or "").split()
+
+    def _candidate_skills(self, candidate: CandidateProfile) -> List[str]:
+        """Normalized, distinct skills of a candidate in first-seen order (as stored in the skill matrix)."""
+        return list(dict.fromkeys(s for s in map(normalize_skill, flatten_skills(candidate.skills or {})) if s))
 
     def _normalize_text(self, text: str) -> str:
         """Normalize text for comparison."""
@@ -254,43 +933,6 @@ class APICandidateMatcherService:
             return ""
         return text.lower().strip()
 
-    def _calculate_cosine_similarity(self, candidate_embeddings, job_embedding):
-        """Calculate cosine similarity between embeddings."""
-        # Normalize embeddings
-        job_norm = job_embedding / (np.linalg.norm(job_embedding, axis=1, keepdims=True) + 1e-9)
-        candidate_norms = candidate_embeddings / (np.linalg.norm(candidate_embeddings, axis=1, keepdims=True) + 1e-9)
-        
-        # Calculate similarity
-        similarities = np.dot(candidate_norms, job_norm.T).flatten()
-        return similarities
-
-    def _calculate_jaccard_similarity(self, set_a: List[str], set_b: List[str]) -> float:
-        """Calculate Jaccard similarity between two skill sets."""
-        set_a_norm = set(self._normalize_text(s) for s in set_a)
-        set_b_norm = set(self._normalize_text(s) for s in set_b)
-        
-        if not set_a_norm and not set_b_norm:
-            return 0.0
-        
-        intersection = len(set_a_norm & set_b_norm)
-        union = len(set_a_norm | set_b_norm)
-        
-        return intersection / max(1, union)
-
-    def _calculate_title_alignment(self, job_title: str, candidate_title: str) -> float:
-        """Calculate title alignment score."""
-        if not job_title or not candidate_title:
-            return 0.0
-        
-        job_words = set(self._normalize_text(job_title).split())
-        candidate_words = set(self._normalize_text(candidate_title).split())
-        
-        if not job_words:
-            return 0.0
-        
-        intersection = len(job_words & candidate_words)
-        return intersection / max(3, len(job_words))  # Normalize by job title length
-
     def _infer_experience_years(self, candidate: CandidateProfile) -> Optional[int]:
         """Infer years of experience from candidate data."""
         stats = candidate.statistics or {}
@@ -311,103 +953,38 @@ class APICandidateMatcherService:
         # This could be enhanced to extract location from resume data
         return None
 
-    def _apply_advanced_filters(
-        self,
-        candidates: List[CandidateMatch],
-        filters: SearchFilters,
-        boost_skills: List[str],
-        penalty_skills: List[str]
-    ) -> List[CandidateMatch]:
-        """Apply advanced filters to candidate list."""
-        
-        filtered = []
-        
-        for candidate in candidates:
-            # Apply experience filters
-            if filters.min_experience is not None:
-                if candidate.experience_years is None or candidate.experience_years < filters.min_experience:
-                    continue
-            
-            if filters.max_experience is not None:
-                if candidate.experience_years is None or candidate.experience_years > filters.max_experience:
-                    continue
-            
-            # Apply required skills filter
-            if filters.required_skills:
-                candidate_skills_lower = [s.lower() for s in candidate.skills_match]
-                required_skills_lower = [s.lower() for s in filters.required_skills]
-                if not all(req in candidate_skills_lower for req in required_skills_lower):
-                    continue
-            
-            # Apply skill boosts and penalties
-            adjusted_candidate = candidate.copy()
-            if boost_skills or penalty_skills:
-                adjusted_candidate.match_score = self._adjust_score_with_skills(
-                    candidate, boost_skills, penalty_skills
-                )
-            
-            filtered.append(adjusted_candidate)
-        
-        # Re-sort by adjusted scores
-        return sorted(filtered, key=lambda x: x.match_score, reverse=True)
-
-    def _adjust_score_with_skills(
+    def _adjust_scores_with_skills(
         self,
-        candidate: CandidateMatch,
+        scores: np.ndarray,
+        rows: np.ndarray,
         boost_skills: List[str] = None,
         penalty_skills: List[str] = None
-    ) -> float:
-        """Adjust candidate score based on skill boosts and penalties."""
-        score = candidate.match_score
-        candidate_skills_lower = [s.lower() for s in candidate.skills_match]
-        
+    ) -> np.ndarray:
+        """Adjust candidate scores based on how many boost/penalty skills each candidate has."""
         if boost_skills:
-            boost_count = sum(1 for skill in boost_skills if skill.lower() in candidate_skills_lower)
-            score += boost_count * 0.1  # 10% boost per matching boost skill
+            boost_counts = SkillMatrix.take(self.skill_matrix.overlap(boost_skills, distinct=False), rows, 0.0)
+            scores = scores + boost_counts * 0.1  # 10% boost per matching boost skill
         
         if penalty_skills:
-            penalty_count = sum(1 for skill in penalty_skills if skill.lower() in candidate_skills_lower)
-            score -= penalty_count * 0.05  # 5% penalty per matching penalty skill
-        
-        return max(0.0, min(1.0, score))  # Keep score between 0 and 1
-
-    async def _save_job_to_db(self, job: JobDescription, db: Session):
-        """Save job to database if it doesn't exist."""
-        job_db = db.query(JobDB).filter(JobDB.id == job.id).first()
-        if not job_db:
-            job_db = JobDB(
-                id=job.id,
-                title=job.title,
-                company=job.company,
-                description=job.description,
-                requirements=job.requirements,
-                preferred_skills=job.preferred_skills,
-                location=job.location,
-                salary_range=job.salary_range,
-                priority=job.priority.value,
-                status=job.status.value
-            )
-            db.add(job_db)
-            db.commit()
+            penalty_counts = SkillMatrix.take(self.skill_matrix.overlap(penalty_skills, distinct=False), rows, 0.0)
+            scores = scores - penalty_counts * 0.05  # 5% penalty per matching penalty skill
+        
+        return np.clip(scores, 0.0, 1.0)  # Keep scores between 0 and 1
 
-    async def _log_search_history(
-        self, 
-        request: RecommendationRequest, 
-        matches: List[CandidateMatch], 
-        db: Session
+    async def _record_search(
+        self,
+        request: Union[RecommendationRequest, AdvancedRecommendationRequest],
+        matches: List[CandidateMatch]
     ):
-        """Log search history to database."""
-        history = RecommendationHistoryDB(
-            job_id=request.job.id,
-            search_query=request.dict(),
-            results=[m.dict() for m in matches],
-            total_candidates=len(matches),
+        """Queue the job (inserted if new) and the search history row for the background history writer."""
+        await self.history_writer.submit(HistoryRecord(
+            job=request.job,
+            search_query=request,
+            matches=matches,
             search_metadata={
                 "matcher_model": self.model_name,
                 "blend_alpha": self.blend_alpha,
                 "title_weight": self.title_weight,
                 "timestamp": datetime.utcnow().isoformat()
             }
-        )
-        db.add(history)
-        db.commit()
\ No newline at end of file
+        ))
@@ -1,10 +1,14 @@
 import asyncio
 import aiohttp
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Tuple
 from pydantic import BaseModel
 import os
 
+from .metrics import LatencyRecorder
+
 logger = logging.getLogger(__name__)
 
 class CandidateProfile(BaseModel):
@@ -17,71 +21,274 @@ class CandidateProfile(BaseModel):
     summary: Optional[str] = None
     resume_data: Optional[Dict[str, Any]] = None
     statistics: Optional[Dict[str, Any]] = None
+    version: Optional[int] = None  # Change version on the candidate backend, when known
 
 class CandidateBackendClient:
     def __init__(self, base_url: Optional[str] = None):
         self.base_url = base_url or os.getenv("CANDIDATE_BACKEND_URL", "http://localhost:8001")
         self.timeout = aiohttp.ClientTimeout(total=30)
+        self.bulk_page_size = int(os.getenv("CANDIDATE_BULK_PAGE_SIZE", "1000"))
+        
+        # Transport tuning
+        self.max_connections = int(os.getenv("CANDIDATE_CLIENT_MAX_CONNECTIONS", "100"))
+        self.max_connections_per_host = int(os.getenv("CANDIDATE_CLIENT_MAX_PER_HOST", "32"))
+        self.keepalive_timeout = float(os.getenv("CANDIDATE_CLIENT_KEEPALIVE_SECONDS", "30"))
+        self.dns_cache_ttl = int(os.getenv("CANDIDATE_CLIENT_DNS_TTL_SECONDS", "300"))
+        self.max_concurrency = int(os.getenv("CANDIDATE_CLIENT_CONCURRENCY", "16"))  # In-flight per-user requests
+        self.hedge_delay = float(os.getenv("CANDIDATE_CLIENT_HEDGE_DELAY_MS", "250")) / 1000.0  # 0 disables hedging
+        
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.latency = LatencyRecorder()
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+
+    async def start(self) -> None:
+        """Open the long-lived pooled session (called from the app lifespan)."""
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_connections_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True
+        )
+        self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        logger.info(f"Candidate backend client session opened for {self.base_url}")
+
+    async def close(self) -> None:
+        """Close the pooled session and its connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
+
+    def metrics(self) -> Dict[str, Any]:
+        """Per-endpoint latency histograms and hedging counters."""
+        return {
+            "base_url": self.base_url,
+            "latency": self.latency.snapshot(),
+            "hedged_requests": self.hedged_requests,
+            "hedge_wins": self.hedge_wins
+        }
         
     async def get_all_candidates(self) -> List[CandidateProfile]:
-        """Fetch all candidates from the debugging challenge users API."""
-        async with aiohttp.ClientSession(timeout=self.timeout) as session:
-            try:
-                # Get all users from the debugging challenge API
-                async with session.get(f"{self.base_url}/debug/api/users/all") as response:
-                    if response.status != 200:
-                        logger.error(f"Failed to fetch users: {response.status}")
-                        return []
-                    
-                    users_data = await response.json()
-                    logger.info(f"Fetched {len(users_data)} users from candidate backend")
-                    
-                    candidates = []
-                    for user in users_data:
-                        # Get detailed profile for each user
-                        detailed_profile = await self._get_user_profile(session, user["user_id"])
-                        if detailed_profile:
-                            candidates.append(detailed_profile)
-                    
-                    return candidates
-                    
-            except Exception as e:
-                logger.error(f"Error fetching candidates: {e}")
-                return []
-
-    async def _get_user_profile(self, session: aiohttp.ClientSession, user_id: str) -> Optional[CandidateProfile]:
-        """Get detailed user profile including skills and resume data."""
+        """
+        Fetch all candidates from the debugging challenge users API.
+        Uses the streaming bulk export; falls back to concurrent per-user profile
+        requests when the candidate backend does not provide it.
+        """
         try:
-            # Get user profile
-            async with session.get(f"{self.base_url}/debug/api/users/{user_id}/profile") as response:
-                if response.status != 200:
-                    logger.warning(f"Could not fetch profile for user {user_id}: {response.status}")
+            candidates, _ = await self.export_candidates()
+            return candidates
+        except Exception as e:
+            logger.error(f"Error fetching candidates: {e}")
+            return []
+
+    async def export_candidates(self) -> Tuple[List[CandidateProfile], Optional[int]]:
+        """
+        Fetch the full candidate population plus the change cursor to resume from
+        with `get_changes`. The cursor is None when the backend has no change feed.
+        Raises on transport errors.
+        """
+        start = time.perf_counter()
+        try:
+            exported = await self._get_candidates_bulk()
+            if exported is None:
+                logger.info("Bulk export unavailable, falling back to per-user profile requests")
+                return await self._get_candidates_per_user(), None
+            return exported
+        finally:
+            self.latency.observe("get_all_candidates", time.perf_counter() - start)
+
+    async def get_changes(self, since: int) -> Optional[Tuple[List[CandidateProfile], int, bool]]:
+        """
+        Fetch one page of profiles changed after cursor `since`.
+        Returns (profiles, new_cursor, has_more), or None if the backend has no change feed.
+        """
+        status, data = await self._get_json(
+            f"{self.base_url}/debug/api/users/changes?since={since}&limit={self.bulk_page_size}", "changes"
+        )
+        if status in (404, 405):
+            return None
+        if status != 200:
+            raise RuntimeError(f"Change feed request failed: {status}")
+        
+        profiles = [self._profile_from_bulk_record(record) for record in data["changes"]]
+        return profiles, int(data["cursor"]), bool(data.get("has_more"))
+
+    async def _get_candidates_per_user(self) -> List[CandidateProfile]:
+        """
+        List all users, then fetch their profiles with bounded concurrency.
+        Raises if the list or any profile cannot be fetched, so the result is always complete.
+        """
+        status, users_data = await self._get_json(f"{self.base_url}/debug/api/users/all", "users_all")
+        if status != 200:
+            raise RuntimeError(f"User list request failed: {status}")
+        
+        logger.info(f"Fetched {len(users_data)} users from candidate backend")
+        user_ids = [user["user_id"] for user in users_data]
+        profiles = await self.fetch_profiles(user_ids)
+        if len(profiles) < len(user_ids):
+            # A partial export would look like departed candidates to a full sync
+            raise RuntimeError(f"Could not fetch {len(user_ids) - len(profiles)} of {len(user_ids)} candidate profiles")
+        return profiles
+
+    async def fetch_profiles(self, user_ids: List[str]) -> List[CandidateProfile]:
+        """
+        Fetch detailed profiles for many users, keeping at most `max_concurrency`
+        requests in flight. Users whose profile cannot be fetched are skipped.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def fetch_one(user_id: str) -> Optional[CandidateProfile]:
+            async with semaphore:
+                return await self._get_user_profile(user_id)
+        
+        profiles = await asyncio.gather(*(fetch_one(user_id) for user_id in user_ids))
+        return [profile for profile in profiles if profile]
+
+    async def _get_json(self, url: str, label: str) -> Tuple[int, Any]:
+        """GET a JSON document, recording its latency under `label`."""
+        session = await self._get_session()
+        start = time.perf_counter()
+        async with session.get(url) as response:
+            data = await response.json() if response.status == 200 else None
+        self.latency.observe(label, time.perf_counter() - start)
+        return response.status, data
+
+    async def _hedged_get_json(self, url: str, label: str) -> Tuple[int, Any]:
+        """
+        GET with a hedged retry: if the first attempt has not finished after
+        `hedge_delay`, a second identical request is sent and whichever
+        completes first wins. Only used for small idempotent reads.
+        """
+        if self.hedge_delay <= 0:
+            return await self._get_json(url, label)
+        
+        primary = asyncio.ensure_future(self._get_json(url, label))
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay)
+        if done:
+            return primary.result()
+        
+        self.hedged_requests += 1
+        backup = asyncio.ensure_future(self._get_json(url, f"{label}_hedge"))
+        pending = {primary, backup}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.hedge_wins += 1
+                        return task.result()
+            return primary.result()  # Both attempts failed; surface the original error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _get_candidates_bulk(self) -> Optional[Tuple[List[CandidateProfile], Optional[int]]]:
+        """
+        Page through `/debug/api/users/bulk`, parsing NDJSON records as they stream in.
+        Returns the candidates and the change cursor reported with the first page,
+        or None if the endpoint does not exist on the candidate backend.
+        """
+        session = await self._get_session()
+        candidates: List[CandidateProfile] = []
+        cursor: Optional[str] = None
+        change_cursor: Optional[int] = None
+        
+        while True:
+            params = {"limit": str(self.bulk_page_size), "format": "ndjson"}
+            if cursor:
+                params["cursor"] = cursor
+            
+            page_start = time.perf_counter()
+            async with session.get(f"{self.base_url}/debug/api/users/bulk", params=params) as response:
+                if response.status in (404, 405):
                     return None
+                if response.status != 200:
+                    raise RuntimeError(f"Bulk export failed: {response.status}")
                 
-                profile_data = await response.json()
-                
-                # Try to get resume data if available
-                resume_data = await self._get_user_resume_data(session, user_id)
-                
-                # Extract skills from resume data or create mock skills based on user activity
-                skills = self._extract_skills_from_data(profile_data, resume_data)
+                buffer = b""
+                async for chunk in response.content.iter_any():
+                    buffer += chunk
+                    *lines, buffer = buffer.split(b"\n")
+                    for line in lines:
+                        if line.strip():
+                            candidates.append(self._profile_from_bulk_record(json.loads(line)))
+                if buffer.strip():
+                    candidates.append(self._profile_from_bulk_record(json.loads(buffer)))
                 
-                return CandidateProfile(
-                    user_id=user_id,
-                    display_name=profile_data.get("display_name", ""),
-                    email=profile_data.get("email", ""),
-                    title=self._infer_title_from_data(profile_data, resume_data),
-                    summary=self._generate_summary_from_data(profile_data, resume_data),
-                    skills=skills,
-                    resume_data=resume_data,
-                    statistics=profile_data.get("statistics", {})
-                )
+                if change_cursor is None and response.headers.get("X-Change-Cursor"):
+                    change_cursor = int(response.headers["X-Change-Cursor"])
+                cursor = response.headers.get("X-Next-Cursor")
+            self.latency.observe("bulk_page", time.perf_counter() - page_start)
+            
+            if not cursor:
+                break
+        
+        logger.info(f"Fetched {len(candidates)} candidates from bulk export")
+        return candidates, change_cursor
+
+    def _profile_from_bulk_record(self, record: Dict[str, Any]) -> CandidateProfile:
+        """Build a CandidateProfile from one bulk export record."""
+        resume_data = {
+            key: record[source]
+            for key, source in (("title", "title"), ("summary", "summary"), ("skills", "skills"), ("experience", "experience"))
+            if record.get(source)
+        } or None
+        
+        return CandidateProfile(
+            user_id=record["user_id"],
+            display_name=record.get("display_name", ""),
+            email=record.get("email", ""),
+            title=self._infer_title_from_data(record, resume_data),
+            summary=self._generate_summary_from_data(record, resume_data),
+            skills=self._extract_skills_from_data(record, resume_data),
+            experience=record.get("experience"),
+            resume_data=resume_data,
+            statistics=record.get("statistics", {}),
+            version=record.get("version")
+        )
+
+    async def _get_user_profile(self, user_id: str) -> Optional[CandidateProfile]:
+        """Get detailed user profile including skills and resume data."""
+        try:
+            # Get user profile
+            status, profile_data = await self._hedged_get_json(
+                f"{self.base_url}/debug/api/users/{user_id}/profile", "profile"
+            )
+            if status != 200:
+                logger.warning(f"Could not fetch profile for user {user_id}: {status}")
+                return None
+            
+            # Try to get resume data if available
+            resume_data = await self._get_user_resume_data(user_id)
+            
+            # Extract skills from resume data or create mock skills based on user activity
+            skills = self._extract_skills_from_data(profile_data, resume_data)
+            
+            return CandidateProfile(
+                user_id=user_id,
+                display_name=profile_data.get("display_name", ""),
+                email=profile_data.get("email", ""),
+                title=self._infer_title_from_data(profile_data, resume_data),
+                summary=self._generate_summary_from_data(profile_data, resume_data),
+                skills=skills,
+                resume_data=resume_data,
+                statistics=profile_data.get("statistics", {})
+            )
                 
         except Exception as e:
             logger.error(f"Error fetching profile for user {user_id}: {e}")
             return None
 
-    async def _get_user_resume_data(self, session: aiohttp.ClientSession, user_id: str) -> Optional[Dict[str, Any]]:
+    async def _get_user_resume_data(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Try to get resume data for a user from the resume parser service."""
         try:
             # This is a fallback - in a real scenario, you'd have a user-resume mapping
@@ -0,0 +1,118 @@
+"""
+Candidate attribute arrays for filter pushdown.
+
+Advanced search used to over-fetch `top_n * 3` ranked matches and filter
+them in Python, which wasted scoring work and returned fewer than `top_n`
+results when filters were selective. `CandidateAttributes` keeps the
+filterable attributes of the whole pool as aligned numpy arrays
+(experience years, location codes), so `SearchFilters` compile to a
+boolean mask over the pool that is applied before top-k selection.
+
+Locations are interned: a substring filter is tested once per distinct
+location, not once per candidate.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+# (experience years or None, location or None) for one candidate
+Attributes = Tuple[Optional[float], Optional[str]]
+
+
+class CandidateAttributes:
+    """
+    Filterable attributes per key, packed into arrays.
+
+    Rows are updated in place by `sync`; the packed arrays are rebuilt
+    lazily on the next query after a change.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._keys: List[Hashable] = []
+        self._rows: Dict[Hashable, int] = {}
+        self._values: List[Attributes] = []
+        self._sources: List[Any] = []
+        self._packed_arrays: Optional[Tuple[np.ndarray, np.ndarray, List[str]]] = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def keys(self) -> List[Hashable]:
+        return list(self._keys)
+
+    def sync(self, items_by_key: Dict[Hashable, Any], extract: Callable[[Any], Attributes]) -> int:
+        """
+        Make the store hold exactly `items_by_key`, extracting attributes with
+        `extract`. Items that are the very same object as last time are not
+        re-extracted. Returns the number of rows that changed.
+        """
+        changed = 0
+        with self._lock:
+            for key, item in items_by_key.items():
+                row = self._rows.get(key)
+                if row is None:
+                    self._rows[key] = len(self._keys)
+                    self._keys.append(key)
+                    self._values.append(extract(item))
+                    self._sources.append(item)
+                elif self._sources[row] is not item:
+                    self._values[row] = extract(item)
+                    self._sources[row] = item
+                else:
+                    continue
+                changed += 1
+
+            departed = {self._rows[k] for k in self._keys if k not in items_by_key}
+            if departed:
+                keep = [r for r in range(len(self._keys)) if r not in departed]
+                self._keys = [self._keys[r] for r in keep]
+                self._values = [self._values[r] for r in keep]
+                self._sources = [self._sources[r] for r in keep]
+                self._rows = {k: r for r, k in enumerate(self._keys)}
+                changed += len(departed)
+
+            if changed:
+                self._packed_arrays = None
+        return changed
+
+    def _packed(self) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """(experience years with NaN for unknown, location code per row, distinct lowercase locations)."""
+        with self._lock:
+            if self._packed_arrays is None:
+                experience = np.array(
+                    [np.nan if years is None else years for years, _ in self._values], dtype=np.float32
+                )
+                codes: Dict[str, int] = {"": 0}  # code 0: unknown location
+                location_codes = np.fromiter(
+                    (codes.setdefault((location or "").lower(), len(codes)) for _, location in self._values),
+                    dtype=np.int32, count=len(self._values),
+                )
+                self._packed_arrays = (experience, location_codes, list(codes))
+            return self._packed_arrays
+
+    def mask(
+        self,
+        min_experience: Optional[float] = None,
+        max_experience: Optional[float] = None,
+        location: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Boolean mask over the rows that pass every given filter.
+        Unknown experience never passes an experience bound; unknown
+        location passes a location filter (it cannot be ruled out).
+        """
+        experience, location_codes, locations = self._packed()
+        keep = np.ones(len(experience), dtype=bool)
+        if min_experience is not None:
+            keep &= experience >= min_experience
+        if max_experience is not None:
+            keep &= experience <= max_experience
+        if location:
+            needle = location.lower()
+            allowed = np.array([code == 0 or needle in loc for code, loc in enumerate(locations)], dtype=bool)
+            keep &= allowed[location_codes]
+        return keep
@@ -0,0 +1,277 @@
+"""
+Background replication of candidate profiles into the recruiter database.
+
+The sync task keeps the local `candidates` table, and an in-memory copy of
+it, in line with the candidate backend: one full bulk export on first run,
+then incremental polls of the change feed. Searches read the in-memory
+pool, so their latency no longer depends on the candidate backend.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import config
+from ..database.connection import SessionLocal
+from ..database.models import CandidateDB, SyncStateDB
+from .candidate_client import CandidateBackendClient, CandidateProfile, get_candidate_client
+
+logger = logging.getLogger(__name__)
+
+SYNC_NAME = "candidate_backend"
+
+PoolListener = Callable[[List[CandidateProfile]], None]
+
+
+def _profile_to_row(profile: CandidateProfile, row: CandidateDB) -> CandidateDB:
+    row.anonymous_id = profile.user_id
+    row.display_name = profile.display_name
+    row.email = profile.email
+    row.title = profile.title
+    row.summary = profile.summary
+    row.skills = profile.skills
+    row.experience = profile.experience
+    row.statistics = profile.statistics
+    row.resume_data = profile.resume_data
+    row.source_version = profile.version
+    row.is_active = True
+    return row
+
+
+def _row_to_profile(row: CandidateDB) -> CandidateProfile:
+    return CandidateProfile(
+        user_id=row.anonymous_id,
+        display_name=row.display_name or "",
+        email=row.email or "",
+        title=row.title,
+        summary=row.summary,
+        skills=row.skills,
+        experience=row.experience,
+        statistics=row.statistics or {},
+        resume_data=row.resume_data,
+        version=row.source_version
+    )
+
+
+class CandidateSyncService:
+    """
+    Keeps a local replica of the candidate pool warm.
+
+    `candidates()` returns the current pool; `pool_version` increases every
+    time the pool changes, so caches can key on it. Listeners registered with
+    `add_listener` are called (in a worker thread) with the full pool after
+    each change, e.g. to refresh embeddings.
+    """
+
+    def __init__(self, client: Optional[CandidateBackendClient] = None, interval_seconds: float = 30.0):
+        self.client = client or get_candidate_client()
+        self.interval_seconds = interval_seconds
+        self.pool_version = 0
+        self._pool: Dict[str, CandidateProfile] = {}
+        self._cursor: Optional[int] = None
+        self._listeners: List[PoolListener] = []
+        self._task: Optional[asyncio.Task] = None
+        self._loaded = False
+        self.last_success_at: Optional[float] = None
+        self.last_attempt_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.full_syncs = 0
+        self.incremental_syncs = 0
+
+    @property
+    def ready(self) -> bool:
+        """True once the pool holds data from the local replica or a completed sync."""
+        return self._loaded and (self.last_success_at is not None or bool(self._pool))
+
+    def candidates(self) -> List[CandidateProfile]:
+        return list(self._pool.values())
+
+    def add_listener(self, listener: PoolListener) -> None:
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        """Start the background sync loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        if not self._loaded:
+            await asyncio.to_thread(self._load_replica)
+            if self._pool:
+                await self._notify()
+        while True:
+            try:
+                await self.sync_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning(f"Candidate sync failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def sync_once(self) -> int:
+        """Run one sync pass. Returns the number of profiles applied."""
+        self.last_attempt_at = time.time()
+        if not self._loaded:
+            await asyncio.to_thread(self._load_replica)
+
+        applied = None
+        if self._cursor is not None:
+            applied = await self._sync_incremental()
+        if applied is None:
+            applied = await self._sync_full()
+
+        self.last_success_at = time.time()
+        self.last_error = None
+        if applied:
+            await self._notify()
+        return applied
+
+    async def _sync_incremental(self) -> Optional[int]:
+        """Apply change-feed pages until caught up; None if the backend has no feed."""
+        applied = 0
+        while True:
+            page = await self.client.get_changes(self._cursor)
+            if page is None:
+                return None
+            profiles, cursor, has_more = page
+            if profiles:
+                applied += await asyncio.to_thread(self._apply, profiles, cursor, False)
+            else:
+                self._cursor = cursor
+            if not has_more:
+                break
+        self.incremental_syncs += 1
+        if applied:
+            logger.info(f"Applied {applied} candidate changes (cursor={self._cursor})")
+        return applied
+
+    async def _sync_full(self) -> int:
+        profiles, cursor = await self.client.export_candidates()
+        applied = await asyncio.to_thread(self._apply, profiles, cursor, True)
+        self.full_syncs += 1
+        logger.info(f"Full candidate sync: {len(profiles)} profiles, {applied} changed")
+        return applied
+
+    async def _notify(self) -> None:
+        pool = self.candidates()
+        for listener in self._listeners:
+            try:
+                await asyncio.to_thread(listener, pool)
+            except Exception as e:
+                logger.warning(f"Candidate pool listener failed: {e}")
+
+    def _load_replica(self) -> None:
+        """Populate the in-memory pool and cursor from the local database."""
+        db = SessionLocal()
+        try:
+            rows = db.query(CandidateDB).filter(CandidateDB.is_active == True).all()
+            self._pool = {row.anonymous_id: _row_to_profile(row) for row in rows if row.anonymous_id}
+            state = db.query(SyncStateDB).filter(SyncStateDB.name == SYNC_NAME).first()
+            self._cursor = state.cursor if state else None
+            if state and state.last_synced_at:
+                self.last_success_at = state.last_synced_at.replace(tzinfo=state.last_synced_at.tzinfo or timezone.utc).timestamp()
+            if self._pool:
+                self.pool_version += 1
+            self._loaded = True
+            logger.info(f"Loaded {len(self._pool)} candidates from local replica")
+        finally:
+            db.close()
+
+    def _apply(self, profiles: List[CandidateProfile], cursor: Optional[int], full: bool) -> int:
+        """
+        Upsert profiles into the replica, then swap them into the in-memory pool.
+        A full export also deactivates candidates it no longer contains, unless
+        that would deactivate more than `sync_max_deactivate_fraction` of the
+        active pool: the sync then fails and nothing is written.
+        Returns how many candidates actually changed.
+        """
+        changed = [p for p in profiles if self._pool.get(p.user_id) != p]
+        db = SessionLocal()
+        try:
+            query = db.query(CandidateDB)
+            if not full:
+                query = query.filter(CandidateDB.anonymous_id.in_([p.user_id for p in changed]))
+            existing = {row.anonymous_id: row for row in query.all()}
+
+            for profile in changed:
+                row = existing.get(profile.user_id)
+                if row is None:
+                    row = CandidateDB()
+                    db.add(row)
+                _profile_to_row(profile, row)
+
+            departed = []
+            if full:
+                seen = {p.user_id for p in profiles}
+                active = [user_id for user_id, row in existing.items() if row.is_active]
+                departed = [user_id for user_id in active if user_id not in seen]
+                if active and len(departed) > config.sync_max_deactivate_fraction * len(active):
+                    # More likely a truncated export than that many candidates leaving
+                    raise RuntimeError(
+                        f"Full sync would deactivate {len(departed)} of {len(active)} candidates; refusing "
+                        f"(CANDIDATE_SYNC_MAX_DEACTIVATE_FRACTION={config.sync_max_deactivate_fraction})"
+                    )
+                for user_id in departed:
+                    existing[user_id].is_active = False
+
+            state = db.query(SyncStateDB).filter(SyncStateDB.name == SYNC_NAME).first()
+            if state is None:
+                state = SyncStateDB(name=SYNC_NAME)
+                db.add(state)
+            state.cursor = cursor
+            state.last_synced_at = datetime.now(timezone.utc)
+            db.commit()
+        finally:
+            db.close()
+
+        self._cursor = cursor
+        if not changed and not departed:
+            return 0
+        
+        pool = dict(self._pool)
+        pool.update({p.user_id: p for p in changed})
+        for user_id in departed:
+            pool.pop(user_id, None)
+        self._pool = pool
+        self.pool_version += 1
+        return len(changed) + len(departed)
+
+    def status(self) -> Dict[str, Any]:
+        """Sync progress and staleness, for health reporting."""
+        now = time.time()
+        return {
+            "enabled": config.sync_enabled,
+            "running": self._task is not None and not self._task.done(),
+            "ready": self.ready,
+            "candidates": len(self._pool),
+            "cursor": self._cursor,
+            "pool_version": self.pool_version,
+            "last_success_at": datetime.fromtimestamp(self.last_success_at, timezone.utc).isoformat() if self.last_success_at else None,
+            "staleness_seconds": round(now - self.last_success_at, 1) if self.last_success_at else None,
+            "last_error": self.last_error,
+            "full_syncs": self.full_syncs,
+            "incremental_syncs": self.incremental_syncs
+        }
+
+
+# Global sync instance
+_sync_instance = None
+
+def get_candidate_sync() -> CandidateSyncService:
+    """Get singleton candidate sync service."""
+    global _sync_instance
+    if _sync_instance is None:
+        _sync_instance = CandidateSyncService(interval_seconds=config.sync_interval_seconds)
+    return _sync_instance
@@ -0,0 +1,311 @@
+"""
+Cached resume corpora for `SemanticMatcher`.
+
+`SemanticMatcher.match_candidates` used to re-read and re-parse every
+JSON file of `parsed_resumes_dir`, rebuild candidate texts and skills, and
+re-embed everything on each call. `CorpusRegistry` keeps one `Corpus`
+per directory (or combined.json / corpus.jsonl file) with the parsed records, their
+texts, skill and title matrices, and embeddings computed so far.
+
+On each use a corpus compares the (mtime, size) of its files with what
+it loaded and re-parses only new or changed files; removed files are
+dropped. Within `recheck_seconds` of the last check even that directory
+scan is skipped, so repeated matches do no file I/O at all. Whole corpora
+are evicted least-recently-used once their estimated memory exceeds the
+registry budget.
+
+Embeddings are filled in lazily per row (`missing` / `store`), so a BM25
+shortlist still embeds only the candidates it keeps, and each candidate
+is embedded once per corpus.
+
+A JSONL corpus written by the resume pipelines (`corpus.jsonl` + offset
+index) is memory-mapped instead of read file by file, and because it is
+append-only, growth only parses the lines added since the last load.
+
+Parsing is injected (`extract`), like tokenization in `BM25Index`, so the
+standalone `semantic_matcher` can supply its own helpers.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .lexical_index import BM25Index
+from .resume_corpus import JsonlCorpus, is_corpus_file
+from .skill_vocab import SkillMatrix, SkillVocabulary
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CorpusRecord:
+    """One candidate parsed from a resume JSON."""
+    text: str
+    data: Dict[str, Any]
+    filename: str
+    skills: List[str]
+    title_tokens: List[str]
+    embedding: Optional[np.ndarray] = None
+
+
+# Parsed resume dict -> CorpusRecord, or None to skip it (e.g. no usable text)
+Extractor = Callable[[Dict[str, Any]], Optional[CorpusRecord]]
+
+
+@dataclass
+class _FileEntry:
+    mtime_ns: int
+    size: int
+    records: List[CorpusRecord]
+    lines: int = 0  # JSONL corpora: lines consumed so far
+    last_line: bytes = b""  # JSONL corpora: bytes of the last consumed line, to detect rewrites
+
+
+def _read_resume_file(path: Path) -> List[Dict[str, Any]]:
+    """Resume dicts in one JSON file: a combined.json `results` list or a single resume."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, dict) and "results" in data:
+        return data["results"]
+    return [data]
+
+
+def _is_resume_file(name: str) -> bool:
+    if is_corpus_file(name):
+        return True
+    return name.endswith(".json") and not name.endswith(".error.json") and name != "combined.json"
+
+
+class CorpusView:
+    """
+    Snapshot of a corpus' records (row order = file name order) with
+    skill and title matrices and the embeddings matrix. A match keeps using
+    the view it started with even if another thread reloads the corpus.
+    """
+
+    def __init__(self, records: List[CorpusRecord], title_vocab: SkillVocabulary):
+        self.records = records
+        self.texts = [r.text for r in records]
+        self.skill_matrix = SkillMatrix.from_lists([r.skills for r in records])
+        self.title_matrix = SkillMatrix.from_lists([r.title_tokens for r in records], title_vocab)
+        self.embedded = np.array([r.embedding is not None for r in records], dtype=bool)
+        self.embeddings: Optional[np.ndarray] = None
+        if self.embedded.any():
+            dim = next(r.embedding for r in records if r.embedding is not None).shape[0]
+            self.embeddings = np.zeros((len(records), dim), dtype=np.float32)
+            for row in np.flatnonzero(self.embedded):
+                self.embeddings[row] = records[row].embedding
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def missing(self, rows: Sequence[int]) -> List[int]:
+        """Rows among `rows` that have no embedding yet."""
+        return [int(r) for r in rows if not self.embedded[r]]
+
+    def store(self, rows: Sequence[int], vectors: np.ndarray) -> None:
+        """Keep freshly computed embeddings, also on the records so later views reuse them."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            if self.embeddings is None:
+                self.embeddings = np.zeros((len(self.records), vectors.shape[1]), dtype=np.float32)
+            for row, vector in zip(rows, vectors):
+                self.records[row].embedding = vector
+                self.embeddings[row] = vector
+                self.embedded[row] = True
+
+    def take_embeddings(self, rows: Sequence[int]) -> np.ndarray:
+        """Embeddings of `rows`, all of which must have been stored."""
+        return self.embeddings[np.asarray(rows, dtype=np.int64)]
+
+
+class Corpus:
+    """Parsed, featurized and (lazily) embedded candidates of one directory or combined file."""
+
+    def __init__(self, path: Path, extract: Extractor, title_vocab: SkillVocabulary):
+        self.path = path
+        self.extract = extract
+        self.title_vocab = title_vocab
+        self._lock = threading.RLock()
+        self._files: Dict[str, _FileEntry] = {}
+        self._checked_at: Optional[float] = None
+        self._view: Optional[CorpusView] = None
+        self._lexical: Optional[BM25Index] = None
+        self._raw_bytes = 0
+        self.reloads = 0
+        self.files_parsed = 0
+
+    def _stat_files(self) -> Dict[str, Tuple[int, int]]:
+        if self.path.is_file():
+            st = self.path.stat()
+            return {self.path.name: (st.st_mtime_ns, st.st_size)}
+        out = {}
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if entry.is_file() and _is_resume_file(entry.name):
+                    st = entry.stat()
+                    out[entry.name] = (st.st_mtime_ns, st.st_size)
+        # A directory holding a JSONL corpus is read from it alone; per-resume
+        # JSON files next to it are the optional legacy export of the same records
+        if any(is_corpus_file(name) for name in out):
+            out = {name: st for name, st in out.items() if is_corpus_file(name)}
+        return out
+
+    def _load_file(self, file_path: Path, known: Optional[_FileEntry], mtime: int, size: int) -> _FileEntry:
+        if not is_corpus_file(file_path.name):
+            records = [r for r in (self.extract(res) for res in _read_resume_file(file_path)) if r is not None]
+            return _FileEntry(mtime, size, records)
+        with JsonlCorpus(file_path) as corpus:
+            # Corpora are append-only: if the lines read last time are unchanged, parse only the new ones
+            start, records = 0, []
+            if known is not None and 0 < known.lines <= len(corpus) and corpus.line(known.lines - 1) == known.last_line:
+                start, records = known.lines, list(known.records)
+            records.extend(r for r in (self.extract(res) for res in corpus.records(start)) if r is not None)
+            lines = len(corpus)
+            return _FileEntry(mtime, size, records, lines, corpus.line(lines - 1) if lines else b"")
+
+    def refresh(self, recheck_seconds: float = 0.0) -> int:
+        """
+        Re-parse files whose mtime or size changed and drop removed ones.
+        Skipped within `recheck_seconds` of the last check. Returns the number of files changed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._checked_at is not None and now - self._checked_at < recheck_seconds:
+                return 0
+            stats = self._stat_files() if self.path.exists() else {}
+            changed = 0
+            for name, (mtime, size) in stats.items():
+                known = self._files.get(name)
+                if known is not None and (known.mtime_ns, known.size) == (mtime, size):
+                    continue
+                file_path = self.path if self.path.is_file() else self.path / name
+                try:
+                    self._files[name] = self._load_file(file_path, known, mtime, size)
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable resume file {file_path}: {e}")
+                    self._files[name] = _FileEntry(mtime, size, [])
+                self.files_parsed += 1
+                changed += 1
+            for name in [n for n in self._files if n not in stats]:
+                del self._files[name]
+                changed += 1
+            if changed:
+                self._raw_bytes = sum(entry.size for entry in self._files.values())
+                self._view = None
+                self.reloads += 1
+            self._checked_at = now
+            return changed
+
+    def view(self) -> CorpusView:
+        """Current records with their matrices, rebuilt after a change."""
+        with self._lock:
+            if self._view is None:
+                self._view = CorpusView(
+                    [record for name in sorted(self._files) for record in self._files[name].records],
+                    self.title_vocab,
+                )
+            return self._view
+
+    def __len__(self) -> int:
+        return len(self.view())
+
+    def shortlist(
+        self,
+        view: CorpusView,
+        text: str,
+        k: int,
+        tokenize: Callable[[str], List[str]],
+        stopwords: Iterable[str],
+    ) -> List[int]:
+        """Rows of `view` for the k best BM25 matches of `text`; the index is kept in sync incrementally."""
+        with self._lock:
+            if self._lexical is None:
+                self._lexical = BM25Index(tokenize, stopwords)
+            self._lexical.sync(dict(enumerate(view.texts)))
+            keys, _ = self._lexical.search(text, k)
+            return keys
+
+    def nbytes(self) -> int:
+        """
+        Estimated memory: parsed JSON (approximated by the source file sizes)
+        plus embeddings, held both per record and in the packed matrix.
+        """
+        with self._lock:
+            matrix = self.view().embeddings
+            return self._raw_bytes + (2 * matrix.nbytes if matrix is not None else 0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "path": str(self.path),
+                "files": len(self._files),
+                "candidates": sum(len(entry.records) for entry in self._files.values()),
+                "embedded": int(self.view().embedded.sum()),
+                "reloads": self.reloads,
+                "files_parsed": self.files_parsed,
+                "mb": round(self.nbytes() / 2**20, 1),
+            }
+
+
+class CorpusRegistry:
+    """LRU map of resolved path -> Corpus, bounded by an estimated memory budget."""
+
+    def __init__(self, extract: Extractor, max_bytes: int = 512 * 2**20, recheck_seconds: float = 2.0):
+        self.extract = extract
+        self.max_bytes = int(max_bytes)
+        self.recheck_seconds = float(recheck_seconds)
+        self.title_vocab = SkillVocabulary()
+        self._corpora: "OrderedDict[str, Corpus]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path: str) -> Corpus:
+        """The corpus for `path`, loaded or refreshed as needed; may evict other corpora."""
+        key = str(Path(path).resolve())
+        with self._lock:
+            corpus = self._corpora.get(key)
+            if corpus is None:
+                self.misses += 1
+                corpus = self._corpora[key] = Corpus(Path(key), self.extract, self.title_vocab)
+            else:
+                self.hits += 1
+            self._corpora.move_to_end(key)
+        corpus.refresh(self.recheck_seconds)
+        self._evict(keep=key)
+        return corpus
+
+    def _evict(self, keep: str) -> None:
+        with self._lock:
+            total = sum(c.nbytes() for c in self._corpora.values())
+            while total > self.max_bytes and len(self._corpora) > 1:
+                oldest = next(iter(self._corpora))
+                if oldest == keep:
+                    break
+                total -= self._corpora.pop(oldest).nbytes()
+                self.evictions += 1
+                logger.info(f"Evicted resume corpus {oldest} from the corpus registry")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._corpora.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            corpora = list(self._corpora.values())
+            counters = {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+        return {
+            **counters,
+            "max_mb": round(self.max_bytes / 2**20, 1),
+            "corpora": [c.stats() for c in corpora],
+        }
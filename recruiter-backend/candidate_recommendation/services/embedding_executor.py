@@ -0,0 +1,218 @@
+"""
+Micro-batching embedding executor.
+
+Sentence-transformer encodes are CPU/GPU bound and were called directly
+inside `async def` handlers, blocking the event loop for the whole encode.
+`EmbeddingExecutor` moves encoding onto a dedicated worker thread:
+callers submit texts and get a future back, and the worker merges requests
+that arrive close together into one `encode` call (up to `max_batch_size`
+texts, waiting at most `max_wait_ms` for a batch to fill). Concurrent
+handlers therefore share forward passes instead of queueing whole encodes
+behind each other. A request larger than `max_batch_size` is encoded in
+chunks taken round-robin with the other queued requests, so one large
+encode cannot hold the worker until it is done.
+
+This module only depends on numpy so it can be imported both from the
+package and by the standalone API.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EncodeFn = Callable[[List[str]], np.ndarray]
+
+# Queued unit of work: texts to encode and the future their embeddings resolve
+_Request = Tuple[List[str], Future]
+
+
+class _Job:
+    """A request being encoded: how far it got and the embeddings of the chunks done so far."""
+
+    __slots__ = ("texts", "future", "offset", "parts")
+
+    def __init__(self, texts: List[str], future: Future):
+        self.texts = texts
+        self.future = future
+        self.offset = 0
+        self.parts: List[np.ndarray] = []
+
+
+# Slice texts[start:end] of a job, encoded as part of one batch
+_Chunk = Tuple[_Job, int, int]
+
+
+class EmbeddingExecutor:
+    """Queue of encode requests served in micro-batches by one worker thread."""
+
+    def __init__(
+        self,
+        encode_fn: EncodeFn,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        name: str = "embedding-executor",
+    ):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.name = name
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._pending: "deque[_Job]" = deque()
+        self._carry: "deque[_Job]" = deque()  # jobs with texts left after their last chunk
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self.batches = 0
+        self.requests = 0  # caller requests completed, each counted once
+        self.chunks = 0  # request slices encoded; a split request adds one per batch it rides in
+        self.texts = 0
+        self.encode_seconds = 0.0
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._closed = False
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker after it drains the requests already queued."""
+        with self._start_lock:
+            if self._thread is None:
+                return
+            self._closed = True
+            self._queue.put(None)
+            thread, self._thread = self._thread, None
+        if wait:
+            thread.join()
+
+    def submit(self, texts: Sequence[str]) -> Future:
+        """Queue `texts`; the future resolves to a (len(texts), dim) float32 array."""
+        future: Future = Future()
+        texts = list(texts)
+        if not texts:
+            future.set_result(np.zeros((0, 0), dtype=np.float32))
+            return future
+        if self._closed:
+            raise RuntimeError("EmbeddingExecutor has been shut down")
+        self.start()
+        self._queue.put((texts, future))
+        return future
+
+    async def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Encode from a coroutine without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(texts))
+
+    def encode_sync(self, texts: Sequence[str]) -> np.ndarray:
+        """Encode from a worker thread (never call this on the event loop)."""
+        return self.submit(texts).result()
+
+    def _admit(self, item: Optional[_Request]) -> None:
+        """Add a dequeued request to the pending jobs (or note the shutdown sentinel)."""
+        if item is None:
+            self._stopping = True
+        elif item[1].set_running_or_notify_cancel():  # requests cancelled while queued aren't encoded
+            self._pending.append(_Job(*item))
+
+    def _pending_texts(self) -> int:
+        return sum(len(job.texts) - job.offset for jobs in (self._pending, self._carry) for job in jobs)
+
+    def _next_batch(self) -> Optional[List[_Chunk]]:
+        """
+        Wait for work, then collect requests until `max_batch_size` texts are
+        pending or the wait expires, and take up to `max_batch_size` texts
+        from the pending jobs in turn. A job that doesn't fit goes to the back
+        of the line, behind requests that arrived in the meantime. Returns None
+        once shut down and drained.
+        """
+        while not self._pending and not self._carry:
+            if self._stopping:
+                return None
+            self._admit(self._queue.get())
+
+        deadline = time.monotonic() + self.max_wait
+        while not self._stopping and self._pending_texts() < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._admit(item)
+        # Whatever arrived meanwhile takes its turn before a large job's next chunk
+        while not self._stopping:
+            try:
+                self._admit(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._pending.extend(self._carry)
+        self._carry.clear()
+
+        batch: List[_Chunk] = []
+        size = 0
+        while self._pending and size < self.max_batch_size:
+            job = self._pending.popleft()
+            end = min(len(job.texts), job.offset + self.max_batch_size - size)
+            batch.append((job, job.offset, end))
+            size += end - job.offset
+            job.offset = end
+            if end < len(job.texts):
+                self._carry.append(job)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            texts = [t for job, start, end in batch for t in job.texts[start:end]]
+            start_time = time.perf_counter()
+            try:
+                embeddings = np.asarray(self.encode_fn(texts), dtype=np.float32)
+            except Exception as e:
+                logger.warning(f"Embedding batch of {len(texts)} texts failed: {e}")
+                failed = {id(job) for job, _, _ in batch}
+                self._carry = deque(job for job in self._carry if id(job) not in failed)
+                for job, _, _ in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                continue
+            self.encode_seconds += time.perf_counter() - start_time
+            self.batches += 1
+            self.chunks += len(batch)
+            self.texts += len(texts)
+
+            offset = 0
+            for job, start, end in batch:
+                job.parts.append(embeddings[offset:offset + end - start])
+                offset += end - start
+                if end == len(job.texts):
+                    self.requests += 1
+                    job.future.set_result(job.parts[0] if len(job.parts) == 1 else np.concatenate(job.parts))
+
+    def stats(self) -> Dict[str, Any]:
+        """Batching counters: requests and request chunks merged per batch, and queue depth."""
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "chunks": self.chunks,
+            "texts": self.texts,
+            "mean_batch_texts": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "mean_requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "mean_chunks_per_batch": round(self.chunks / self.batches, 2) if self.batches else 0.0,
+            "encode_seconds": round(self.encode_seconds, 3),
+            "queue_depth": self._queue.qsize(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
@@ -0,0 +1,162 @@
+"""
+Persistent embedding store for candidate texts.
+
+Embeddings are keyed by (model name, SHA-256 of the text that was encoded),
+so a candidate only needs to be re-encoded when the text built for it
+changes. Vectors are persisted in a small SQLite database so the cache
+survives restarts, with a bounded in-memory LRU in front of it for hot
+lookups (the vector index, not this cache, holds the whole pool).
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of bound parameters per statement
+_SQL_CHUNK = 500
+
+
+class EmbeddingStore:
+    """
+    Content-addressed cache of sentence embeddings backed by SQLite.
+    """
+
+    def __init__(self, path: str, memory_size: int = 10000):
+        self.path = path
+        self.memory_size = max(0, int(memory_size))
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model_name TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model_name, text_hash)
+            )
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """Stable content hash used as the cache key for a text."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, model_name: str, hashes: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Look up embeddings for the given text hashes; missing hashes are omitted."""
+        found: Dict[str, np.ndarray] = {}
+        to_query: List[str] = []
+
+        with self._lock:
+            for h in hashes:
+                vec = self._memory.get((model_name, h))
+                if vec is not None:
+                    self._memory.move_to_end((model_name, h))
+                    found[h] = vec
+                else:
+                    to_query.append(h)
+
+            for start in range(0, len(to_query), _SQL_CHUNK):
+                chunk = to_query[start:start + _SQL_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model_name = ? AND text_hash IN ({placeholders})",
+                    [model_name, *chunk],
+                ).fetchall()
+                for h, blob in rows:
+                    vec = np.frombuffer(blob, dtype=np.float32)
+                    self._remember(model_name, h, vec)
+                    found[h] = vec
+
+        return found
+
+    def put_many(self, model_name: str, items: Dict[str, np.ndarray]) -> None:
+        """Persist embeddings for the given text hashes."""
+        if not items:
+            return
+        rows = []
+        with self._lock:
+            for h, vec in items.items():
+                vec = np.ascontiguousarray(vec, dtype=np.float32)
+                self._remember(model_name, h, vec)
+                rows.append((model_name, h, int(vec.shape[0]), vec.tobytes()))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model_name, text_hash, dim, vector) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def _remember(self, model_name: str, h: str, vec: np.ndarray) -> None:
+        """Add to the in-memory LRU (caller holds the lock)."""
+        if not self.memory_size:
+            return
+        self._memory[(model_name, h)] = vec
+        self._memory.move_to_end((model_name, h))
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_or_encode(
+        self,
+        model_name: str,
+        texts: Sequence[str],
+        encode_fn: Callable[[List[str]], np.ndarray],
+    ) -> Tuple[np.ndarray, Dict[str, int]]:
+        """
+        Return an (N, d) float32 matrix of embeddings for `texts`.
+
+        Only texts without a cached embedding are passed to `encode_fn`.
+        The second return value reports cache hits and misses for this call.
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32), {"hits": 0, "misses": 0}
+
+        hashes = [self.text_hash(t) for t in texts]
+        cached = self.get_many(model_name, set(hashes))
+
+        missing: Dict[str, str] = {}
+        for h, t in zip(hashes, texts):
+            if h not in cached and h not in missing:
+                missing[h] = t
+
+        if missing:
+            logger.info(f"Encoding {len(missing)} new candidate texts ({len(cached)} cached)")
+            encoded = np.asarray(encode_fn(list(missing.values())), dtype=np.float32)
+            fresh = dict(zip(missing.keys(), encoded))
+            self.put_many(model_name, fresh)
+            cached.update(fresh)
+
+        hits = sum(1 for h in hashes if h not in missing)
+        misses = len(hashes) - hits
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+        return np.vstack([cached[h] for h in hashes]), {"hits": hits, "misses": misses}
+
+    def stats(self) -> Dict[str, int]:
+        """Cumulative hit/miss counters and number of vectors held in memory."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "in_memory": len(self._memory),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
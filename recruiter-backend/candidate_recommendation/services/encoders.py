@@ -0,0 +1,213 @@
+"""
+Sentence encoder backends.
+
+- "torch": the sentence-transformers model as-is (default).
+- "onnx": the same model exported to ONNX, dynamically quantized to int8
+  and served through onnxruntime. On CPU-only nodes this is several times
+  faster than PyTorch with a small, bounded drift in the embeddings
+  (see benchmarks/onnx_parity.py).
+
+The ONNX export is done once per model and cached on disk: the transformer
+graph, its tokenizer and the pooling settings read from the
+sentence-transformers pipeline. Exporting needs torch and
+sentence-transformers; serving only needs onnxruntime and transformers'
+tokenizer.
+
+This module has no package-relative imports so it can be used both from
+the package and by the standalone `semantic_matcher`.
+"""
+
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ENCODER_BACKENDS = ("torch", "onnx")
+
+_META_FILE = "encoder_config.json"
+
+
+def encoder_id(model_name: str, backend: str = "torch", quantize: bool = True) -> str:
+    """
+    Identifier for the embedding space a backend produces. Caches keyed by it
+    never mix PyTorch and ONNX vectors.
+    """
+    if backend == "onnx":
+        return f"{model_name}+onnx-{'int8' if quantize else 'fp32'}"
+    return model_name
+
+
+class ONNXSentenceEncoder:
+    """
+    `SentenceTransformer.encode`-compatible encoder backed by onnxruntime.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        model_dir: str = "./onnx_models",
+        quantize: bool = True,
+        num_threads: int = 0,
+    ):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError("Please install onnxruntime: pip install onnxruntime")
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name
+        self.quantize = quantize
+        self.export_dir = os.path.join(model_dir, re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name))
+        model_path = os.path.join(self.export_dir, "model.int8.onnx" if quantize else "model.onnx")
+        if not os.path.exists(model_path):
+            export_onnx(model_name, self.export_dir, quantize=quantize)
+        self.model_path = model_path
+
+        with open(os.path.join(self.export_dir, _META_FILE), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        self.input_names: List[str] = meta["input_names"]
+        self.pooling: str = meta["pooling"]
+        self.normalize: bool = meta["normalize"]
+        self.max_seq_length: int = meta["max_seq_length"]
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.export_dir)
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        logger.info(f"Loaded ONNX encoder for {model_name} ({'int8' if quantize else 'fp32'})")
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return int(self.encode(["dimension probe"]).shape[1])
+
+    def encode(
+        self,
+        sentences: Sequence[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        **kwargs: Any,
+    ) -> np.ndarray:
+        """Encode texts into a (len(sentences), dim) float32 array."""
+        if isinstance(sentences, str):
+            sentences = [sentences]
+        sentences = list(sentences)
+        if not sentences:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        # Batch texts of similar length together to minimise padding
+        order = np.argsort([-len(s) for s in sentences], kind="stable")
+        out: List[Optional[np.ndarray]] = [None] * len(sentences)
+        for start in range(0, len(sentences), batch_size):
+            idx = order[start:start + batch_size]
+            batch = [sentences[i] for i in idx]
+            tokens = self.tokenizer(
+                batch, padding=True, truncation=True,
+                max_length=self.max_seq_length, return_tensors="np",
+            )
+            feeds = {name: tokens[name].astype(np.int64) for name in self.input_names}
+            hidden = self.session.run(None, feeds)[0]
+            pooled = self._pool(hidden, tokens["attention_mask"])
+            for i, vec in zip(idx, pooled):
+                out[i] = vec
+        return np.vstack(out).astype(np.float32)
+
+    def _pool(self, hidden: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        mask = attention_mask[:, :, None].astype(np.float32)
+        if self.pooling == "cls":
+            pooled = hidden[:, 0]
+        elif self.pooling == "max":
+            pooled = np.where(mask > 0, hidden, -1e9).max(axis=1)
+        else:
+            pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        if self.normalize:
+            pooled = pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return pooled
+
+
+def export_onnx(model_name: str, export_dir: str, quantize: bool = True, opset: int = 14) -> str:
+    """
+    Export a sentence-transformers model's transformer to ONNX (dynamic batch
+    and sequence axes), optionally with dynamic int8 weight quantization.
+    Returns the path of the model file to serve.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer, models
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    os.makedirs(export_dir, exist_ok=True)
+    st = SentenceTransformer(model_name, device="cpu")
+    transformer = st[0]
+    pooling = next((m for m in st if isinstance(m, models.Pooling)), None)
+    if pooling is not None and getattr(pooling, "pooling_mode_cls_token", False):
+        pooling_mode = "cls"
+    elif pooling is not None and getattr(pooling, "pooling_mode_max_tokens", False):
+        pooling_mode = "max"
+    else:
+        pooling_mode = "mean"
+
+    tokenizer = transformer.tokenizer
+    sample = tokenizer(["export sample text"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+
+    class _Encoder(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs)), return_dict=False)[0]
+
+    fp32_path = os.path.join(export_dir, "model.onnx")
+    axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    logger.info(f"Exporting {model_name} to ONNX at {fp32_path}")
+    with torch.no_grad():
+        torch.onnx.export(
+            _Encoder(transformer.auto_model.eval()),
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=axes,
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+
+    path = fp32_path
+    if quantize:
+        path = os.path.join(export_dir, "model.int8.onnx")
+        quantize_dynamic(fp32_path, path, weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(export_dir)
+    meta: Dict[str, Any] = {
+        "model_name": model_name,
+        "input_names": input_names,
+        "pooling": pooling_mode,
+        "normalize": any(isinstance(m, models.Normalize) for m in st),
+        "max_seq_length": int(st.max_seq_length or 512),
+    }
+    with open(os.path.join(export_dir, _META_FILE), "w", encoding="utf-8") as fh:
+        json.dump(meta, fh, indent=2)
+    return path
+
+
+def load_encoder(
+    model_name: str,
+    backend: str = "torch",
+    device: Optional[str] = None,
+    onnx_dir: str = "./onnx_models",
+    quantize: bool = True,
+    num_threads: int = 0,
+):
+    """Create the encoder for `backend` ('torch' or 'onnx'); both expose `.encode(texts, batch_size=...)`."""
+    if backend == "onnx":
+        return ONNXSentenceEncoder(model_name, model_dir=onnx_dir, quantize=quantize, num_threads=num_threads)
+    if backend != "torch":
+        raise ValueError(f"Unknown encoder backend: {backend!r} (expected one of {ENCODER_BACKENDS})")
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name, device=device or None)
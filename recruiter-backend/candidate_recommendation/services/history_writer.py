@@ -0,0 +1,252 @@
+"""
+Asynchronous, batched writer for job rows and recommendation history.
+
+Every search used to commit twice on the request path (insert the job if
+new, then the history row),
+so search latency depended on SQLite write locks. Searches now only put a
+`HistoryRecord` on a bounded in-process queue. A background task drains
+it and writes whole batches in a worker thread: one query for which jobs
+already exist, one executemany insert for the history rows, one commit.
+Job inserts ignore rows another worker inserted in the meantime, and a
+batch that still fails is retried record by record, so one bad record
+costs only itself.
+
+The queue is bounded: when it is full, `submit` waits for space instead
+of dropping records, so memory stays flat and writes are never lost
+under load. `stop` (called from the app lifespan) flushes everything
+still queued. Without a running writer (CLI, scripts) records are
+written immediately.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from ..config import config
+from ..database.connection import SessionLocal
+from ..database.history_codec import pack_match_dicts
+from ..database.models import JobDB, RecommendationHistoryDB
+from ..models.recommendation import CandidateMatch, JobDescription
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HistoryRecord:
+    """One search to persist: the job (inserted if new) and, optionally, its history row."""
+    job: JobDescription
+    search_query: Optional[Any] = None  # request model; None records the job only
+    matches: Optional[List[CandidateMatch]] = None
+    search_metadata: Optional[Dict[str, Any]] = None
+
+
+# CandidateMatch fields the packed results need (ids and score; summaries are not stored)
+_KEY_FIELDS = {"candidate_id", "filename", "name", "match_score"}
+
+
+def _job_row(job: JobDescription) -> Dict[str, Any]:
+    return {
+        "id": job.id,
+        "title": job.title,
+        "company": job.company,
+        "description": job.description,
+        "requirements": job.requirements,
+        "preferred_skills": job.preferred_skills,
+        "location": job.location,
+        "salary_range": job.salary_range,
+        "priority": job.priority.value,
+        "status": job.status.value,
+    }
+
+
+def _history_row(record: HistoryRecord) -> Dict[str, Any]:
+    matches = record.matches or []
+    return {
+        "id": str(uuid.uuid4()),
+        "job_id": record.job.id,
+        "search_query": record.search_query.dict(),
+        "results_blob": pack_match_dicts([m.dict(include=_KEY_FIELDS) for m in matches]),
+        "results_count": len(matches),
+        "total_candidates": len(matches),
+        "search_metadata": record.search_metadata or {},
+    }
+
+
+def _existing_job_ids(db, job_ids: List[str]) -> set:
+    return {row[0] for row in db.query(JobDB.id).filter(JobDB.id.in_(job_ids))}
+
+
+def _insert_jobs(db, rows: List[Dict[str, Any]]) -> None:
+    """Insert job rows, skipping ids that already exist (another worker may have just added them)."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        statement = sqlite.insert(JobDB.__table__).on_conflict_do_nothing()
+    elif dialect == "postgresql":
+        statement = postgresql.insert(JobDB.__table__).on_conflict_do_nothing()
+    else:
+        statement = JobDB.__table__.insert()
+    db.execute(statement, rows)
+
+
+def write_history(records: List[HistoryRecord]) -> None:
+    """Persist a batch of records in one transaction (blocking; runs in a worker thread)."""
+    jobs: Dict[str, JobDescription] = {}
+    for record in records:
+        jobs.setdefault(record.job.id, record.job)
+    history = [_history_row(r) for r in records if r.search_query is not None]
+
+    db = SessionLocal()
+    try:
+        existing = _existing_job_ids(db, list(jobs))
+        new_jobs = [_job_row(job) for job_id, job in jobs.items() if job_id not in existing]
+        if new_jobs:
+            _insert_jobs(db, new_jobs)
+        if history:
+            db.execute(RecommendationHistoryDB.__table__.insert(), history)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+class HistoryWriter:
+    """Bounded queue of HistoryRecord entries flushed in batches by a background task."""
+
+    def __init__(self, max_queue: int = 10000, batch_size: int = 200, flush_interval_ms: float = 200.0):
+        self.max_queue = max(1, int(max_queue))
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.0, float(flush_interval_ms)) / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Future] = None
+        self._gathering: List[HistoryRecord] = []  # taken off the queue, not yet being written
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self.blocked = 0
+        self.last_error: Optional[str] = None
+        self.last_flush_ms: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the flush loop on the running event loop."""
+        if not self.running:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop after writing everything still queued."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._inflight is not None:
+            # The batch being written when the loop was cancelled
+            await asyncio.wait([self._inflight])
+        pending, self._gathering = self._gathering, []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for start in range(0, len(pending), self.batch_size):
+            await self._flush(pending[start:start + self.batch_size])
+        if pending:
+            logger.info(f"Flushed {len(pending)} queued history records on shutdown")
+
+    async def submit(self, record: HistoryRecord) -> None:
+        """Queue a record; waits only when the queue is full. Writes inline if the writer is not running."""
+        if not self.running:
+            await self._flush([record])
+            return
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.blocked += 1
+            await self._queue.put(record)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = self._gathering = [await self._queue.get()]
+            # Gather more records for up to flush_interval, or until the batch is full
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    while len(batch) < self.batch_size and not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self._gathering = []
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[HistoryRecord]) -> None:
+        self._inflight = asyncio.ensure_future(asyncio.to_thread(self._write, batch))
+        # Shielded so a shutdown cancel does not abandon a batch mid-write (`stop` awaits it)
+        await asyncio.shield(self._inflight)
+
+    def _write(self, batch: List[HistoryRecord]) -> None:
+        started = time.perf_counter()
+        try:
+            write_history(batch)
+            written = len(batch)
+        except Exception as e:
+            logger.warning(f"History batch of {len(batch)} failed, retrying record by record: {e}")
+            written = sum(self._write_one(record) for record in batch)
+        self.written += written
+        self.batches += 1
+        self.last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    def _write_one(self, record: HistoryRecord) -> bool:
+        try:
+            write_history([record])
+            return True
+        except Exception as e:
+            self.failed += 1
+            self.last_error = str(e)
+            logger.error(f"Failed to write history record for job {record.job.id}: {e}")
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "written": self.written,
+            "batches": self.batches,
+            "failed": self.failed,
+            "blocked_submits": self.blocked,
+            "last_flush_ms": self.last_flush_ms,
+            "last_error": self.last_error,
+        }
+
+
+# Global writer instance
+_writer_instance = None
+
+
+def get_history_writer() -> HistoryWriter:
+    """Get singleton history writer."""
+    global _writer_instance
+    if _writer_instance is None:
+        _writer_instance = HistoryWriter(
+            max_queue=config.history_queue_size,
+            batch_size=config.history_batch_size,
+            flush_interval_ms=config.history_flush_ms,
+        )
+    return _writer_instance
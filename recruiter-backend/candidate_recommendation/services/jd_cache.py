@@ -0,0 +1,93 @@
+"""
+LRU cache of job-description encodings.
+
+Recruiters rerun the same job search many times while tweaking `top_n` or
+filters. The JD embedding and the skills extracted from the JD only
+depend on the model and the JD text, so they are cached here keyed by
+(model name, normalized JD text) and evicted least-recently-used.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+_WS_RE = re.compile(r"\s+")
+
+
+@dataclass
+class JobEncoding:
+    """Cached encoding of one job description."""
+    embedding: np.ndarray
+    skills: List[str]
+
+
+class JobEmbeddingCache:
+    """Bounded, thread-safe LRU cache of JobEncoding entries with hit/miss counters."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = max(0, int(maxsize))
+        self._entries: "OrderedDict[Tuple[str, str], JobEncoding]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Collapse whitespace so cosmetic edits to a JD reuse the cached encoding."""
+        return _WS_RE.sub(" ", text or "").strip()
+
+    def get(self, model_name: str, text: str) -> Optional[JobEncoding]:
+        key = (model_name, self.normalize(text))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, model_name: str, text: str, entry: JobEncoding) -> None:
+        if not self.maxsize:
+            return
+        key = (model_name, self.normalize(text))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(
+        self,
+        model_name: str,
+        text: str,
+        compute_fn: Callable[[str], JobEncoding],
+    ) -> Tuple[JobEncoding, bool]:
+        """
+        Cached encoding for `text`, computing it with `compute_fn(normalized_text)`
+        on a miss. Returns (entry, hit).
+        """
+        entry = self.get(model_name, text)
+        if entry is not None:
+            return entry, True
+        entry = compute_fn(self.normalize(text))
+        self.put(model_name, text, entry)
+        return entry, False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Cumulative hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
@@ -0,0 +1,193 @@
+"""
+BM25 lexical index used as a first retrieval stage.
+
+For large candidate pools most candidates share no vocabulary with a job
+description, yet exhaustive dense scoring still multiplies every one of
+them. `BM25Index` keeps an inverted index (term -> candidate rows and
+precomputed BM25 term weights) over the same candidate text that is
+embedded, so a search touches only the postings of the JD's terms. The
+top few thousand candidates by BM25 are then re-scored densely and
+blended as usual.
+
+Tokenization is injected rather than imported: callers pass the
+`_tokenize` / `_STOP` pair from `semantic_matcher` so both stages see the
+same terms.
+
+This module only depends on numpy so it can be imported both from the
+package and by the standalone `semantic_matcher`.
+"""
+
+import threading
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .scoring import top_k
+
+Tokenizer = Callable[[str], List[str]]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over one text per key.
+
+    Documents are updated in place by `sync`/`set`/`remove`; the packed
+    postings (sorted by term) are rebuilt lazily on the next search after a
+    change.
+    """
+
+    def __init__(
+        self,
+        tokenize: Tokenizer,
+        stopwords: Iterable[str] = (),
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.tokenize = tokenize
+        self.stopwords = frozenset(stopwords)
+        self.k1 = float(k1)
+        self.b = float(b)
+        self._lock = threading.RLock()
+        self._terms: Dict[str, int] = {}
+        self._keys: List[Hashable] = []
+        self._rows: Dict[Hashable, int] = {}
+        self._doc_terms: List[np.ndarray] = []
+        self._doc_tfs: List[np.ndarray] = []
+        self._sources: List[str] = []
+        self._postings: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._rows
+
+    def _analyze(self, text: str, intern: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """(distinct term ids, term frequencies) for `text`; unknown terms are dropped unless interned."""
+        ids: List[int] = []
+        for token in self.tokenize(text or ""):
+            if token in self.stopwords or token.isdigit():
+                continue
+            term = self._terms.get(token)
+            if term is None:
+                if not intern:
+                    continue
+                term = self._terms[token] = len(self._terms)
+            ids.append(term)
+        if not ids:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        terms, tfs = np.unique(np.asarray(ids, dtype=np.int32), return_counts=True)
+        return terms, tfs.astype(np.float32)
+
+    def set(self, key: Hashable, text: str) -> None:
+        """Insert or replace the text indexed for `key`."""
+        with self._lock:
+            terms, tfs = self._analyze(text, intern=True)
+            row = self._rows.get(key)
+            if row is None:
+                self._rows[key] = len(self._keys)
+                self._keys.append(key)
+                self._doc_terms.append(terms)
+                self._doc_tfs.append(tfs)
+                self._sources.append(text)
+            else:
+                self._doc_terms[row] = terms
+                self._doc_tfs[row] = tfs
+                self._sources[row] = text
+            self._postings = None
+
+    def sync(self, texts_by_key: Dict[Hashable, str]) -> int:
+        """
+        Make the index hold exactly `texts_by_key`. Keys whose text is
+        unchanged are not re-tokenized. Returns the number of documents that changed.
+        """
+        changed = 0
+        with self._lock:
+            for key, text in texts_by_key.items():
+                row = self._rows.get(key)
+                if row is None or self._sources[row] != text:
+                    self.set(key, text)
+                    changed += 1
+            departed = [key for key in self._keys if key not in texts_by_key]
+            if departed:
+                self.remove(departed)
+                changed += len(departed)
+        return changed
+
+    def remove(self, keys: Iterable[Hashable]) -> None:
+        with self._lock:
+            drop = {self._rows[k] for k in keys if k in self._rows}
+            if not drop:
+                return
+            keep = [r for r in range(len(self._keys)) if r not in drop]
+            self._keys = [self._keys[r] for r in keep]
+            self._doc_terms = [self._doc_terms[r] for r in keep]
+            self._doc_tfs = [self._doc_tfs[r] for r in keep]
+            self._sources = [self._sources[r] for r in keep]
+            self._rows = {k: r for r, k in enumerate(self._keys)}
+            self._postings = None
+
+    def _packed(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(term_ptr, posting_rows, posting_weights, idf), rebuilt after any change."""
+        with self._lock:
+            if self._postings is None:
+                n_docs = len(self._keys)
+                n_terms = len(self._terms)
+                lengths = np.fromiter((len(t) for t in self._doc_terms), dtype=np.int64, count=n_docs)
+                terms = np.concatenate(self._doc_terms) if n_docs else np.zeros(0, dtype=np.int32)
+                tfs = np.concatenate(self._doc_tfs) if n_docs else np.zeros(0, dtype=np.float32)
+                rows = np.repeat(np.arange(n_docs, dtype=np.int64), lengths)
+
+                # Document length normalisation folded into each posting's weight
+                doc_len = np.fromiter((t.sum() for t in self._doc_tfs), dtype=np.float32, count=n_docs)
+                avg_len = float(doc_len.mean()) if n_docs else 1.0
+                norm = self.k1 * (1.0 - self.b + self.b * doc_len / max(avg_len, 1e-9))
+                weights = tfs * (self.k1 + 1.0) / (tfs + norm[rows])
+
+                order = np.argsort(terms, kind="stable")
+                df = np.bincount(terms, minlength=n_terms)
+                term_ptr = np.zeros(n_terms + 1, dtype=np.int64)
+                np.cumsum(df, out=term_ptr[1:])
+                idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+                self._postings = (term_ptr, rows[order], weights[order].astype(np.float32), idf)
+            return self._postings
+
+    def scores(self, text: str) -> np.ndarray:
+        """BM25 score of every row for the query `text` (0 for rows sharing no term)."""
+        with self._lock:
+            term_ptr, rows, weights, idf = self._packed()
+            query_terms, _ = self._analyze(text, intern=False)
+            scores = np.zeros(len(self._keys), dtype=np.float32)
+            for term in query_terms:
+                start, stop = term_ptr[term], term_ptr[term + 1]
+                # Each row appears at most once per term, so plain fancy-index += is safe
+                scores[rows[start:stop]] += idf[term] * weights[start:stop]
+            return scores
+
+    def search(
+        self,
+        text: str,
+        k: int,
+        within: Optional[Iterable[Hashable]] = None,
+    ) -> Tuple[List[Hashable], np.ndarray]:
+        """
+        Keys and BM25 scores of the (at most) k best rows that share a term
+        with `text`, optionally only among the keys in `within`.
+        """
+        with self._lock:
+            scores = self.scores(text)
+            if within is not None:
+                allowed = np.zeros(len(scores), dtype=bool)
+                allowed[[self._rows[key] for key in within if key in self._rows]] = True
+                scores[~allowed] = 0.0
+            matched = np.flatnonzero(scores > 0)
+            order = matched[top_k(scores[matched], k)]
+            return [self._keys[i] for i in order], scores[order]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "documents": len(self._keys),
+                "terms": len(self._terms),
+                "postings": int(sum(len(t) for t in self._doc_terms)),
+            }
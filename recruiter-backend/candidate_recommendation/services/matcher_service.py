@@ -7,14 +7,24 @@ from ..models.recommendation import (
     RecommendationResponse, AdvancedRecommendationRequest, SearchFilters
 )
 from ..database.models import JobDB, CandidateDB, RecommendationHistoryDB
+from ..database.history_codec import pack_match_dicts
 from ..semantic_matcher import SemanticMatcher
+from ..config import config
 import os
 import json
 from datetime import datetime
 
 class CandidateMatcherService:
     def __init__(self, resume_data_path: Optional[str] = None):
-        self.matcher = SemanticMatcher()
+        # Same model settings as APICandidateMatcherService, so both share one registry encoder
+        self.matcher = SemanticMatcher(
+            device=config.device,
+            encoder_backend=config.encoder_backend,
+            onnx_dir=config.onnx_model_dir,
+            onnx_quantize=config.onnx_quantize,
+            corpus_cache_mb=config.corpus_cache_mb,
+            corpus_recheck_seconds=config.corpus_recheck_seconds,
+        )
         self.resume_data_path = resume_data_path or os.getenv(
             "RESUME_DATA_PATH", 
             "/Users/poshan/Documents/hacknation-2025-talentai-challenge-10/candidate-backend/resume_generator_parser/example_output/parsed"
@@ -69,7 +79,8 @@ class CandidateMatcherService:
         history = RecommendationHistoryDB(
             job_id=request.job.id,
             search_query=request.dict(),
-            results=[c.dict() for c in candidates],
+            results_blob=pack_match_dicts([c.dict() for c in candidates]),
+            results_count=len(candidates),
             total_candidates=len(candidates),
             search_metadata={
                 "matcher_model": self.matcher.model_name,
@@ -0,0 +1,79 @@
+"""
+Lightweight in-process latency metrics.
+
+Histograms use fixed millisecond buckets so snapshots are cheap to take and
+easy to compare across workers.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Dict, Any, List
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+DEFAULT_BUCKETS_MS: List[float] = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram with fixed bucket bounds."""
+
+    def __init__(self, buckets_ms: List[float] = None):
+        self.buckets_ms = list(buckets_ms or DEFAULT_BUCKETS_MS)
+        self._counts = [0] * (len(self.buckets_ms) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000.0
+        slot = len(self.buckets_ms)
+        for i, bound in enumerate(self.buckets_ms):
+            if ms <= bound:
+                slot = i
+                break
+        with self._lock:
+            self._counts[slot] += 1
+            self.count += 1
+            self.total_ms += ms
+            self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile (upper bound of the bucket containing it), in ms."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = q * self.count
+            seen = 0
+            for i, c in enumerate(self._counts):
+                seen += c
+                if seen >= target:
+                    return self.buckets_ms[i] if i < len(self.buckets_ms) else self.max_ms
+            return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            labels = [f"le_{int(b)}ms" for b in self.buckets_ms] + ["le_inf"]
+            counts = dict(zip(labels, self._counts))
+            count, total, peak = self.count, self.total_ms, self.max_ms
+        return {
+            "count": count,
+            "mean_ms": round(total / count, 2) if count else 0.0,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(peak, 2),
+            "buckets": counts,
+        }
+
+
+class LatencyRecorder:
+    """A set of latency histograms keyed by operation name."""
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+
+    def observe(self, name: str, seconds: float) -> None:
+        self._histograms[name].observe(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: hist.snapshot() for name, hist in sorted(self._histograms.items())}
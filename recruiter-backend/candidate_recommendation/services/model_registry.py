@@ -0,0 +1,188 @@
+"""
+Process-wide registry of sentence encoders.
+
+`SemanticMatcher` (used by the standalone API, the CLI and
+`CandidateMatcherService`) and `APICandidateMatcherService` each used to
+construct their own encoder, so a process that imported more than one of
+them held the same weights several times. They now all ask the registry,
+which loads each (model, backend, device) combination once and hands out
+the same `SharedEncoder`.
+
+`SharedEncoder.encode` is serialized with a lock: HuggingFace fast
+tokenizers and onnxruntime sessions are not safe to call from several
+threads at once, and callers already batch through their
+`EmbeddingExecutor`, so the lock costs little.
+
+Like `encoders`, this module only uses package-relative imports within
+`services`, so the standalone `semantic_matcher` can import it too.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .encoders import ONNXSentenceEncoder, load_encoder
+
+logger = logging.getLogger(__name__)
+
+# (model name, backend, device, quantized) identifying one loaded encoder
+ModelKey = Tuple[str, str, str, bool]
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident set size of this process (Linux), or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _weights_bytes(model: Any) -> Optional[int]:
+    """Bytes held by the encoder's weights: torch parameters and buffers, or the ONNX model file."""
+    if isinstance(model, ONNXSentenceEncoder):
+        return os.path.getsize(model.model_path) if os.path.exists(model.model_path) else None
+    parameters = getattr(model, "parameters", None)
+    if parameters is None:
+        return None
+    total = sum(p.numel() * p.element_size() for p in parameters())
+    total += sum(b.numel() * b.element_size() for b in model.buffers())
+    return int(total)
+
+
+class SharedEncoder:
+    """One loaded encoder, shared by every caller asking for the same key."""
+
+    def __init__(self, key: ModelKey, model: Any, load_seconds: float, rss_delta: Optional[int]):
+        self.key = key
+        self.model = model
+        self.load_seconds = load_seconds
+        self.rss_delta = rss_delta
+        self.weights_bytes = _weights_bytes(model)
+        self.encode_calls = 0
+        self.texts_encoded = 0
+        self._lock = threading.Lock()
+
+    @property
+    def model_name(self) -> str:
+        return self.key[0]
+
+    def encode(self, sentences: Sequence[str], **kwargs: Any) -> np.ndarray:
+        with self._lock:
+            self.encode_calls += 1
+            self.texts_encoded += 1 if isinstance(sentences, str) else len(sentences)
+            return self.model.encode(sentences, **kwargs)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        with self._lock:
+            return int(self.model.get_sentence_embedding_dimension())
+
+    def __getattr__(self, name: str) -> Any:
+        # Anything else (tokenizer, max_seq_length, ...) comes from the wrapped encoder
+        return getattr(self.model, name)
+
+    def stats(self) -> Dict[str, Any]:
+        model_name, backend, device, quantize = self.key
+        return {
+            "model": model_name,
+            "backend": backend,
+            "device": device,
+            "quantized": quantize if backend == "onnx" else None,
+            "weights_mb": round(self.weights_bytes / 2**20, 1) if self.weights_bytes is not None else None,
+            "rss_delta_mb": round(self.rss_delta / 2**20, 1) if self.rss_delta is not None else None,
+            "load_seconds": self.load_seconds,
+            "encode_calls": self.encode_calls,
+            "texts_encoded": self.texts_encoded,
+        }
+
+
+class ModelRegistry:
+    """Thread-safe map of ModelKey -> SharedEncoder; each key is loaded at most once."""
+
+    def __init__(self):
+        self._models: Dict[ModelKey, SharedEncoder] = {}
+        self._loading: Dict[ModelKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model_name: str, backend: str = "torch", device: Optional[str] = None, quantize: bool = True) -> ModelKey:
+        # ONNX sessions always run on CPU; device only distinguishes torch models
+        return (model_name, backend, "cpu" if backend == "onnx" else (device or "auto"), bool(quantize))
+
+    def get(
+        self,
+        model_name: str,
+        backend: str = "torch",
+        device: Optional[str] = None,
+        onnx_dir: str = "./onnx_models",
+        quantize: bool = True,
+        num_threads: int = 0,
+    ) -> SharedEncoder:
+        """The shared encoder for these settings, loading it on first request."""
+        key = self.key(model_name, backend, device, quantize)
+        shared = self._models.get(key)
+        if shared is not None:
+            return shared
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        # Per-key lock: concurrent requests for one model wait for a single load,
+        # while different models can load in parallel
+        with key_lock:
+            shared = self._models.get(key)
+            if shared is None:
+                rss_before = _rss_bytes()
+                started = time.perf_counter()
+                model = load_encoder(
+                    model_name, backend=backend, device=device,
+                    onnx_dir=onnx_dir, quantize=quantize, num_threads=num_threads,
+                )
+                rss_after = _rss_bytes()
+                shared = SharedEncoder(
+                    key, model,
+                    load_seconds=round(time.perf_counter() - started, 2),
+                    rss_delta=rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+                )
+                with self._lock:
+                    self._models[key] = shared
+                logger.info(f"Loaded encoder {model_name} ({backend}, {key[2]}) in {shared.load_seconds}s")
+        return shared
+
+    def preload(self, model_names: Iterable[str], **settings: Any) -> List[SharedEncoder]:
+        """Load several models up front with the same settings; failures are logged, not raised."""
+        loaded = []
+        for name in model_names:
+            try:
+                loaded.append(self.get(name, **settings))
+            except Exception as e:
+                logger.error(f"Could not preload encoder {name}: {e}")
+        return loaded
+
+    def loaded(self) -> List[SharedEncoder]:
+        with self._lock:
+            return list(self._models.values())
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Per-model weight sizes and load-time RSS growth, plus the process RSS."""
+        models = [shared.stats() for shared in self.loaded()]
+        rss = _rss_bytes()
+        return {
+            "models": models,
+            "total_weights_mb": round(sum(m["weights_mb"] or 0.0 for m in models), 1),
+            "process_rss_mb": round(rss / 2**20, 1) if rss is not None else None,
+        }
+
+
+# Global registry instance
+_registry_instance = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get the singleton model registry."""
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = ModelRegistry()
+    return _registry_instance
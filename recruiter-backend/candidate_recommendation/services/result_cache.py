@@ -0,0 +1,141 @@
+"""
+Search result cache with request coalescing.
+
+Results are keyed by (job content hash, scoring parameters, candidate
+corpus version). The corpus version changes whenever the candidate pool
+does, so entries never need explicit invalidation: a new pool simply
+produces new keys and old entries age out of the LRU.
+
+Concurrent identical searches are coalesced ("single flight"): the first
+request starts the computation as a task of its own and every caller,
+including the first, awaits it. A caller that is cancelled (e.g. a client
+disconnect) only stops waiting; the computation is cancelled once nobody
+is waiting for it any more.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Outcome labels reported by `get_or_compute`
+HIT = "hit"
+MISS = "miss"
+COALESCED = "coalesced"
+
+
+def content_hash(*parts: Any) -> str:
+    """Stable SHA-256 over JSON-serializable parts (dict keys sorted)."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _Flight:
+    """One in-flight computation and the number of callers awaiting it."""
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SearchResultCache:
+    """LRU cache of search results plus an in-flight table for coalescing."""
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = max(0, int(maxsize))
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        cacheable: bool = True,
+    ) -> Tuple[Any, str]:
+        """
+        Return (value, outcome) where outcome is "hit", "coalesced" or "miss".
+
+        With cacheable=False the result is not stored (e.g. when the corpus
+        version is unknown) but concurrent identical calls are still coalesced.
+        """
+        if cacheable:
+            value = self.get(key)
+            if value is not None:
+                with self._lock:
+                    self.hits += 1
+                return value, HIT
+
+        flight = self._inflight.get(key)
+        if flight is not None:
+            outcome = COALESCED
+            with self._lock:
+                self.coalesced += 1
+        else:
+            outcome = MISS
+            with self._lock:
+                self.misses += 1
+            flight = _Flight(asyncio.get_running_loop().create_task(self._compute(key, compute, cacheable)))
+            self._inflight[key] = flight
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), outcome
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # Every caller gave up: stop computing, and let the next call start afresh
+                flight.task.cancel()
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+
+    async def _compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]], cacheable: bool) -> Any:
+        try:
+            value = await compute()
+        finally:
+            flight = self._inflight.get(key)
+            if flight is not None and flight.task is asyncio.current_task():
+                del self._inflight[key]
+        if cacheable:
+            self.put(key, value)
+        return value
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "in_flight": len(self._inflight),
+            }
@@ -0,0 +1,128 @@
+"""
+Server-side ranked result sets for cursor pagination.
+
+A search ranks candidates deeper than the page it returns and keeps the
+ranked ids, their final scores and the candidate profiles here under a
+result-set id. `/api/recommendations/results/{id}?cursor=` then serves
+later pages by slicing that list, so paging never re-scores and pages
+can neither overlap nor skip candidates.
+
+A result set is only valid for the corpus version it was ranked
+against: callers compare `corpus_version` and treat a mismatch as
+expired. Sets expire `ttl_seconds` after they were last read (each page
+restarts the clock) and are evicted least-recently-used beyond `maxsize`.
+
+The store lives in the memory of one process. With several uvicorn
+workers, a cursor only resolves on the worker that ran the search, so
+deployments must either route each client to one worker (sticky
+sessions) or run a single worker per instance; elsewhere the page
+request gets a 404, as if the set had expired.
+"""
+
+import base64
+import binascii
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+def encode_cursor(offset: int) -> str:
+    """Opaque cursor for the page starting at `offset`."""
+    return base64.urlsafe_b64encode(f"o:{offset}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Offset encoded by `encode_cursor`; raises ValueError for malformed cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    prefix, _, offset = raw.partition(":")
+    if prefix != "o" or not offset.isdigit():
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return int(offset)
+
+
+@dataclass
+class ResultSet:
+    """Ranked candidates of one search, frozen at the corpus version it was ranked against."""
+    id: str
+    job_id: str
+    corpus_version: Optional[str]
+    ranked_ids: List[str]
+    scores: np.ndarray
+    candidates: Dict[str, Any]  # candidate id -> profile, for the ranked ids only
+    page_size: int
+    include_summary: bool
+    expires_at: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.ranked_ids)
+
+    def next_cursor(self, offset: int) -> Optional[str]:
+        """Cursor for the page at `offset`, or None past the end of the ranking."""
+        return encode_cursor(offset) if offset < len(self.ranked_ids) else None
+
+
+class ResultSetStore:
+    """Bounded, thread-safe store of ResultSet entries with a time-to-live."""
+
+    def __init__(self, ttl_seconds: float = 900.0, maxsize: int = 1024):
+        self.ttl_seconds = float(ttl_seconds)
+        self.maxsize = max(0, int(maxsize))
+        self._entries: "OrderedDict[str, ResultSet]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.expired = 0
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    def put(self, result_set: ResultSet) -> ResultSet:
+        """Store a result set and start its TTL."""
+        if not self.maxsize:
+            return result_set
+        result_set.expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[result_set.id] = result_set
+            self._entries.move_to_end(result_set.id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result_set
+
+    def get(self, result_set_id: str) -> Optional[ResultSet]:
+        """The live result set for an id (restarting its TTL), or None if unknown or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(result_set_id)
+            if entry is None:
+                return None
+            if entry.expires_at <= now:
+                del self._entries[result_set_id]
+                self.expired += 1
+                return None
+            entry.expires_at = now + self.ttl_seconds
+            self._entries.move_to_end(result_set_id)
+            return entry
+
+    def discard(self, result_set_id: str) -> None:
+        with self._lock:
+            self._entries.pop(result_set_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+                "expired": self.expired,
+            }
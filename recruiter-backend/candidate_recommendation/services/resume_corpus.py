@@ -0,0 +1,105 @@
+"""
+Memory-mapped reader for JSONL resume corpora.
+
+The resume pipelines (`resume_generator_parser/resume_corpus.py`) stream
+parsed resumes into an append-only corpus instead of one JSON file each:
+
+    corpus.jsonl      one compact JSON record per line
+    corpus.jsonl.idx  little-endian uint64 byte offset of each line
+
+`JsonlCorpus` maps both files read-only, so opening a 100k-resume corpus
+costs two mmaps rather than 100k open/read/parse calls, and records are
+decoded one at a time straight from the page cache. Lines past the end of
+the index (written after it, or by a writer that crashed between the two
+files) are found by scanning for newlines; a trailing partial line is
+ignored.
+
+Like the other standalone-safe modules in `services`, this only depends
+on the standard library and numpy.
+"""
+
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+import numpy as np
+
+CORPUS_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".idx"
+
+
+def is_corpus_file(path: Union[str, Path]) -> bool:
+    return str(path).endswith(CORPUS_SUFFIX)
+
+
+class JsonlCorpus:
+    """Random and sequential access to the records of one JSONL corpus."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._fh = open(self.path, "rb")
+        size = os.fstat(self._fh.fileno()).st_size
+        self._data: Optional[mmap.mmap] = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.size = size
+        self.offsets = self._load_offsets()
+
+    def _load_offsets(self) -> np.ndarray:
+        index = Path(str(self.path) + INDEX_SUFFIX)
+        offsets = np.zeros(0, dtype="<u8")
+        if index.exists() and index.stat().st_size >= 8:
+            offsets = np.memmap(index, dtype="<u8", mode="r", shape=(index.stat().st_size // 8,))
+            # Offsets are ascending; any beyond the data (index ahead of a truncated file) are unusable
+            offsets = offsets[:int(np.searchsorted(offsets, self.size))]
+        # Lines appended after the last indexed one
+        start = self._line_end(int(offsets[-1])) if len(offsets) else 0
+        tail = []
+        while start < self.size:
+            end = self._data.find(b"\n", start)
+            if end < 0:
+                break  # partial line from an interrupted write
+            tail.append(start)
+            start = end + 1
+        if tail:
+            offsets = np.concatenate([np.asarray(offsets, dtype="<u8"), np.asarray(tail, dtype="<u8")])
+        if len(offsets) and self._data.find(b"\n", int(offsets[-1])) < 0:
+            offsets = offsets[:-1]
+        return offsets
+
+    def _line_end(self, start: int) -> int:
+        """Offset just past the newline ending the line at `start` (or the file size)."""
+        end = self._data.find(b"\n", start)
+        return self.size if end < 0 else end + 1
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def line(self, i: int) -> bytes:
+        """Raw bytes of line i, including its newline."""
+        start = int(self.offsets[i])
+        end = int(self.offsets[i + 1]) if i + 1 < len(self.offsets) else self._line_end(start)
+        return self._data[start:end]
+
+    def record(self, i: int) -> Dict[str, Any]:
+        return json.loads(self.line(i))
+
+    def records(self, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """Records of lines `start` onwards, in write order (blank lines are skipped)."""
+        for i in range(start, len(self.offsets)):
+            line = self.line(i)
+            if line.strip():
+                yield json.loads(line)
+
+    def close(self) -> None:
+        self.offsets = np.zeros(0, dtype="<u8")
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        self._fh.close()
+
+    def __enter__(self) -> "JsonlCorpus":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
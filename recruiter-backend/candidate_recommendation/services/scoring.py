@@ -0,0 +1,109 @@
+"""
+Vectorized scoring kernel shared by the matchers.
+
+Both matchers rank candidates with the same blend:
+
+    final = (1 - alpha) * semantic + alpha * skills_jaccard + title_weight * title_alignment
+
+The kernel takes per-candidate feature arrays (semantic similarity, skill
+overlap and skill-set size, title-token overlap) and computes the blend for
+the whole pool in one numpy pass, then selects the top k with
+`argpartition` instead of sorting every candidate. The same functions
+accept (jobs, candidates) matrices to rank many jobs at once.
+
+This module only depends on numpy so it can be imported both from the
+package and by the standalone `semantic_matcher`.
+"""
+
+from typing import Tuple, Union
+
+import numpy as np
+
+Count = Union[int, np.ndarray]
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, in descending score order."""
+    if k <= 0 or scores.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < scores.size:
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(scores.size)
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> np.ndarray:
+    """Per-row indices of the k largest scores of a 2-D array, in descending order."""
+    n = scores.shape[1]
+    k = min(k, n)
+    if k <= 0:
+        return np.zeros((scores.shape[0], 0), dtype=np.int64)
+    if k < n:
+        idx = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        idx = np.broadcast_to(np.arange(n), scores.shape).copy()
+    order = np.argsort(-np.take_along_axis(scores, idx, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1)
+
+
+def blend_scores(
+    semantic: np.ndarray,
+    skill_overlap: np.ndarray,
+    skill_counts: np.ndarray,
+    jd_skill_count: Count,
+    title_overlap: np.ndarray,
+    jd_title_count: Count,
+    blend_alpha: float,
+    title_weight: float,
+) -> np.ndarray:
+    """
+    Blended match score for every candidate.
+
+    - skills: Jaccard similarity |A & B| / |A | B|, computed from the overlap
+      with the JD skill set and the candidate's skill-set size.
+    - title: title-token overlap normalised by max(3, JD title length).
+
+    For several jobs pass (jobs, candidates) feature matrices and per-job
+    counts shaped (jobs, 1); `skill_counts` broadcasts across jobs.
+    """
+    semantic = np.asarray(semantic, dtype=np.float32)
+    overlap = np.asarray(skill_overlap, dtype=np.float32)
+
+    # union = |A| + |B| - |A & B|; an empty union scores 0
+    union = np.asarray(skill_counts, dtype=np.float32) + np.asarray(jd_skill_count, dtype=np.float32)
+    union -= overlap
+    np.maximum(union, 1.0, out=union)
+
+    final = semantic * np.float32(1.0 - blend_alpha)
+    final += np.float32(blend_alpha) * (overlap / union)
+    if title_weight:
+        title_scale = np.float32(title_weight) / np.maximum(np.asarray(jd_title_count, dtype=np.float32), 3.0)
+        final += np.asarray(title_overlap, dtype=np.float32) * title_scale
+    return final
+
+
+def rank_candidates(
+    semantic: np.ndarray,
+    skill_overlap: np.ndarray,
+    skill_counts: np.ndarray,
+    jd_skill_count: Count,
+    title_overlap: np.ndarray,
+    jd_title_count: Count,
+    blend_alpha: float,
+    title_weight: float,
+    k: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Blend the features and return (top-k indices, their scores) in descending
+    order; per row when the features are (jobs, candidates) matrices.
+    """
+    final = blend_scores(
+        semantic, skill_overlap, skill_counts, jd_skill_count,
+        title_overlap, jd_title_count, blend_alpha, title_weight,
+    )
+    if final.ndim == 2:
+        order = top_k_rows(final, k)
+        return order, np.take_along_axis(final, order, axis=1)
+    order = top_k(final, k)
+    return order, final[order]
@@ -0,0 +1,263 @@
+"""
+Interned skill vocabulary and sparse candidate skill sets.
+
+Every normalized skill string is interned once to an integer id in a
+process-wide `SkillVocabulary`. A `SkillMatrix` stores each candidate's
+skills as one row of a CSR matrix over that vocabulary (`indptr`/`indices`
+arrays), so per-request skill work is a few numpy operations over the
+whole pool instead of building Python sets per candidate:
+
+- overlap with a query skill set (Jaccard numerator), with or without
+  counting repeated query skills (boost/penalty counts)
+- skill-set sizes (Jaccard denominator)
+- "has every required skill" masks
+
+This module only depends on numpy so it can be imported both from the
+package and by the standalone `semantic_matcher`.
+"""
+
+import re
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_skill(skill: str) -> str:
+    """Canonical form used as the vocabulary key: lowercase, single-spaced, stripped."""
+    if not skill:
+        return ""
+    return _WS_RE.sub(" ", str(skill).lower()).strip()
+
+
+def flatten_skills(skills: Any) -> List[str]:
+    """Skill strings from a `{category: [skills]}` dict or a plain list."""
+    if isinstance(skills, dict):
+        out: List[str] = []
+        for arr in skills.values():
+            if isinstance(arr, list):
+                out.extend(arr)
+        return out
+    if isinstance(skills, list):
+        return list(skills)
+    return []
+
+
+class SkillVocabulary:
+    """Thread-safe mapping between normalized skill strings and integer ids."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._skills: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def skill(self, skill_id: int) -> str:
+        return self._skills[skill_id]
+
+    def intern_many(self, skills: Iterable[str]) -> np.ndarray:
+        """Distinct ids for `skills` (in first-seen order), adding unknown skills."""
+        ids: Dict[int, None] = {}
+        with self._lock:
+            for s in skills:
+                key = normalize_skill(s)
+                if not key:
+                    continue
+                sid = self._ids.get(key)
+                if sid is None:
+                    sid = len(self._skills)
+                    self._ids[key] = sid
+                    self._skills.append(key)
+                ids[sid] = None
+        return np.fromiter(ids, dtype=np.int32, count=len(ids))
+
+    def lookup_many(self, skills: Iterable[str]) -> Tuple[np.ndarray, int]:
+        """
+        Ids of known skills, keeping repeats, without growing the vocabulary.
+        Also returns how many non-empty skills were not in the vocabulary.
+        """
+        ids: List[int] = []
+        unknown = 0
+        for s in skills:
+            key = normalize_skill(s)
+            if not key:
+                continue
+            sid = self._ids.get(key)
+            if sid is None:
+                unknown += 1
+            else:
+                ids.append(sid)
+        return np.asarray(ids, dtype=np.int32), unknown
+
+
+class SkillMatrix:
+    """
+    Candidate skill sets addressed by key, stored as CSR rows over a vocabulary.
+
+    Rows are updated in place by `sync`/`set`/`remove`; the packed CSR arrays
+    are rebuilt lazily on the next query after a change.
+    """
+
+    def __init__(self, vocab: Optional["SkillVocabulary"] = None):
+        self.vocab = vocab or get_skill_vocabulary()
+        self._lock = threading.RLock()
+        self._keys: List[Hashable] = []
+        self._rows: Dict[Hashable, int] = {}
+        self._row_ids: List[np.ndarray] = []
+        self._sources: List[Any] = []
+        self._csr: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    @classmethod
+    def from_lists(cls, skill_lists: Sequence[Iterable[str]], vocab: Optional["SkillVocabulary"] = None) -> "SkillMatrix":
+        """Matrix whose row i holds skill_lists[i] (keys are the positions)."""
+        matrix = cls(vocab)
+        for i, skills in enumerate(skill_lists):
+            matrix.set(i, skills)
+        return matrix
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._rows
+
+    def set(self, key: Hashable, skills: Iterable[str], source: Any = None) -> None:
+        """Insert or replace the skills stored for `key`."""
+        ids = self.vocab.intern_many(skills)
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                self._rows[key] = len(self._keys)
+                self._keys.append(key)
+                self._row_ids.append(ids)
+                self._sources.append(source)
+            else:
+                self._row_ids[row] = ids
+                self._sources[row] = source
+            self._csr = None
+
+    def sync(
+        self,
+        skills_by_key: Dict[Hashable, Any],
+        extract: Callable[[Any], Iterable[str]] = flatten_skills,
+    ) -> int:
+        """
+        Make the matrix hold exactly `skills_by_key`, turning each value into
+        skill strings with `extract`. Rows whose value is the very same object
+        as last time are not re-extracted. Returns the number of rows that changed.
+        """
+        changed = 0
+        with self._lock:
+            for key, skills in skills_by_key.items():
+                row = self._rows.get(key)
+                if row is None or self._sources[row] is not skills:
+                    self.set(key, extract(skills), source=skills)
+                    changed += 1
+            departed = [key for key in self._keys if key not in skills_by_key]
+            if departed:
+                self.remove(departed)
+                changed += len(departed)
+        return changed
+
+    def remove(self, keys: Iterable[Hashable]) -> None:
+        with self._lock:
+            drop = {self._rows[k] for k in keys if k in self._rows}
+            if not drop:
+                return
+            keep = [r for r in range(len(self._keys)) if r not in drop]
+            self._keys = [self._keys[r] for r in keep]
+            self._row_ids = [self._row_ids[r] for r in keep]
+            self._sources = [self._sources[r] for r in keep]
+            self._rows = {k: r for r, k in enumerate(self._keys)}
+            self._csr = None
+
+    def rows(self, keys: Iterable[Hashable]) -> np.ndarray:
+        """Row numbers for `keys`; -1 for keys that are not in the matrix."""
+        get = self._rows.get
+        return np.fromiter((get(k, -1) for k in keys), dtype=np.int64)
+
+    @staticmethod
+    def take(values: np.ndarray, rows: np.ndarray, fill: Any = 0) -> np.ndarray:
+        """`values[rows]`, with `fill` where the row is -1 (key not in the matrix)."""
+        out = np.full(len(rows), fill, dtype=values.dtype)
+        known = rows >= 0
+        out[known] = values[rows[known]]
+        return out
+
+    def skills(self, key: Hashable) -> List[str]:
+        """Normalized skills stored for `key`, in first-seen order."""
+        row = self._rows.get(key)
+        if row is None:
+            return []
+        return [self.vocab.skill(int(i)) for i in self._row_ids[row]]
+
+    def _packed(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(indptr, indices, row_of_nnz), rebuilt after any change."""
+        with self._lock:
+            if self._csr is None:
+                counts = np.fromiter((len(r) for r in self._row_ids), dtype=np.int64, count=len(self._row_ids))
+                indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+                np.cumsum(counts, out=indptr[1:])
+                indices = np.concatenate(self._row_ids) if self._row_ids else np.zeros(0, dtype=np.int32)
+                row_of = np.repeat(np.arange(len(counts)), counts)
+                self._csr = (indptr, indices, row_of)
+            return self._csr
+
+    def counts(self) -> np.ndarray:
+        """Number of distinct skills per row."""
+        return np.diff(self._packed()[0]).astype(np.float32)
+
+    def overlap(self, skills: Iterable[str], distinct: bool = True) -> np.ndarray:
+        """
+        Per-row number of query skills the row contains. With distinct=True
+        this is |row & query|; with distinct=False a skill repeated in the
+        query counts once per repeat.
+        """
+        indptr, indices, row_of = self._packed()
+        n = len(indptr) - 1
+        query, _ = self.vocab.lookup_many(skills)
+        if n == 0 or query.size == 0:
+            return np.zeros(n, dtype=np.float32)
+        if distinct:
+            query = np.unique(query)
+        weights = np.bincount(query, minlength=len(self.vocab)).astype(np.float32)
+        # Rows may hold ids interned after `weights` was sized
+        hit = np.zeros(indices.size, dtype=np.float32)
+        known = indices < weights.size
+        hit[known] = weights[indices[known]]
+        return np.bincount(row_of, weights=hit, minlength=n).astype(np.float32)
+
+    def overlap_many(self, queries: Sequence[Iterable[str]], distinct: bool = True) -> np.ndarray:
+        """`overlap` for several queries at once, as a (len(queries), rows) matrix."""
+        with self._lock:
+            n = len(self._keys)
+            out = np.zeros((len(queries), n), dtype=np.float32)
+            for i, skills in enumerate(queries):
+                out[i] = self.overlap(skills, distinct=distinct)
+        return out
+
+    def contains_all(self, skills: Iterable[str]) -> np.ndarray:
+        """Boolean mask of rows that contain every skill in `skills`."""
+        skills = [s for s in skills if normalize_skill(s)]
+        n = len(self._keys)
+        if not skills:
+            return np.ones(n, dtype=bool)
+        required, unknown = self.vocab.lookup_many(skills)
+        if unknown:
+            return np.zeros(n, dtype=bool)
+        return self.overlap(skills) >= np.unique(required).size
+
+
+# Global vocabulary instance
+_vocab_instance = None
+
+def get_skill_vocabulary() -> SkillVocabulary:
+    """Get the process-wide skill vocabulary."""
+    global _vocab_instance
+    if _vocab_instance is None:
+        _vocab_instance = SkillVocabulary()
+    return _vocab_instance
@@ -0,0 +1,522 @@
+"""
+Vector index subsystem for candidate retrieval.
+
+Two backends share one interface:
+- FlatIndex: exact cosine search over every stored vector.
+- IVFIndex: inverted-file ANN index. Vectors are clustered with spherical
+  k-means and a query only scores the vectors in its `nprobe` closest lists.
+
+Both support top-k queries, add/remove by candidate id, and snapshots so a
+restarted worker can load the index instead of re-embedding the candidate
+pool.
+
+Vectors can be stored as float32, float16 or int8 (symmetric, one float32
+scale per row). A snapshot is a contiguous `.npy` matrix in the storage
+dtype plus a sidecar `.npz` holding the id map, versions and backend state.
+`load_index` memory-maps the matrix read-only, so every worker process on a
+host shares one copy through the page cache, and scoring reads the mapping
+in fixed-size row blocks: per-worker memory stays flat as the pool grows.
+Mutating a mapped index detaches it into private memory until it is saved
+and re-loaded. Workers that reach the same contents publish one snapshot:
+the first to take the snapshot lock writes it, the others find it already
+published and map that file instead of writing their own.
+"""
+
+import glob
+import logging
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; snapshot writes are then unsynchronized
+    fcntl = None
+
+from .scoring import top_k as _top_k
+
+logger = logging.getLogger(__name__)
+
+
+STORAGE_DTYPES = ("float32", "float16", "int8")
+
+# Rows decoded per block when scoring a float16/int8 matrix (~3 MB of
+# float32 scratch at 768 dimensions, small enough to stay in cache)
+_SCORE_BLOCK_ROWS = 1024
+
+Rows = Union[slice, int, np.ndarray]
+
+_VECTORS_SUFFIX = ".vectors.npy"
+
+
+@contextmanager
+def _snapshot_lock(path: str, exclusive: bool) -> Iterator[None]:
+    """
+    Advisory lock on `<path>.lock`, shared by every process using the
+    snapshot: writers hold it exclusively while they write, swap and clean
+    up, readers hold it shared between reading the sidecar and mapping the
+    matrix it names.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", "a+b") as fh:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    return vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-9)
+
+
+def _quantize(vectors: np.ndarray, storage: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Convert float32 rows to the storage dtype; int8 also returns per-row scales."""
+    if storage == "float32":
+        return vectors, None
+    if storage == "float16":
+        return vectors.astype(np.float16), None
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class VectorIndex:
+    """
+    Base class holding normalized vectors addressed by candidate id.
+
+    Each id may carry a `version` string (e.g. a hash of the text that was
+    embedded) so callers can tell which entries are stale.
+    """
+
+    backend = "base"
+    exact = True
+
+    def __init__(self, dim: Optional[int] = None, storage: str = "float32"):
+        if storage not in STORAGE_DTYPES:
+            raise ValueError(f"Unknown vector storage: {storage!r} (expected one of {STORAGE_DTYPES})")
+        self.dim = dim
+        self.storage = storage
+        self._lock = threading.RLock()
+        self._vectors = np.zeros((0, dim or 0), dtype=storage)
+        self._scales: Optional[np.ndarray] = np.zeros(0, dtype=np.float32) if storage == "int8" else None
+        self._ids: List[str] = []
+        self._versions: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self._rows
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    @property
+    def mapped(self) -> bool:
+        """True while the vectors are served from a read-only file mapping."""
+        return not self._vectors.flags.writeable
+
+    def memory_stats(self) -> Dict[str, object]:
+        """Storage dtype, matrix size and whether it is shared through a file mapping."""
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "storage": self.storage,
+                "vectors": len(self._ids),
+                "dim": self.dim,
+                "matrix_bytes": int(self._vectors.nbytes),
+                "mapped": self.mapped,
+            }
+
+    def version_of(self, candidate_id: str) -> Optional[str]:
+        row = self._rows.get(candidate_id)
+        return self._versions[row] if row is not None else None
+
+    def same_entries(self, other: "VectorIndex") -> bool:
+        """True if `other` holds the same candidates at the same versions, in the same backend and storage."""
+        return (
+            (self.backend, self.storage) == (other.backend, other.storage)
+            and dict(zip(self._ids, self._versions)) == dict(zip(other._ids, other._versions))
+        )
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray, versions: Optional[Sequence[str]] = None) -> None:
+        """Insert vectors, replacing any existing entry with the same id."""
+        if len(ids) == 0:
+            return
+        vectors = _normalize(vectors)
+        if len(ids) != vectors.shape[0]:
+            raise ValueError("ids and vectors must have the same length")
+        versions = list(versions) if versions is not None else [""] * len(ids)
+
+        codes, scales = _quantize(vectors, self.storage)
+
+        with self._lock:
+            if self.dim is None or len(self._ids) == 0:
+                self.dim = vectors.shape[1]
+                self._vectors = np.zeros((0, self.dim), dtype=self.storage)
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}")
+
+            new_rows = []
+            new_ids = []
+            for i, cid in enumerate(ids):
+                row = self._rows.get(cid)
+                if row is not None:
+                    self._detach()
+                    self._vectors[row] = codes[i]
+                    if scales is not None:
+                        self._scales[row] = scales[i]
+                    self._versions[row] = versions[i]
+                    self._on_update(row)
+                else:
+                    self._rows[cid] = len(self._ids) + len(new_ids)
+                    new_ids.append(cid)
+                    new_rows.append(i)
+
+            if new_ids:
+                start = len(self._ids)
+                self._vectors = np.asarray(np.vstack([self._vectors, codes[new_rows]]))
+                if scales is not None:
+                    self._scales = np.concatenate([self._scales, scales[new_rows]])
+                self._ids.extend(new_ids)
+                self._versions.extend(versions[i] for i in new_rows)
+                self._on_append(start)
+
+    def remove(self, ids: Sequence[str]) -> None:
+        """Remove entries by id; unknown ids are ignored."""
+        with self._lock:
+            drop = {self._rows[cid] for cid in ids if cid in self._rows}
+            if not drop:
+                return
+            keep = np.array([r for r in range(len(self._ids)) if r not in drop], dtype=np.int64)
+            self._vectors = np.asarray(self._vectors[keep])
+            if self._scales is not None:
+                self._scales = self._scales[keep]
+            self._ids = [self._ids[r] for r in keep]
+            self._versions = [self._versions[r] for r in keep]
+            self._rows = {cid: r for r, cid in enumerate(self._ids)}
+            self._on_compact(keep)
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[List[str], np.ndarray]:
+        """Return the ids and cosine similarities of the top-k vectors for `query`."""
+        with self._lock:
+            if not self._ids:
+                return [], np.zeros(0, dtype=np.float32)
+            q = _normalize(query)[0]
+            rows = self._candidate_rows(q)
+            if rows is None:
+                # Whole index: score in place rather than gathering a copy of every row
+                scores = self._score(q[None, :])[0]
+                order = _top_k(scores, k)
+                return [self._ids[i] for i in order], scores[order]
+            scores = self._decode(rows) @ q
+            order = _top_k(scores, k)
+            return [self._ids[rows[i]] for i in order], scores[order]
+
+    def score_ids(self, query: np.ndarray, ids: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+        """
+        Exact cosine similarity of `query` with the vectors stored for `ids`
+        (e.g. a lexical shortlist), as (ids in row order, scores). Unknown ids are skipped.
+        """
+        with self._lock:
+            rows = np.sort(np.fromiter((self._rows[cid] for cid in ids if cid in self._rows), dtype=np.int64))
+            if rows.size == 0:
+                return [], np.zeros(0, dtype=np.float32)
+            q = _normalize(query)[0]
+            return [self._ids[r] for r in rows], self._decode(rows) @ q
+
+    def score_all(self, queries: np.ndarray) -> Tuple[List[str], np.ndarray]:
+        """
+        Exact cosine similarity of every query against every stored vector,
+        as (ids, (num_queries, len(index)) matrix) from a single matrix multiply.
+        """
+        with self._lock:
+            q = _normalize(queries)
+            if not self._ids:
+                return [], np.zeros((q.shape[0], 0), dtype=np.float32)
+            return list(self._ids), self._score(q)
+
+    def _decode(self, rows: Rows) -> np.ndarray:
+        """float32 copy of the selected rows (a row, slice or index array)."""
+        block = np.asarray(self._vectors[rows], dtype=np.float32)
+        if self._scales is not None:
+            scales = self._scales[rows]
+            block = block * (scales[..., None] if np.ndim(scales) else scales)
+        return block
+
+    def _score(self, queries: np.ndarray) -> np.ndarray:
+        """
+        (num_queries, len(index)) dot products with every stored vector.
+        float32 storage is multiplied in place; float16/int8 matrices are
+        decoded one block of rows at a time so scratch memory stays bounded.
+        """
+        if self.storage == "float32":
+            return queries @ self._vectors.T
+        n = len(self._ids)
+        out = np.empty((queries.shape[0], n), dtype=np.float32)
+        for start in range(0, n, _SCORE_BLOCK_ROWS):
+            stop = min(start + _SCORE_BLOCK_ROWS, n)
+            out[:, start:stop] = queries @ self._vectors[start:stop].astype(np.float32).T
+        if self._scales is not None:
+            out *= self._scales
+        return out
+
+    def _detach(self) -> None:
+        """Copy a read-only mapped matrix into private memory before writing to it."""
+        if not self._vectors.flags.writeable:
+            self._vectors = np.array(self._vectors)
+
+    def save(self, path: str) -> bool:
+        """
+        Publish a snapshot; `load_index` restores it. Returns False if the
+        snapshot at `path` already holds these entries (another worker
+        published them) and nothing was written.
+
+        The matrix goes to a new `<path>.<token>.vectors.npy` file and the
+        sidecar at `path` (ids, versions, backend state) is replaced
+        atomically to point at it, so readers never see a half-written
+        snapshot. Workers sharing the snapshot serialize saves on a lock
+        file, and the writer then unlinks every other matrix file: readers
+        hold the lock between reading the sidecar and mapping its matrix,
+        and workers that already map an unlinked matrix keep reading it
+        until they reload.
+        """
+        with self._lock:
+            directory = os.path.dirname(path) or "."
+            vectors_file = f"{os.path.basename(path)}.{uuid.uuid4().hex[:12]}{_VECTORS_SUFFIX}"
+            arrays = {
+                "backend": np.array(self.backend),
+                "storage": np.array(self.storage),
+                "vectors_file": np.array(vectors_file),
+                "ids": np.array(self._ids, dtype=str),
+                "versions": np.array(self._versions, dtype=str),
+            }
+            if self._scales is not None:
+                arrays["scales"] = self._scales
+            arrays.update(self._extra_state())
+
+            with _snapshot_lock(path, exclusive=True):
+                if self._is_published(path):
+                    return False
+                np.save(os.path.join(directory, vectors_file), np.ascontiguousarray(self._vectors), allow_pickle=False)
+                tmp = f"{path}.{uuid.uuid4().hex[:12]}.tmp"
+                try:
+                    with open(tmp, "wb") as fh:
+                        np.savez(fh, **arrays)
+                    os.replace(tmp, path)
+                except BaseException:
+                    for leftover in (tmp, os.path.join(directory, vectors_file)):
+                        if os.path.exists(leftover):
+                            os.remove(leftover)
+                    raise
+                self._remove_stale_files(path, vectors_file)
+            return True
+
+    def _is_published(self, path: str) -> bool:
+        """Whether the snapshot at `path` already holds this index's entries (caller holds the snapshot lock)."""
+        try:
+            with np.load(path) as data:
+                if (str(data["backend"]), str(data["storage"])) != (self.backend, self.storage):
+                    return False
+                if not os.path.exists(os.path.join(os.path.dirname(path) or ".", str(data["vectors_file"]))):
+                    return False
+                published = dict(zip((str(x) for x in data["ids"]), (str(x) for x in data["versions"])))
+        except (OSError, ValueError, KeyError):
+            return False
+        return published == dict(zip(self._ids, self._versions))
+
+    @staticmethod
+    def _remove_stale_files(path: str, current: str) -> None:
+        """Unlink every matrix but `current`, and temp files of interrupted writes. Called under the snapshot lock."""
+        directory = os.path.dirname(path) or "."
+        prefix = glob.escape(os.path.basename(path))
+        for stale in glob.glob(os.path.join(directory, f"{prefix}.*{_VECTORS_SUFFIX}")) + glob.glob(os.path.join(directory, f"{prefix}.*.tmp")):
+            if os.path.basename(stale) == current:
+                continue
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+    def _restore(self, data, vectors: np.ndarray) -> None:
+        self._vectors = vectors
+        self._scales = np.asarray(data["scales"], dtype=np.float32) if "scales" in data else None
+        self.dim = self._vectors.shape[1] if self._vectors.size else self.dim
+        self._ids = [str(x) for x in data["ids"]]
+        self._versions = [str(x) for x in data["versions"]]
+        self._rows = {cid: r for r, cid in enumerate(self._ids)}
+
+    # Hooks for backends that keep auxiliary structures
+    def _candidate_rows(self, q: np.ndarray) -> Optional[np.ndarray]:
+        """Rows worth scoring for `q`; None means every row."""
+        return None
+
+    def _on_append(self, start: int) -> None:
+        pass
+
+    def _on_update(self, row: int) -> None:
+        pass
+
+    def _on_compact(self, keep: np.ndarray) -> None:
+        pass
+
+    def _extra_state(self) -> Dict[str, np.ndarray]:
+        return {}
+
+
+class FlatIndex(VectorIndex):
+    """Exact search: every query scores every stored vector."""
+
+    backend = "flat"
+    exact = True
+
+
+class IVFIndex(VectorIndex):
+    """
+    Inverted-file index with a spherical k-means coarse quantizer.
+
+    Until the index holds enough vectors to train `nlist` centroids it
+    behaves like a flat index. It retrains once the pool has doubled since
+    the last training run.
+    """
+
+    backend = "ivf"
+    exact = False
+
+    def __init__(self, dim: Optional[int] = None, storage: str = "float32", nlist: int = 0,
+                 nprobe: int = 8, train_iters: int = 10, seed: int = 0):
+        super().__init__(dim, storage)
+        self.nlist = int(nlist)
+        self.nprobe = int(nprobe)
+        self.train_iters = int(train_iters)
+        self.seed = int(seed)
+        self._centroids: Optional[np.ndarray] = None
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._lists: Optional[List[np.ndarray]] = None
+        self._trained_size = 0
+
+    def _target_nlist(self, n: int) -> int:
+        return self.nlist or max(1, int(np.sqrt(n)))
+
+    def train(self) -> None:
+        """(Re)fit centroids on the current vectors and reassign every row."""
+        with self._lock:
+            n = len(self._ids)
+            nlist = min(self._target_nlist(n), n)
+            if nlist < 2:
+                self._centroids = None
+                self._lists = None
+                return
+            rng = np.random.default_rng(self.seed)
+            centroids = self._decode(np.sort(rng.choice(n, nlist, replace=False)))
+            for _ in range(self.train_iters):
+                assign = np.argmax(self._score(centroids), axis=0)
+                sums = np.zeros_like(centroids)
+                for start in range(0, n, _SCORE_BLOCK_ROWS):
+                    stop = min(start + _SCORE_BLOCK_ROWS, n)
+                    np.add.at(sums, assign[start:stop], self._decode(slice(start, stop)))
+                empty = np.bincount(assign, minlength=nlist) == 0
+                sums[empty] = centroids[empty]
+                centroids = _normalize(sums)
+            self._centroids = centroids
+            self._assign = np.argmax(self._score(centroids), axis=0).astype(np.int32)
+            self._lists = None
+            self._trained_size = n
+            logger.info(f"Trained IVF index: {n} vectors, {nlist} lists")
+
+    def _needs_training(self) -> bool:
+        n = len(self._ids)
+        if self._centroids is None:
+            # Same rule of thumb as FAISS: ~39 training points per centroid
+            return n >= 39 * max(2, self._target_nlist(n))
+        return n >= 2 * self._trained_size
+
+    def _assign_rows(self, start: int) -> None:
+        if self._centroids is None:
+            return
+        new = np.argmax(self._decode(slice(start, None)) @ self._centroids.T, axis=1).astype(np.int32)
+        self._assign = np.concatenate([self._assign[:start], new])
+        self._lists = None
+
+    def _on_append(self, start: int) -> None:
+        if self._needs_training():
+            self.train()
+        else:
+            self._assign_rows(start)
+
+    def _on_update(self, row: int) -> None:
+        if self._centroids is not None:
+            self._assign[row] = int(np.argmax(self._centroids @ self._decode(row)))
+            self._lists = None
+
+    def _on_compact(self, keep: np.ndarray) -> None:
+        if self._centroids is not None:
+            self._assign = self._assign[keep]
+            self._lists = None
+
+    def _candidate_rows(self, q: np.ndarray) -> Optional[np.ndarray]:
+        if self._centroids is None:
+            return None
+        if self._lists is None:
+            order = np.argsort(self._assign, kind="stable")
+            bounds = np.searchsorted(self._assign[order], np.arange(len(self._centroids) + 1))
+            self._lists = [order[bounds[c]:bounds[c + 1]] for c in range(len(self._centroids))]
+        probe = _top_k(self._centroids @ q, self.nprobe)
+        return np.concatenate([self._lists[c] for c in probe])
+
+    def _extra_state(self) -> Dict[str, np.ndarray]:
+        state = {
+            "params": np.array([self.nlist, self.nprobe, self.train_iters, self.seed, self._trained_size]),
+            "assign": self._assign,
+        }
+        if self._centroids is not None:
+            state["centroids"] = self._centroids
+        return state
+
+    def _restore(self, data, vectors: np.ndarray) -> None:
+        super()._restore(data, vectors)
+        self.nlist, self.nprobe, self.train_iters, self.seed, self._trained_size = (int(x) for x in data["params"])
+        self._assign = np.asarray(data["assign"], dtype=np.int32)
+        self._centroids = np.asarray(data["centroids"], dtype=np.float32) if "centroids" in data else None
+        self._lists = None
+
+
+_BACKENDS = {
+    FlatIndex.backend: FlatIndex,
+    IVFIndex.backend: IVFIndex,
+}
+
+
+def create_index(backend: str = "flat", dim: Optional[int] = None, storage: str = "float32", **kwargs) -> VectorIndex:
+    """Create an empty index for the named backend ('flat' or 'ivf') and storage dtype."""
+    try:
+        cls = _BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown vector index backend: {backend!r} (expected one of {sorted(_BACKENDS)})")
+    return cls(dim, storage, **kwargs) if cls is IVFIndex else cls(dim, storage)
+
+
+def load_index(path: str, mmap: bool = True) -> VectorIndex:
+    """
+    Restore an index from a snapshot written by `VectorIndex.save`. With
+    mmap=True the matrix is mapped read-only instead of read into memory.
+    """
+    with _snapshot_lock(path, exclusive=False), np.load(path) as data:
+        index = _BACKENDS[str(data["backend"])](storage=str(data["storage"]))
+        vectors_path = os.path.join(os.path.dirname(path) or ".", str(data["vectors_file"]))
+        vectors = np.load(vectors_path, mmap_mode="r" if mmap else None, allow_pickle=False)
+        index._restore(data, vectors)
+    return index
@@ -0,0 +1,14 @@
+"""
+Shared pytest setup.
+
+Tests import the package the way the recruiter backend does
+(`candidate_recommendation.services...`), so `recruiter-backend/` must be
+on the import path whichever directory pytest is started from.
+"""
+
+import sys
+from pathlib import Path
+
+RECRUITER_BACKEND = Path(__file__).resolve().parents[2]
+if str(RECRUITER_BACKEND) not in sys.path:
+    sys.path.insert(0, str(RECRUITER_BACKEND))
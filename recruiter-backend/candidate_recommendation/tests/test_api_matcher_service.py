@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+import zlib
+
+import numpy as np
+import pytest
+
+from candidate_recommendation.config import config
+from candidate_recommendation.models.recommendation import JobDescription, SearchFilters
+from candidate_recommendation.services.api_matcher_service import APICandidateMatcherService
+from candidate_recommendation.services.candidate_client import CandidateProfile
+
+SKILLS = ["Python", "SQL", "Docker", "Go", "Kubernetes"]
+
+
+class _HashModel:
+    """Deterministic stand-in for the sentence encoder: one seeded random vector per text."""
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False):
+        return np.stack([
+            np.random.default_rng(zlib.crc32(text.encode("utf-8"))).standard_normal(16).astype(np.float32)
+            for text in texts
+        ])
+
+
+def _profile(i):
+    return CandidateProfile(
+        user_id=f"u{i}",
+        display_name=f"Candidate {i}",
+        email="",
+        title="Python Engineer" if i % 2 else "Data Engineer",
+        summary=f"Engineer {i} working with python and sql",
+        skills={"technical": SKILLS[: i % len(SKILLS) + 1]},
+        statistics={"challenges_completed": i % 20},
+    )
+
+
+JOB = JobDescription(
+    id="job-1", title="Python Engineer", company="Acme", description="python sql services",
+    requirements=["Python"], preferred_skills=["SQL"],
+)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    settings = {
+        "embedding_store_path": str(tmp_path / "embeddings.db"),
+        "index_snapshot_path": None,
+        "index_backend": "flat",
+        "sync_enabled": False,
+        "lexical_prefilter": True,
+        "lexical_shortlist": 20,
+    }
+    for name, value in settings.items():
+        monkeypatch.setattr(config, name, value)
+    matcher = APICandidateMatcherService()
+    monkeypatch.setattr(matcher, "_get_model", _HashModel)
+    yield matcher
+    matcher.encoder.shutdown()
+
+
+def _assert_ranked_from_pool(result, pool):
+    candidate_by_id, ranked_ids, scores, _ = result
+    assert set(candidate_by_id) == {c.user_id for c in pool}
+    assert ranked_ids and set(ranked_ids) <= set(candidate_by_id)
+    assert len(scores) == len(ranked_ids)
+
+
+def test_rank_blends_and_filters(service):
+    pool = [_profile(i) for i in range(60)]
+    _, ranked_ids, scores, _ = asyncio.run(service._rank(JOB, pool, 10))
+    assert len(ranked_ids) == 10
+    assert list(scores) == sorted(scores, reverse=True)
+
+    filters = SearchFilters(required_skills=["docker"])
+    _, filtered_ids, _, _ = asyncio.run(service._rank(JOB, pool, 10, filters=filters))
+    assert filtered_ids
+    assert all("docker" in service._candidate_skills(_profile(int(cid[1:]))) for cid in filtered_ids)
+
+
+def test_concurrent_searches_with_different_pools(service):
+    pool_a = [_profile(i) for i in range(50)]
+    pool_b = [_profile(i) for i in range(40, 300)]
+    expected_a = asyncio.run(service._rank(JOB, pool_a, 10))[1]
+
+    async def main():
+        return await asyncio.gather(*(
+            service._rank(JOB, pool_a if n % 2 else pool_b, 10) for n in range(20)
+        ))
+
+    for n, result in enumerate(asyncio.run(main())):
+        _assert_ranked_from_pool(result, pool_a if n % 2 else pool_b)
+        if n % 2:
+            assert result[1] == expected_a
+
+
+def test_index_refresh_between_sync_and_ranking(service):
+    # A sync refresh with a larger pool arrives right after this search synced its own
+    pool_a = [_profile(i) for i in range(50)]
+    pool_b = [_profile(i) for i in range(50, 400)]
+    prepare_pool = service._prepare_pool
+    refresher = threading.Thread(target=service.refresh_index, args=(pool_b,))
+
+    def prepare_then_refresh(candidates):
+        result = prepare_pool(candidates)
+        refresher.start()
+        time.sleep(0.05)  # let the refresh run now if nothing holds it back
+        return result
+
+    service._prepare_pool = prepare_then_refresh
+    result = asyncio.run(service._rank(JOB, pool_a, 10))
+    refresher.join()
+    _assert_ranked_from_pool(result, pool_a)
+
+
+def test_replica_searches_keep_newer_candidates_indexed(service, monkeypatch):
+    monkeypatch.setattr(config, "sync_enabled", True)
+    monkeypatch.setattr(type(service.candidate_sync), "ready", property(lambda self: True))
+    old_pool = [_profile(i) for i in range(30)]
+    new_pool = [_profile(i) for i in range(30, 60)]
+    service.refresh_index(new_pool)
+
+    # A search still holding the previous pool version adds its candidates but removes nobody
+    _assert_ranked_from_pool(asyncio.run(service._rank(JOB, old_pool, 5)), old_pool)
+    assert all(c.user_id in service.index for c in new_pool)
+    _assert_ranked_from_pool(asyncio.run(service._rank(JOB, new_pool, 5)), new_pool)
+
+
+def test_match_many_only_ranks_the_pool(service):
+    # Candidates of another pool left in the shared index (as replica searches leave them)
+    service.refresh_index([_profile(i) for i in range(100, 200)])
+    sync_index = service._sync_index
+    service._sync_index = lambda texts, prune=True: sync_index(texts, prune=False)
+
+    pool = [_profile(i) for i in range(20)]
+    per_job, _ = asyncio.run(service.match_many([JOB, JOB], pool, 5, include_summary=False))
+    assert len(service.index) > len(pool)
+    for matches in per_job:
+        assert len(matches) == 5
+        assert {m.candidate_id for m in matches} <= {c.user_id for c in pool}
+
+
+def test_lexical_shortlist_is_limited_to_the_pool(service):
+    pool = [_profile(i) for i in range(40)]
+    others = [_profile(i) for i in range(1000, 1100)]
+    asyncio.run(service._rank(JOB, pool + others, 5))
+    # The shared BM25 and vector indexes also hold `others`; retrieval must ignore them
+    candidate_by_id = {c.user_id: c for c in pool}
+    embedding = asyncio.run(service._encode_job(JOB)).embedding
+    ids, scores = service._retrieve(JOB, embedding, candidate_by_id, 5)
+    assert ids and set(ids) <= set(candidate_by_id)
+    assert len(scores) == len(ids)
+
+
+def test_workers_share_one_published_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "embedding_store_path", str(tmp_path / "embeddings.db"))
+    monkeypatch.setattr(config, "index_snapshot_path", str(tmp_path / "index.npz"))
+    monkeypatch.setattr(config, "index_mmap", True)
+    monkeypatch.setattr(config, "sync_enabled", False)
+    workers = [APICandidateMatcherService() for _ in range(3)]
+    pool = [_profile(i) for i in range(30)]
+    try:
+        for worker in workers:
+            monkeypatch.setattr(worker, "_get_model", _HashModel)
+            worker.refresh_index(pool)
+        assert len(list(tmp_path.glob("index.npz.*.vectors.npy"))) == 1
+        assert len({worker.index._vectors.filename for worker in workers}) == 1
+        assert all(worker.index.mapped and len(worker.index) == 30 for worker in workers)
+    finally:
+        for worker in workers:
+            worker.encoder.shutdown()
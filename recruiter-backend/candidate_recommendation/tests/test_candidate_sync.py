@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from candidate_recommendation.config import config
+from candidate_recommendation.database.connection import Base
+from candidate_recommendation.database.models import CandidateDB
+from candidate_recommendation.services import candidate_sync
+from candidate_recommendation.services.candidate_client import CandidateBackendClient, CandidateProfile
+from candidate_recommendation.services.candidate_sync import CandidateSyncService
+
+
+def _profile(i, version=1):
+    return CandidateProfile(
+        user_id=f"u{i}", display_name=f"Candidate {i}", email="", title="Engineer",
+        summary=None, skills={"technical": ["Python"]}, version=version,
+    )
+
+
+class _ExportClient:
+    def __init__(self, profiles):
+        self.profiles = profiles
+
+    async def export_candidates(self):
+        return self.profiles, None
+
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(candidate_sync, "SessionLocal", session_factory)
+    return session_factory
+
+
+def _active_ids(sessions):
+    db = sessions()
+    try:
+        return {row.anonymous_id for row in db.query(CandidateDB).filter(CandidateDB.is_active == True)}
+    finally:
+        db.close()
+
+
+def test_full_sync_deactivates_departed_candidates(sessions):
+    client = _ExportClient([_profile(i) for i in range(10)])
+    service = CandidateSyncService(client=client)
+    assert asyncio.run(service.sync_once()) == 10
+
+    client.profiles = client.profiles[:8]
+    assert asyncio.run(service.sync_once()) == 2
+    assert _active_ids(sessions) == {f"u{i}" for i in range(8)}
+    assert len(service.candidates()) == 8
+
+
+def test_full_sync_refuses_to_empty_the_replica(sessions, monkeypatch):
+    monkeypatch.setattr(config, "sync_max_deactivate_fraction", 0.5)
+    client = _ExportClient([_profile(i) for i in range(10)])
+    service = CandidateSyncService(client=client)
+    asyncio.run(service.sync_once())
+    pool_version = service.pool_version
+
+    # A truncated export that also updates a survivor: nothing may be written
+    client.profiles = [_profile(0, version=2)]
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.sync_once())
+    assert _active_ids(sessions) == {f"u{i}" for i in range(10)}
+    assert service.pool_version == pool_version
+    assert {p.version for p in service.candidates()} == {1}
+
+    client.profiles = []
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.sync_once())
+    assert len(service.candidates()) == 10
+
+
+def test_per_user_fallback_raises_on_missing_profiles(monkeypatch):
+    client = CandidateBackendClient(base_url="http://candidates.test")
+
+    async def get_json(url, label):
+        return 200, [{"user_id": f"u{i}"} for i in range(3)]
+
+    async def get_user_profile(user_id):
+        return None if user_id == "u1" else _profile(int(user_id[1:]))
+
+    monkeypatch.setattr(client, "_get_json", get_json)
+    monkeypatch.setattr(client, "_get_user_profile", get_user_profile)
+    with pytest.raises(RuntimeError):
+        asyncio.run(client._get_candidates_per_user())
+
+
+def test_per_user_fallback_raises_on_failed_user_list(monkeypatch):
+    client = CandidateBackendClient(base_url="http://candidates.test")
+
+    async def get_json(url, label):
+        return 503, None
+
+    monkeypatch.setattr(client, "_get_json", get_json)
+    with pytest.raises(RuntimeError):
+        asyncio.run(client._get_candidates_per_user())
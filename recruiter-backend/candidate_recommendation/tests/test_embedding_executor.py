@@ -0,0 +1,118 @@
+import threading
+
+import numpy as np
+import pytest
+
+from candidate_recommendation.services.embedding_executor import EmbeddingExecutor
+
+
+class _Encoder:
+    """Records each batch; encodes text "t<n>" as the row [n, n]. Optionally holds the first batch."""
+
+    def __init__(self, hold_first=False):
+        self.batches = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not hold_first:
+            self.release.set()
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        self.started.set()
+        self.release.wait(5)
+        if any(t == "bad" for t in texts):
+            raise RuntimeError("boom")
+        return np.array([[float(t[1:])] * 2 for t in texts])
+
+
+def _texts(start, stop):
+    return [f"t{i}" for i in range(start, stop)]
+
+
+@pytest.fixture
+def make_executor():
+    executors = []
+
+    def make(encoder, max_batch_size=4):
+        executor = EmbeddingExecutor(encoder, max_batch_size=max_batch_size, max_wait_ms=1)
+        executors.append(executor)
+        return executor
+
+    yield make
+    for executor in executors:
+        executor.shutdown()
+
+
+def test_small_requests_share_a_batch(make_executor):
+    encoder = _Encoder(hold_first=True)
+    executor = make_executor(encoder)
+    blocker = executor.submit(["t99"])
+    encoder.started.wait(5)
+    futures = [executor.submit([f"t{i}"]) for i in range(3)]
+    encoder.release.set()
+    assert blocker.result(5)[0, 0] == 99
+    assert [f.result(5)[0, 0] for f in futures] == [0, 1, 2]
+    assert encoder.batches[1] == ["t0", "t1", "t2"]
+
+
+def test_oversized_request_is_split_into_batches(make_executor):
+    encoder = _Encoder()
+    executor = make_executor(encoder)
+    result = executor.encode_sync(_texts(0, 10))
+    assert result.shape == (10, 2)
+    np.testing.assert_array_equal(result[:, 0], np.arange(10))
+    assert [len(batch) for batch in encoder.batches] == [4, 4, 2]
+    stats = executor.stats()
+    assert (stats["requests"], stats["chunks"], stats["batches"]) == (1, 3, 3)
+
+
+def test_oversized_request_interleaves_with_other_requests(make_executor):
+    encoder = _Encoder(hold_first=True)
+    executor = make_executor(encoder)
+    large = executor.submit(_texts(0, 20))
+    encoder.started.wait(5)
+    small = executor.submit(["t100"])
+    encoder.release.set()
+
+    assert small.result(5)[0, 0] == 100
+    np.testing.assert_array_equal(large.result(5)[:, 0], np.arange(20))
+    # The small request rides in the second batch instead of waiting out all 20 texts
+    assert "t100" in encoder.batches[1]
+    assert all(len(batch) <= 4 for batch in encoder.batches)
+
+
+def test_failed_chunk_fails_the_whole_request(make_executor):
+    encoder = _Encoder()
+    executor = make_executor(encoder)
+    failing = executor.submit(_texts(0, 5) + ["bad"] + _texts(6, 12))
+    with pytest.raises(RuntimeError):
+        failing.result(5)
+    # Its remaining chunks are dropped and the worker keeps serving
+    assert executor.encode_sync(["t7"])[0, 0] == 7
+    assert not any("t11" in batch for batch in encoder.batches)
+
+
+def test_cancelled_request_is_not_encoded(make_executor):
+    encoder = _Encoder(hold_first=True)
+    executor = make_executor(encoder)
+    executor.submit(["t0"])
+    encoder.started.wait(5)
+    cancelled = executor.submit(["t1"])
+    assert cancelled.cancel()
+    encoder.release.set()
+    assert executor.encode_sync(["t2"])[0, 0] == 2
+    assert ["t1"] not in encoder.batches
+
+
+def test_shutdown_drains_queued_requests():
+    encoder = _Encoder(hold_first=True)
+    executor = EmbeddingExecutor(encoder, max_batch_size=4, max_wait_ms=1)
+    first = executor.submit(_texts(0, 6))
+    encoder.started.wait(5)
+    second = executor.submit(["t50"])
+    encoder.release.set()
+    executor.shutdown()
+    assert first.done() and second.done()
+    assert second.result()[0, 0] == 50
+    with pytest.raises(RuntimeError):
+        executor.submit(["t1"])
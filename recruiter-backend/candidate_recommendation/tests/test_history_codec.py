@@ -0,0 +1,49 @@
+import struct
+
+import pytest
+
+from candidate_recommendation.database.history_codec import (
+    match_key, pack_match_dicts, pack_results, unpack_results
+)
+
+
+def test_round_trip_keeps_order_and_rounds_scores():
+    results = [("cand-b", 0.91234), ("cand-a", 0.5), ("ünï", 0.0001)]
+    decoded = unpack_results(pack_results(results))
+    assert [cid for cid, _ in decoded] == ["cand-b", "cand-a", "ünï"]
+    for (_, original), (_, score) in zip(results, decoded):
+        assert score == pytest.approx(original, abs=1e-3)  # float16
+
+
+@pytest.mark.parametrize("blob", [None, b""])
+def test_missing_blob_decodes_empty(blob):
+    assert unpack_results(blob) == []
+
+
+def test_empty_results_round_trip():
+    assert unpack_results(pack_results([])) == []
+
+
+def test_unknown_version_is_rejected():
+    blob = bytearray(pack_results([("a", 1.0)]))
+    blob[2] = 99
+    with pytest.raises(ValueError):
+        unpack_results(bytes(blob))
+
+
+def test_header_layout():
+    blob = pack_results([("a", 1.0), ("bc", 0.5)])
+    magic, version, _, count = struct.unpack_from("<2sBBI", blob)
+    assert (magic, version, count) == (b"RH", 1, 2)
+    assert blob.endswith(b"a\0bc")
+
+
+def test_legacy_match_dicts():
+    matches = [
+        {"candidate_id": "u1", "match_score": 0.8, "summary": "long text"},
+        {"filename": "resume_2.json", "match_score": None},
+        {"name": "Jane"},
+    ]
+    assert list(map(match_key, matches)) == ["u1", "resume_2.json", "Jane"]
+    assert unpack_results(pack_match_dicts(matches)) == [("u1", 0.7998), ("resume_2.json", 0.0), ("Jane", 0.0)]
+    assert unpack_results(pack_match_dicts(None)) == []
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from candidate_recommendation.database.connection import Base
+from candidate_recommendation.database.models import JobDB, RecommendationHistoryDB
+from candidate_recommendation.models.recommendation import CandidateMatch, JobDescription, SearchFilters
+from candidate_recommendation.services import history_writer
+from candidate_recommendation.services.history_writer import HistoryRecord, HistoryWriter, write_history
+
+
+def _record(job_id, metadata=None):
+    job = JobDescription(id=job_id, title="Engineer", company="Acme", description="Build things")
+    matches = [CandidateMatch(candidate_id="c1", match_score=0.9)]
+    return HistoryRecord(job=job, search_query=SearchFilters(), matches=matches, search_metadata=metadata)
+
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'history.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(history_writer, "SessionLocal", session_factory)
+    return session_factory
+
+
+def _counts(sessions):
+    db = sessions()
+    try:
+        return db.query(JobDB).count(), db.query(RecommendationHistoryDB).count()
+    finally:
+        db.close()
+
+
+def test_batch_with_already_inserted_job_is_written(sessions, monkeypatch):
+    write_history([_record("job-1")])
+    # Another worker inserted job-1 after this batch checked which jobs exist
+    monkeypatch.setattr(history_writer, "_existing_job_ids", lambda db, job_ids: set())
+    write_history([_record("job-1"), _record("job-2")])
+    assert _counts(sessions) == (2, 3)
+
+
+def test_failed_batch_only_drops_the_bad_record(sessions):
+    writer = HistoryWriter()
+    batch = [_record("job-1"), _record("job-2", metadata={"bad": object()}), _record("job-3")]
+    writer._write(batch)
+    assert (writer.written, writer.failed) == (2, 1)
+    assert writer.last_error
+    assert _counts(sessions) == (2, 2)
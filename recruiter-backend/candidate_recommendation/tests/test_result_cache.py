@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+
+from candidate_recommendation.services.result_cache import (
+    COALESCED, HIT, MISS, SearchResultCache, content_hash
+)
+
+
+def test_content_hash_ignores_key_order():
+    assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+    assert content_hash({"a": 1}) != content_hash({"a": 2})
+
+
+def test_hit_after_miss():
+    cache = SearchResultCache(4)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return "value"
+
+    async def main():
+        first = await cache.get_or_compute("k", compute)
+        second = await cache.get_or_compute("k", compute)
+        return first, second
+
+    assert asyncio.run(main()) == (("value", MISS), ("value", HIT))
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_lru_eviction():
+    cache = SearchResultCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("a") == 1 and cache.get("b") is None and cache.get("c") == 3
+
+
+def test_disabled_cache_stores_nothing():
+    cache = SearchResultCache(0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+
+
+def test_uncacheable_results_are_not_stored():
+    cache = SearchResultCache(4)
+
+    async def compute():
+        return "value"
+
+    async def main():
+        await cache.get_or_compute("k", compute, cacheable=False)
+        return await cache.get_or_compute("k", compute, cacheable=False)
+
+    assert asyncio.run(main()) == ("value", MISS)
+    assert cache.get("k") is None
+
+
+def test_concurrent_identical_calls_are_coalesced():
+    cache = SearchResultCache(4)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert sorted(outcome for _, outcome in results) == [COALESCED] * 4 + [MISS]
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_leader_error_propagates_to_followers_and_is_not_cached():
+    cache = SearchResultCache(4)
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert cache.get("k") is None
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_cancelling_the_leader_does_not_cancel_followers():
+    cache = SearchResultCache(4)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def main():
+        leader = asyncio.create_task(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(cache.get_or_compute("k", compute)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return results
+
+    assert asyncio.run(main()) == [("value", COALESCED)] * 3
+    assert len(calls) == 1
+    assert cache.get("k") == "value"
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_computation_is_cancelled_when_every_caller_gives_up():
+    cache = SearchResultCache(4)
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def fast():
+        return "value"
+
+    async def main():
+        callers = [asyncio.create_task(cache.get_or_compute("k", slow)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        assert cache.stats()["in_flight"] == 0
+        # The next call starts a fresh computation instead of joining the cancelled one
+        result = await cache.get_or_compute("k", fast)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(main()) == ("value", MISS)
+    assert cancelled == [1]
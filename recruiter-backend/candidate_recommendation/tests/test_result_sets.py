@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from candidate_recommendation.services import result_sets
+from candidate_recommendation.services.result_sets import (
+    ResultSet, ResultSetStore, decode_cursor, encode_cursor
+)
+
+
+def _result_set(store, n=5, corpus_version="replica:1"):
+    ids = [f"c{i}" for i in range(n)]
+    return ResultSet(
+        id=store.new_id(),
+        job_id="job-1",
+        corpus_version=corpus_version,
+        ranked_ids=ids,
+        scores=np.linspace(1.0, 0.5, n, dtype=np.float32),
+        candidates={cid: {"user_id": cid} for cid in ids},
+        page_size=2,
+        include_summary=False,
+    )
+
+
+@pytest.mark.parametrize("offset", [0, 1, 10, 12345])
+def test_cursor_round_trip(offset):
+    assert decode_cursor(encode_cursor(offset)) == offset
+
+
+@pytest.mark.parametrize("cursor", ["", "!!!", "bzp4", "eDox", encode_cursor(3)[:-1] + "*"])
+def test_malformed_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_next_cursor_stops_at_end():
+    store = ResultSetStore()
+    result_set = _result_set(store, n=5)
+    assert decode_cursor(result_set.next_cursor(2)) == 2
+    assert result_set.next_cursor(5) is None
+
+
+def test_put_get_discard():
+    store = ResultSetStore()
+    result_set = store.put(_result_set(store))
+    assert store.get(result_set.id) is result_set
+    store.discard(result_set.id)
+    assert store.get(result_set.id) is None
+
+
+def test_lru_bound():
+    store = ResultSetStore(maxsize=2)
+    first, second, third = (store.put(_result_set(store)) for _ in range(3))
+    assert store.get(first.id) is None
+    assert store.get(second.id) is second and store.get(third.id) is third
+
+
+def test_disabled_store_keeps_nothing():
+    store = ResultSetStore(maxsize=0)
+    result_set = store.put(_result_set(store))
+    assert store.get(result_set.id) is None
+
+
+def test_ttl_expiry_and_refresh(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_sets.time, "monotonic", lambda: now[0])
+    store = ResultSetStore(ttl_seconds=10)
+    result_set = store.put(_result_set(store))
+
+    now[0] += 8
+    assert store.get(result_set.id) is result_set  # restarts the TTL
+    now[0] += 8
+    assert store.get(result_set.id) is result_set
+    now[0] += 11
+    assert store.get(result_set.id) is None
+    assert store.stats()["expired"] == 1
@@ -0,0 +1,86 @@
+import json
+import struct
+
+import pytest
+
+from candidate_recommendation.services.resume_corpus import INDEX_SUFFIX, JsonlCorpus, is_corpus_file
+
+
+def _write(path, records, indexed=None, tail=b""):
+    """Corpus with the first `indexed` lines in the offset index (all by default) and raw `tail` bytes appended."""
+    indexed = len(records) if indexed is None else indexed
+    offsets, data = [], b""
+    for record in records:
+        offsets.append(len(data))
+        data += json.dumps(record).encode("utf-8") + b"\n"
+    path.write_bytes(data + tail)
+    (path.parent / (path.name + INDEX_SUFFIX)).write_bytes(b"".join(struct.pack("<Q", o) for o in offsets[:indexed]))
+
+
+def _records(n):
+    return [{"filename": f"r{i}.md", "data": {"name": f"Candidate {i}"}} for i in range(n)]
+
+
+def test_is_corpus_file():
+    assert is_corpus_file("out/corpus.jsonl")
+    assert not is_corpus_file("out/resume_1.json")
+
+
+def test_reads_indexed_records(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    _write(path, _records(3))
+    with JsonlCorpus(path) as corpus:
+        assert len(corpus) == 3
+        assert corpus.record(1)["filename"] == "r1.md"
+        assert [r["filename"] for r in corpus.records(1)] == ["r1.md", "r2.md"]
+
+
+def test_recovers_lines_written_after_the_index(tmp_path):
+    # A writer that crashed after flushing data but before writing offsets
+    path = tmp_path / "corpus.jsonl"
+    _write(path, _records(5), indexed=2)
+    with JsonlCorpus(path) as corpus:
+        assert len(corpus) == 5
+        assert corpus.record(4)["filename"] == "r4.md"
+
+
+def test_ignores_trailing_partial_line(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    _write(path, _records(3), tail=b'{"filename": "r3.md", "da')
+    with JsonlCorpus(path) as corpus:
+        assert len(corpus) == 3
+        assert [r["filename"] for r in corpus.records()] == ["r0.md", "r1.md", "r2.md"]
+
+
+def test_index_ahead_of_truncated_data(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    _write(path, _records(4))
+    data = path.read_bytes()
+    path.write_bytes(data[: data.index(b"r3.md")])  # cut inside the last line
+    with JsonlCorpus(path) as corpus:
+        assert len(corpus) == 3
+        assert corpus.record(2)["filename"] == "r2.md"
+
+
+def test_missing_index_scans_every_line(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    _write(path, _records(3))
+    (tmp_path / ("corpus.jsonl" + INDEX_SUFFIX)).unlink()
+    with JsonlCorpus(path) as corpus:
+        assert len(corpus) == 3
+
+
+@pytest.mark.parametrize("content", [b"", b'{"partial"'])
+def test_empty_or_partial_only_corpus(tmp_path, content):
+    path = tmp_path / "corpus.jsonl"
+    path.write_bytes(content)
+    with JsonlCorpus(path) as corpus:
+        assert len(corpus) == 0
+        assert list(corpus.records()) == []
+
+
+def test_blank_lines_are_skipped(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    _write(path, _records(1), tail=b"\n")
+    with JsonlCorpus(path) as corpus:
+        assert [r["filename"] for r in corpus.records()] == ["r0.md"]
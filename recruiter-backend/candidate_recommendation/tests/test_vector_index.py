@@ -0,0 +1,225 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from candidate_recommendation.services import vector_index
+from candidate_recommendation.services.vector_index import (
+    FlatIndex, IVFIndex, STORAGE_DTYPES, create_index, load_index
+)
+
+
+def _vectors(n, dim=16, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+def _unit(vectors):
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("storage", STORAGE_DTYPES)
+def test_scores_decode_close_to_float32(storage):
+    vectors = _vectors(50)
+    index = create_index("flat", storage=storage)
+    index.add([f"c{i}" for i in range(50)], vectors)
+    ids, scores = index.score_all(vectors[:3])
+    expected = _unit(vectors[:3]) @ _unit(vectors).T
+    assert ids == [f"c{i}" for i in range(50)]
+    tolerance = {"float32": 1e-5, "float16": 2e-3, "int8": 2e-2}[storage]
+    np.testing.assert_allclose(scores, expected, atol=tolerance)
+
+
+def test_search_returns_nearest_first():
+    vectors = _vectors(20)
+    index = FlatIndex()
+    index.add([f"c{i}" for i in range(20)], vectors)
+    ids, scores = index.search(vectors[7], 3)
+    assert ids[0] == "c7"
+    assert scores[0] == pytest.approx(1.0, abs=1e-5)
+    assert list(scores) == sorted(scores, reverse=True)
+
+
+def test_add_replaces_existing_ids_and_versions():
+    vectors = _vectors(3)
+    index = FlatIndex()
+    index.add(["a", "b", "c"], vectors, versions=["1", "1", "1"])
+    index.add(["b"], vectors[:1], versions=["2"])
+    assert len(index) == 3
+    assert index.version_of("b") == "2"
+    ids, scores = index.score_ids(vectors[0], ["b"])
+    assert ids == ["b"] and scores[0] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_remove_compacts_rows():
+    vectors = _vectors(5)
+    index = FlatIndex(storage="int8")
+    index.add(list("abcde"), vectors)
+    index.remove(["b", "d", "unknown"])
+    assert index.ids == ["a", "c", "e"]
+    assert "b" not in index
+    ids, scores = index.score_ids(vectors[4], ["e", "b"])
+    assert ids == ["e"] and scores[0] == pytest.approx(1.0, abs=2e-2)
+
+
+def test_dimension_mismatch_is_rejected():
+    index = FlatIndex()
+    index.add(["a"], _vectors(1, dim=8))
+    with pytest.raises(ValueError):
+        index.add(["b"], _vectors(1, dim=4))
+
+
+def test_empty_index_queries():
+    index = FlatIndex()
+    assert index.search(_vectors(1)[0], 5)[0] == []
+    assert index.score_ids(_vectors(1)[0], ["a"])[0] == []
+    ids, scores = index.score_all(_vectors(2))
+    assert ids == [] and scores.shape == (2, 0)
+
+
+def test_unknown_backend_and_storage():
+    with pytest.raises(ValueError):
+        create_index("hnsw")
+    with pytest.raises(ValueError):
+        create_index("flat", storage="int4")
+
+
+@pytest.mark.parametrize("storage", STORAGE_DTYPES)
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load_round_trip(tmp_path, storage, mmap):
+    vectors = _vectors(30)
+    index = create_index("flat", storage=storage)
+    index.add([f"c{i}" for i in range(30)], vectors, versions=[f"v{i}" for i in range(30)])
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+
+    loaded = load_index(path, mmap=mmap)
+    assert loaded.ids == index.ids
+    assert loaded.storage == storage
+    assert loaded.version_of("c12") == "v12"
+    assert loaded.mapped == mmap
+    np.testing.assert_array_equal(loaded.score_all(vectors[:2])[1], index.score_all(vectors[:2])[1])
+
+
+def test_mapped_index_detaches_on_write(tmp_path):
+    vectors = _vectors(4)
+    index = FlatIndex()
+    index.add(list("abcd"), vectors)
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = load_index(path, mmap=True)
+    loaded.add(["a"], vectors[3:])
+    assert not loaded.mapped
+    assert loaded.score_ids(vectors[3], ["a"])[1][0] == pytest.approx(1.0, abs=1e-5)
+    # The snapshot on disk is unchanged
+    assert load_index(path).score_ids(vectors[0], ["a"])[1][0] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_save_replaces_previous_matrix_file(tmp_path):
+    index = FlatIndex()
+    index.add(["a"], _vectors(1))
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    index.add(["b"], _vectors(1, seed=1))
+    index.save(path)
+    assert len(list(tmp_path.glob("index.npz.*.vectors.npy"))) == 1
+    assert load_index(path).ids == ["a", "b"]
+
+
+def test_empty_index_round_trip(tmp_path):
+    path = str(tmp_path / "index.npz")
+    FlatIndex().save(path)
+    loaded = load_index(path)
+    assert len(loaded) == 0
+    assert loaded.search(_vectors(1)[0], 3)[0] == []
+
+
+def test_ivf_trains_and_recalls_exact_neighbours():
+    vectors = _vectors(400, dim=16)
+    index = IVFIndex(nlist=4, nprobe=4)
+    index.add([f"c{i}" for i in range(400)], vectors)
+    assert index._centroids is not None
+    # Probing every list is exhaustive: same top hit as exact search
+    ids, _ = index.search(vectors[123], 5)
+    assert ids[0] == "c123"
+
+
+def test_ivf_round_trip_keeps_training(tmp_path):
+    vectors = _vectors(400)
+    index = IVFIndex(storage="float16", nlist=4, nprobe=2)
+    index.add([f"c{i}" for i in range(400)], vectors)
+    path = str(tmp_path / "ivf.npz")
+    index.save(path)
+    loaded = load_index(path)
+    assert isinstance(loaded, IVFIndex)
+    assert (loaded.nlist, loaded.nprobe) == (4, 2)
+    np.testing.assert_array_equal(loaded._assign, index._assign)
+    assert loaded.search(vectors[5], 3)[0] == index.search(vectors[5], 3)[0]
+
+
+def test_ivf_remove_keeps_assignments_aligned():
+    vectors = _vectors(400)
+    index = IVFIndex(nlist=4, nprobe=4)
+    index.add([f"c{i}" for i in range(400)], vectors)
+    index.remove([f"c{i}" for i in range(0, 400, 2)])
+    assert len(index._assign) == len(index) == 200
+    assert index.search(vectors[7], 1)[0] == ["c7"]
+
+
+def _save_repeatedly(path, worker, rounds):
+    index = FlatIndex()
+    for i in range(rounds):
+        index.add([f"w{worker}-{i}"], _vectors(1, seed=worker * 1000 + i))
+        index.save(path)
+
+
+def _load_repeatedly(path, rounds):
+    for _ in range(rounds):
+        loaded = load_index(path, mmap=True)
+        assert len(loaded.score_all(_vectors(1))[0]) == len(loaded)
+
+
+@pytest.mark.skipif(vector_index.fcntl is None, reason="snapshot locking needs fcntl")
+def test_concurrent_saves_from_several_processes(tmp_path):
+    path = str(tmp_path / "index.npz")
+    FlatIndex().save(path)
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_save_repeatedly, args=(path, w, 15)) for w in range(4)]
+    workers.append(ctx.Process(target=_load_repeatedly, args=(path, 60)))
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(60)
+    assert [process.exitcode for process in workers] == [0] * len(workers)
+
+    loaded = load_index(path)
+    assert len(loaded) == 15
+    assert not list(tmp_path.glob("*.tmp"))
+    # Matrices of the exited writers are cleaned up by the next save
+    FlatIndex().save(path)
+    assert len(list(tmp_path.glob("index.npz.*.vectors.npy"))) == 1
+
+
+def test_save_skips_entries_already_published(tmp_path):
+    vectors = _vectors(3)
+    path = str(tmp_path / "index.npz")
+    first, second = FlatIndex(), FlatIndex()
+    first.add(list("abc"), vectors, versions=["1", "1", "1"])
+    second.add(list("cba"), vectors[::-1], versions=["1", "1", "1"])
+    assert first.save(path)
+    # Another worker with the same entries maps the published snapshot instead of writing its own
+    assert not second.save(path)
+    assert len(list(tmp_path.glob("index.npz.*.vectors.npy"))) == 1
+    assert load_index(path).same_entries(second)
+
+    second.add(["d"], _vectors(1, seed=1), versions=["1"])
+    assert second.save(path)
+    assert load_index(path).ids == list("cbad")
+
+
+def test_save_removes_superseded_and_interrupted_files(tmp_path):
+    path = str(tmp_path / "index.npz")
+    np.save(tmp_path / "index.npz.0123456789ab.vectors.npy", _vectors(1))
+    (tmp_path / "index.npz.0123456789ab.tmp").write_bytes(b"partial")
+    FlatIndex().save(path)
+    assert len(list(tmp_path.glob("index.npz.*.vectors.npy"))) == 1
+    assert not list(tmp_path.glob("*.tmp"))
@@ -3,18 +3,40 @@ from contextlib import asynccontextmanager
 
 from candidate_recommendation.api import recommendations
 from candidate_recommendation.database.connection import init_db
+from candidate_recommendation.config import config
+from candidate_recommendation.services.candidate_client import get_candidate_client
+from candidate_recommendation.services.candidate_sync import get_candidate_sync
+from candidate_recommendation.services.history_writer import get_history_writer
+from candidate_recommendation.services.responses import FastJSONResponse, add_compression
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    candidate_client = get_candidate_client()
+    await candidate_client.start()
+    history_writer = get_history_writer()
+    history_writer.start()
+    candidate_sync = get_candidate_sync()
+    if config.sync_enabled:
+        candidate_sync.start()
+    # Load the encoder in the background so the app starts serving liveness immediately
+    if config.model_warmup:
+        recommendations.matcher_service.start_warmup()
     yield
+    await recommendations.matcher_service.stop_warmup()
+    await candidate_sync.stop()
+    # Write out searches still queued before the process exits
+    await history_writer.stop()
+    await candidate_client.close()
 
 app = FastAPI(
     title="TalentAI Recruiter Backend",
     description="AI-powered talent matching platform for recruiters",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
+add_compression(app, config.response_compression, config.response_compression_min_bytes)
 
 app.include_router(recommendations.router)
 
@@ -25,6 +47,17 @@ async def root():
         "status": "operational",
         "endpoints": [
             "/api/recommendations",
-            "/api/jobs"
+            "/api/jobs",
+            "/ready"
         ]
-    }
\ No newline at end of file
+    }
+
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe: 200 once the encoder is loaded and the candidate replica
+    and index are warm, 503 (with the same per-component report) until then.
+    Liveness is `/api/recommendations/health`.
+    """
+    status = recommendations.matcher_service.readiness()
+    return FastJSONResponse(status, status_code=200 if status["ready"] else 503)
\ No newline at end of file
@@ -17,8 +17,8 @@ def test_health():
         print(json.dumps(health_data, indent=2))
         
         # Check if using API data source
-        if health_data.get("data_source") == "candidate_backend_api":
-            print("✅ Using candidate backend API as data source")
+        if health_data.get("data_source") in ("candidate_backend_api", "local_replica"):
+            print(f"✅ Using candidate backend data ({health_data['data_source']})")
         else:
             print("⚠️  Not using candidate backend API")
             